@@ -0,0 +1,86 @@
+"""
+Servidor HTTP local que imita las respuestas de llama-server / gateway.
+
+Solo para benchmarks: responde JSON fijo con keep-alive (HTTP/1.1) y una
+latencia configurable para simular el tiempo de inferencia.
+"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+COMPLETION_BODY = json.dumps({
+    "index": 0,
+    "content": "respuesta de prueba",
+    "model": "stand-in",
+    "stop": True,
+    "stop_type": "eos",
+    "tokens_predicted": 3,
+    "tokens_evaluated": 5,
+    "prompt": "hola",
+}).encode()
+
+
+class _Server(ThreadingHTTPServer):
+    # backlog amplio: los benchmarks abren cientos de conexiones a la vez
+    request_queue_size = 1024
+
+
+class StandInServer:
+    def __init__(self, latency_ms: float = 0.0, routes: dict = None):
+        self.latency = latency_ms / 1000.0
+        self.routes = routes or {}
+        self.requests = 0
+        self._lock = threading.Lock()
+        self._httpd = _Server(("127.0.0.1", 0), self._handler())
+        self._httpd.daemon_threads = True
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address
+        return f"http://{host}:{port}"
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def _reply(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                if length:
+                    self.rfile.read(length)
+
+                with server._lock:
+                    server.requests += 1
+
+                if server.latency:
+                    time.sleep(server.latency)
+
+                route = server.routes.get(self.path)
+                status, body = route(self) if route else (200, COMPLETION_BODY)
+
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            do_GET = _reply
+            do_POST = _reply
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    def __enter__(self) -> "StandInServer":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
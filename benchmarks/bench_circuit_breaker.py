@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Costo del CircuitBreaker en el camino caliente de cada request.
+
+Mide ns por llamada de `allow_request` (CLOSED, sin lock) y del par
+`allow_request` + `record_success` (un bucket del ring buffer bajo lock),
+contra una llamada vacía como base, con 1 y con N threads compartiendo
+el mismo breaker. Uso:
+
+    uv run python benchmarks/bench_circuit_breaker.py --calls 1000000 --threads 8
+"""
+
+import argparse
+import threading
+import time
+
+from llm_arch_sdk.transport.circuit_breaker import CircuitBreaker
+
+
+def noop() -> bool:
+    return True
+
+
+def run(fn, calls: int, threads: int) -> float:
+    """ns por llamada, medido como tiempo total de pared / llamadas totales."""
+    per_thread = calls // threads
+    barrier = threading.Barrier(threads + 1)
+
+    def worker():
+        barrier.wait()
+        for _ in range(per_thread):
+            fn()
+
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    for w in workers:
+        w.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for w in workers:
+        w.join()
+    return (time.perf_counter() - start) * 1e9 / (per_thread * threads)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=1_000_000)
+    parser.add_argument("--threads", type=int, default=8)
+    args = parser.parse_args()
+
+    breaker = CircuitBreaker()
+
+    def request_cycle():
+        if breaker.allow_request():
+            breaker.record_success()
+
+    cases = [
+        ("llamada vacía (base)", noop),
+        ("allow_request", breaker.allow_request),
+        ("allow_request + record_success", request_cycle),
+    ]
+
+    for threads in sorted({1, args.threads}):
+        print(f"threads={threads}")
+        for name, fn in cases:
+            print(f"  {name:<32} {run(fn, args.calls, threads):7.1f} ns/llamada")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Decodificación de respuestas de /completion: `resp.json()` + `from_dict`
+frente a JsonCodec (decoder compilado de msgspec directo al dataclass).
+
+Arma una respuesta grande con `tokens` y `generation_settings` y mide,
+por backend, el tiempo medio de decodificación y el pico de memoria
+asignada (tracemalloc) al decodificar un lote. Uso:
+
+    uv run python benchmarks/bench_codec.py --tokens 4096 --iterations 2000
+"""
+
+import argparse
+import json
+import random
+import time
+import tracemalloc
+
+from llm_arch_sdk.client.codec import JsonCodec, msgspec, orjson
+from llm_arch_sdk.config.settings import CodecSettings
+from llm_arch_sdk.models.completion import CompletionResult
+
+
+def response(tokens: int) -> bytes:
+    rng = random.Random(0)
+    return json.dumps({
+        "index": 0,
+        "content": "lorem ipsum " * (tokens // 2),
+        "model": "llama",
+        "stop": True,
+        "stop_type": "limit",
+        "stopping_word": "",
+        "tokens_predicted": tokens,
+        "tokens_evaluated": tokens,
+        "tokens_cached": 0,
+        "prompt": "contexto " * tokens,
+        "has_new_line": True,
+        "truncated": False,
+        "id_slot": 0,
+        "tokens": [rng.randrange(32000) for _ in range(tokens)],
+        "generation_settings": {
+            "seed": 4294967295, "temperature": 0.8, "top_k": 40, "top_p": 0.95, "min_p": 0.05,
+            "typical_p": 1.0, "repeat_last_n": 64, "repeat_penalty": 1.0, "presence_penalty": 0.0,
+            "frequency_penalty": 0.0, "max_tokens": tokens, "n_predict": tokens, "stream": False,
+            "stop": [], "samplers": ["penalties", "dry", "top_k", "typ_p", "top_p", "min_p", "temperature"],
+            "chat_format": "Content-only", "reasoning_format": "none", "reasoning_in_content": False,
+            "logit_bias": [], "dry_sequence_breakers": ["\n", ":", "\"", "*"],
+        },
+        "timings": {
+            "cache_n": 0, "prompt_n": tokens, "prompt_ms": 120.0, "prompt_per_token_ms": 0.03,
+            "prompt_per_second": 34000.0, "predicted_n": tokens, "predicted_ms": 9000.0,
+            "predicted_per_token_ms": 2.2, "predicted_per_second": 455.0,
+        },
+    }).encode()
+
+
+def baseline(data: bytes) -> CompletionResult:
+    # lo que hace hoy LlmClient: json.loads (resp.json()) y luego from_dict
+    return CompletionResult.from_dict(json.loads(data))
+
+
+def measure(name: str, decode, data: bytes, iterations: int, batch: int) -> None:
+    for _ in range(10):
+        decode(data)
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        decode(data)
+    elapsed = (time.perf_counter() - start) / iterations
+
+    tracemalloc.start()
+    kept = [decode(data) for _ in range(batch)]
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del kept
+
+    print(f"{name:<22} {elapsed * 1e6:9.1f}us/respuesta  pico={peak / batch / 1024:8.1f}KiB/respuesta")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tokens", type=int, default=4096)
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--batch", type=int, default=100)
+    args = parser.parse_args()
+
+    data = response(args.tokens)
+    print(f"respuesta de {len(data) / 1024:.1f}KiB con {args.tokens} tokens")
+
+    measure("json + from_dict", baseline, data, args.iterations, args.batch)
+    for backend, available in (("orjson", orjson), ("msgspec", msgspec)):
+        if available is None:
+            print(f"{backend:<22} no instalado")
+            continue
+        codec = JsonCodec(CodecSettings(enabled=True, backend=backend))
+        measure(f"{backend} decode_as", lambda d: codec.decode_as(d, CompletionResult), data, args.iterations, args.batch)
+
+    payload = {"prompt": "contexto " * args.tokens, "n_predict": 128, "temperature": 0.8, "stop": ["\n"]}
+    for backend in ("json", "orjson", "msgspec"):
+        codec = JsonCodec(CodecSettings(enabled=True, backend=backend))
+        if codec.backend != backend:
+            continue
+        start = time.perf_counter()
+        for _ in range(args.iterations):
+            codec.encode(payload)
+        print(f"encode {backend:<15} {(time.perf_counter() - start) / args.iterations * 1e6:9.1f}us/request")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Throughput de HttpClientFactory con distintos tamaños de pool.
+
+Lanza un servidor local que imita llama-server y dispara requests desde
+N threads compartiendo un único httpx.Client. Uso:
+
+    uv run python benchmarks/bench_connection_pool.py --threads 32 --requests 2000
+"""
+
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from _stand_in_server import StandInServer
+from llm_arch_sdk.config.settings import _sdk_settings
+from llm_arch_sdk.transport.http_client_factory import HttpClientFactory
+
+
+def run(base_url: str, pool_size: int, threads: int, total: int) -> float:
+    _sdk_settings.transport.max_connections = pool_size
+    _sdk_settings.transport.max_keepalive_connections = pool_size
+
+    client = HttpClientFactory.create(timeout=30.0)
+    url = f"{base_url}/llm/completions"
+
+    def call(_):
+        client.post(url, json={"prompt": "hola", "n_predict": 3}).raise_for_status()
+
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        list(pool.map(call, range(threads)))  # calentamiento
+
+        start = time.perf_counter()
+        list(pool.map(call, range(total)))
+        elapsed = time.perf_counter() - start
+
+    client.close()
+    return total / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--threads", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--latency-ms", type=float, default=2.0)
+    parser.add_argument("--pool-sizes", type=int, nargs="+", default=[1, 4, 16, 64])
+    args = parser.parse_args()
+
+    with StandInServer(latency_ms=args.latency_ms) as server:
+        print(f"threads={args.threads} requests={args.requests} latency={args.latency_ms}ms")
+        for size in args.pool_sizes:
+            rps = run(server.base_url, size, args.threads, args.requests)
+            print(f"  max_connections={size:<4} {rps:10.1f} req/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Memoria retenida por CompletionResult en trabajos batch.
+
+Decodifica N respuestas de /completion (cada una con su propio json.loads,
+como en el cliente), descarta el dict crudo y mide con tracemalloc lo que
+queda vivo por resultado: normal, tras acceder a timings y
+generation_settings (sub-modelos materializados) y en modo lean. Uso:
+
+    uv run python benchmarks/bench_models_memory.py --results 5000 --tokens 512
+"""
+
+import argparse
+import gc
+import inspect
+import json
+import random
+import tracemalloc
+
+from llm_arch_sdk.models.completion import CompletionResult
+
+
+def response(i: int, tokens: int) -> bytes:
+    rng = random.Random(i)
+    return json.dumps({
+        "index": 0,
+        "content": f"respuesta {i} " * 40,
+        "model": "llama",
+        "stop": True,
+        "stop_type": "eos",
+        "stopping_word": "",
+        "tokens_predicted": tokens,
+        "tokens_evaluated": 1024,
+        "tokens_cached": 0,
+        "prompt": f"documento {i}: " + "contexto " * 1024,
+        "has_new_line": False,
+        "truncated": False,
+        "id_slot": 0,
+        "tokens": [rng.randrange(32000) for _ in range(tokens)],
+        "generation_settings": {
+            "seed": 4294967295, "temperature": 0.8, "top_k": 40, "top_p": 0.95, "min_p": 0.05,
+            "typical_p": 1.0, "repeat_last_n": 64, "repeat_penalty": 1.0, "presence_penalty": 0.0,
+            "frequency_penalty": 0.0, "max_tokens": tokens, "n_predict": tokens, "stream": False,
+            "stop": [], "samplers": ["penalties", "dry", "top_k", "typ_p", "top_p", "min_p", "temperature"],
+            "chat_format": "Content-only", "reasoning_format": "none", "reasoning_in_content": False,
+        },
+        "timings": {
+            "cache_n": 0, "prompt_n": 1024, "prompt_ms": 120.0, "prompt_per_token_ms": 0.1,
+            "prompt_per_second": 8500.0, "predicted_n": tokens, "predicted_ms": 900.0,
+            "predicted_per_token_ms": 1.7, "predicted_per_second": 570.0,
+        },
+    }).encode()
+
+
+def measure(name: str, payloads: list[bytes], build) -> None:
+    gc.collect()
+    tracemalloc.start()
+    kept = [build(json.loads(data)) for data in payloads]
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"{name:<24} {current / len(kept) / 1024:8.1f}KiB/resultado")
+    del kept
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--results", type=int, default=5000)
+    parser.add_argument("--tokens", type=int, default=512)
+    args = parser.parse_args()
+
+    payloads = [response(i, args.tokens) for i in range(args.results)]
+
+    def materialized(data: dict) -> CompletionResult:
+        result = CompletionResult.from_dict(data)
+        result.timings, result.generation_settings
+        return result
+
+    measure("from_dict", payloads, CompletionResult.from_dict)
+    measure("from_dict + sub-modelos", payloads, materialized)
+
+    if "lean" in inspect.signature(CompletionResult.from_dict).parameters:
+        measure("from_dict lean", payloads, lambda data: CompletionResult.from_dict(data, lean=True))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Latencia de lectura de SqliteResponseCache (caché en disco compartida).
+
+Llena la caché con respuestas de completion y de embeddings y mide
+percentiles de get() en hits y misses. El objetivo es quedar muy por
+debajo de 1 ms. Uso:
+
+    uv run python benchmarks/bench_response_cache.py --entries 20000 --lookups 20000
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from llm_arch_sdk.client.persistent_cache import SqliteResponseCache
+from llm_arch_sdk.config.settings import PersistentCacheSettings
+
+
+def completion(i: int) -> dict:
+    return {
+        "content": f"respuesta {i} " * 20,
+        "stop": True,
+        "tokens_predicted": 64,
+        "tokens_evaluated": 128,
+        "timings": {"prompt_ms": 12.5, "predicted_ms": 480.0, "prompt_n": 128, "predicted_n": 64},
+    }
+
+
+def embedding(i: int, dim: int) -> dict:
+    rng = random.Random(i)
+    return {"data": [{"index": 0, "embedding": [rng.uniform(-1, 1) for _ in range(dim)]}]}
+
+
+def percentiles(samples: list[float]) -> str:
+    ordered = sorted(samples)
+    pick = lambda q: ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1e6
+    return f"p50={pick(0.50):7.1f}us  p99={pick(0.99):7.1f}us  max={ordered[-1] * 1e6:8.1f}us"
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--entries", type=int, default=20000)
+    parser.add_argument("--lookups", type=int, default=20000)
+    parser.add_argument("--dim", type=int, default=768)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = SqliteResponseCache(
+            PersistentCacheSettings(enabled=True, compaction_interval=0),
+            path=os.path.join(tmp, "cache.sqlite3"),
+        )
+
+        for kind, build in (("completion", completion), ("embedding", lambda i: embedding(i, args.dim))):
+            for i in range(args.entries):
+                cache.set(f"{kind}-{i}", build(i))
+
+            hits, misses = [], []
+            for _ in range(args.lookups):
+                key = f"{kind}-{random.randrange(args.entries)}"
+                start = time.perf_counter()
+                cache.get(key)
+                hits.append(time.perf_counter() - start)
+
+                start = time.perf_counter()
+                cache.get(f"missing-{random.random()}")
+                misses.append(time.perf_counter() - start)
+
+            print(f"{kind:<10} hit  {percentiles(hits)}")
+            print(f"{kind:<10} miss {percentiles(misses)}")
+
+        stats = cache.stats()
+        print(f"entries={stats['entries']} bytes={stats['bytes'] / 1e6:.1f}MB")
+        cache.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Tormenta de 401: cientos de threads comparten un TokenManager y el
+gateway invalida el token en medio de la carga.
+
+El servidor local acepta solo el último token emitido por /llm/login
+(con latencia de login configurable) y responde 401 al resto. Se mide
+cuántos logins provoca cada rotación y el throughput total. Con
+generaciones debería haber un login por rotación, no uno por request. Uso:
+
+    uv run python benchmarks/bench_token_refresh.py --threads 300 --requests 20 --rotations 5
+"""
+
+import argparse
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+
+from _stand_in_server import COMPLETION_BODY, StandInServer
+from llm_arch_sdk.auth.token_manager import TokenManager
+from llm_arch_sdk.config.settings import AuthSettings, _sdk_settings
+
+
+class Gateway:
+    def __init__(self, login_ms: float):
+        self.login_latency = login_ms / 1000
+        self.valid = None
+        self.issued = 0
+        self.unauthorized = 0
+        self.lock = threading.Lock()
+
+    def login(self, handler):
+        time.sleep(self.login_latency)
+        with self.lock:
+            self.issued += 1
+            self.valid = f"token-{self.issued}"
+            return 200, json.dumps({"token": self.valid}).encode()
+
+    def completions(self, handler):
+        with self.lock:
+            if handler.headers.get("Authorization") != f"Bearer {self.valid}":
+                self.unauthorized += 1
+                return 401, b'{"error": "token vencido"}'
+        return 200, COMPLETION_BODY
+
+    def rotate(self):
+        with self.lock:
+            self.valid = None
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--threads", type=int, default=300)
+    parser.add_argument("--requests", type=int, default=20, help="requests por thread")
+    parser.add_argument("--rotations", type=int, default=5)
+    parser.add_argument("--interval", type=float, default=1.0, help="segundos entre rotaciones")
+    parser.add_argument("--login-ms", type=float, default=50.0)
+    args = parser.parse_args()
+
+    gateway = Gateway(args.login_ms)
+    routes = {"/llm/login": gateway.login, "/llm/completions": gateway.completions}
+
+    with StandInServer(routes=routes) as server:
+        _sdk_settings.llm.base_url = server.base_url
+        _sdk_settings.llm.username = _sdk_settings.llm.username or "bench"
+        _sdk_settings.llm.password = _sdk_settings.llm.password or "bench"
+        _sdk_settings.transport.max_connections = args.threads
+
+        auth = TokenManager(settings=AuthSettings(background_refresh=False))
+        client = httpx.Client(auth=auth, limits=httpx.Limits(max_connections=args.threads))
+        url = f"{server.base_url}/llm/completions"
+        stop = threading.Event()
+
+        def rotator():
+            for _ in range(args.rotations):
+                if stop.wait(args.interval):
+                    return
+                gateway.rotate()
+
+        def worker(_):
+            failures = 0
+            for _ in range(args.requests):
+                if client.post(url, json={"prompt": "hola"}).status_code != 200:
+                    failures += 1
+            return failures
+
+        rotations = threading.Thread(target=rotator, daemon=True)
+        start = time.perf_counter()
+        rotations.start()
+        with ThreadPoolExecutor(max_workers=args.threads) as pool:
+            failures = sum(pool.map(worker, range(args.threads)))
+        elapsed = time.perf_counter() - start
+        stop.set()
+
+        total = args.threads * args.requests
+        stats = auth.stats()
+        print(f"threads={args.threads} requests={total} en {elapsed:.2f}s ({total / elapsed:.0f} req/s)")
+        print(f"logins en el gateway={gateway.issued} (rotaciones={args.rotations}) 401 vistos={gateway.unauthorized}")
+        print(f"refrescos compartidos={stats['shared_refreshes']} requests fallidas={failures}")
+
+        client.close()
+        auth.close()
+
+
+if __name__ == "__main__":
+    main()
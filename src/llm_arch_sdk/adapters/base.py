@@ -1,6 +1,35 @@
+import logging
 from abc import ABC, abstractmethod
 
+from ..transport.transport_registry import TransportRegistry
+
+logger = logging.getLogger("llm.sdk.adapters.base")
+
+
 class BaseLLMAdapter(ABC):
     @abstractmethod
     def client(self):
         pass
+
+    def close(self):
+        """Cierra el cliente síncrono y libera el transporte compartido que usa este adapter."""
+        llm_client = getattr(self, "_llm_client", None)
+        if llm_client is not None:
+            llm_client.close()
+            self._llm_client = None
+
+        if getattr(self, "_async_llm_client", None) is not None:
+            logger.warning("El cliente asíncrono sigue abierto; ciérralo con `await adapter.aclose()`")
+
+        http_client = getattr(self, "_http_client", None)
+        if http_client is not None:
+            TransportRegistry.release(http_client)
+            self._http_client = None
+
+    async def aclose(self):
+        """Como `close`, cerrando antes el httpx.AsyncClient de `aclient()` si se creó."""
+        async_client = getattr(self, "_async_llm_client", None)
+        if async_client is not None:
+            self._async_llm_client = None
+            await async_client.aclose()
+        self.close()
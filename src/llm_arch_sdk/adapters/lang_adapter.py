@@ -2,6 +2,7 @@ import logging
 from langchain_openai import ChatOpenAI
 
 from ..transport.auth_http_client_factory import AuthHttpClientFactory
+from ..transport.transport_registry import TransportRegistry
 from ..config.settings import _sdk_settings
 from .base import BaseLLMAdapter
 
@@ -33,7 +34,8 @@ class LangChainAdapter(BaseLLMAdapter):
         self._validate_config()
 
         self._langchain_client: ChatOpenAI = None
-        self._http_client = AuthHttpClientFactory.create(
+        self._http_client = TransportRegistry.acquire(
+            base_url=self.base_url,
             timeout=self.timeout,
         )
 
@@ -2,7 +2,9 @@ import logging
 
 from .base import BaseLLMAdapter
 from ..client.llm_client import LlmClient
+from ..client.async_llm_client import AsyncLlmClient
 from ..transport.auth_http_client_factory import AuthHttpClientFactory
+from ..transport.transport_registry import TransportRegistry
 from ..config.settings import _sdk_settings
 from langfuse import observe, get_client
 
@@ -35,7 +37,9 @@ class LlamaAdapter(BaseLLMAdapter):
         self._validate_config()
 
         self._llm_client: LlmClient = None
-        self._http_client = AuthHttpClientFactory.create(
+        self._async_llm_client: AsyncLlmClient = None
+        self._http_client = TransportRegistry.acquire(
+            base_url=self.base_url,
             timeout=self.timeout,
         )
 
@@ -68,6 +72,38 @@ class LlamaAdapter(BaseLLMAdapter):
             )
         return self._llm_client
 
+    @observe(
+        name="llama.adapter.aclient",
+        capture_input=False,
+        capture_output=False
+    )
+    def aclient(self) -> AsyncLlmClient:
+        """
+        Devuelve el cliente asíncrono para llama-server. El httpx.AsyncClient
+        se crea en el primer uso y se comparte entre todas las corutinas.
+        """
+        if not self._async_llm_client:
+            logger.info("Inicializando cliente LLM asíncrono")
+
+            langfuse.update_current_span(
+                metadata={
+                    "adapter": "llama",
+                    "mode": "async",
+                    "base_url": self.base_url,
+                    "timeout": self.timeout,
+                }
+            )
+
+            self._async_llm_client = AsyncLlmClient(
+                base_url=self.base_url,
+                http_client=AuthHttpClientFactory.create_async(
+                    auth=self._http_client.auth,
+                    timeout=self.timeout,
+                ),
+                **self.client_kwargs
+            )
+        return self._async_llm_client
+
     def _validate_config(self):
         if not self.base_url:
             raise RuntimeError("LLM_BASE_URL no configurada")
\ No newline at end of file
@@ -3,6 +3,7 @@ from openai import OpenAI
 
 from .base import BaseLLMAdapter
 from ..transport.auth_http_client_factory import AuthHttpClientFactory
+from ..transport.transport_registry import TransportRegistry
 from ..config.settings import _sdk_settings
 
 logger = logging.getLogger("llm.sdk.adapters.openai")
@@ -32,7 +33,8 @@ class OpenAIAdapter(BaseLLMAdapter):
         self._validate_config()
 
         self._openai_client: OpenAI = None
-        self._http_client = AuthHttpClientFactory.create(
+        self._http_client = TransportRegistry.acquire(
+            base_url=self.base_url,
             timeout=self.timeout,
         )
 
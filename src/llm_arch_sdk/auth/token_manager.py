@@ -1,13 +1,18 @@
+import json
+import time
 import httpx
+import asyncio
+import base64
 import threading
 import logging
 from http import HTTPStatus
 from typing import Optional
 
+from .token_store import FileTokenStore
 from ..transport.circuit_breaker import CircuitBreaker
 from ..transport.http_client_factory import HttpClientFactory
 from langfuse import observe, get_client
-from ..config.settings import _sdk_settings
+from ..config.settings import AuthSettings, _sdk_settings
 
 
 langfuse = get_client()
@@ -19,67 +24,315 @@ class AuthError(Exception):
     """Errores relacionados con autenticación contra el gateway LLM."""
 
 
+def jwt_expiry(token: str) -> Optional[float]:
+    """`exp` (epoch en segundos) de un JWT, sin verificar la firma; None si no es JWT."""
+    parts = token.split(".")
+    if len(parts) != 3:
+        return None
+
+    try:
+        payload = parts[1] + "=" * (-len(parts[1]) % 4)
+        exp = json.loads(base64.urlsafe_b64decode(payload)).get("exp")
+    except (ValueError, AttributeError):
+        return None
+
+    return float(exp) if isinstance(exp, (int, float)) and not isinstance(exp, bool) else None
+
+
+_REASONS = {
+    "missing_token": "Token no presente, login inicial",
+    "expired_token": "Token vencido, login en el camino de la request",
+    "token_expired": "401 recibido, refrescando token",
+    "proactive_refresh": "Renovando token antes de su vencimiento",
+}
+
+
+class _Refresh:
+    """Login en curso: los que llegan después esperan su resultado."""
+    __slots__ = ("event", "state", "error")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.state: Optional[tuple[str, int]] = None
+        self.error: Optional[BaseException] = None
+
+
 class TokenManager(httpx.Auth):
-    def __init__(self, timeout: float = None):
+    """
+    httpx.Auth que obtiene y adjunta el token del gateway.
+
+    Si se conoce el vencimiento del token (`expires_in` del login, `exp`
+    del JWT o `AuthSettings.token_ttl`), un thread en segundo plano lo
+    renueva `refresh_margin` segundos antes. Mientras tanto las requests
+    siguen usando el token vigente, así que ninguna espera un login. El
+    reintento tras un 401 se mantiene como red de seguridad.
+
+    Cada token lleva un número de generación. Un login se pide "contra"
+    la generación que se vio inválida: si ya hay otra más nueva se usa
+    esa, y si hay un login en curso se espera su resultado. Así una
+    ráfaga de 401 con el mismo token vencido produce un solo login.
+
+    Con `httpx.AsyncClient` se usa `async_auth_flow`: el login va por un
+    AsyncClient propio con pool y el single-flight es una Task de asyncio
+    que esperan todas las requests, sin bloquear el event loop. El token,
+    la generación y el circuit breaker son los mismos que los del flujo
+    sync.
+    """
+
+    def __init__(self, timeout: float = None, settings: AuthSettings = None):
+        self.settings = settings or _sdk_settings.auth
         self.base_url = _sdk_settings.llm.base_url
         self.username = _sdk_settings.llm.username
         self.password = _sdk_settings.llm.password
-        self.timeout  = timeout or _sdk_settings.auth.token_timeout
+        self.timeout  = timeout or self.settings.token_timeout
 
         self._validate()
 
-        self.token: Optional[str] = None
+        # (token, generación) se leen y reemplazan juntos
+        self._state: tuple[Optional[str], int] = (None, 0)
+        self._inflight: Optional[_Refresh] = None
+        # epoch (time.time) en que vence el token; None si no se conoce
+        self.expires_at: Optional[float] = None
+        # epoch en que se obtuvo el token vigente; con expires_at da su vida útil
+        self.issued_at: Optional[float] = None
         self._lock = threading.Lock()
 
+        self.logins = 0
+        self.shared_refreshes = 0
+        self.store_reuses = 0
+
+        self._store: Optional[FileTokenStore] = None
+        if self.settings.shared_token_store:
+            self._store = FileTokenStore(
+                self.settings.token_store_path,
+                owner=f"{self.username}@{self.base_url}",
+            )
+
         self._login_client = HttpClientFactory.create(timeout=self.timeout)
         self._circuit = CircuitBreaker()
 
-    @observe(
-        name="llm.auth.flow",
-        capture_input=False,
-        capture_output=False,
-    )
+        # lado async: cliente de login y login en curso, ligados al event loop que los creó
+        self._async_login_client: Optional[httpx.AsyncClient] = None
+        self._async_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._async_inflight: Optional[asyncio.Task] = None
+
+        self._stop = threading.Event()
+        self._refresher: Optional[threading.Thread] = None
+
+    # sin @observe: el wrapper de langfuse para generadores no reenvía send()
+    # y httpx lo usa para entregar la respuesta (el reintento tras 401 fallaba).
+    # La metadata queda en el span de la request que está en curso.
     def auth_flow(self, request):
-        # 1 Asegurar token (thread-safe)
-        if not self.token:
-            with self._lock:
-                if not self.token:
-                    logger.info("Token no presente, login inicial")  
-                    langfuse.update_current_span(
-                        metadata={"auth.reason": "missing_token"}
-                    )                  
-                    self.token = self._login()
+        # 1 Asegurar token
+        token, generation = self._state
+        if not token:
+            token, generation = self._refresh(generation, "missing_token")
+            self._ensure_refresher()
+        elif self._expired():
+            # la renovación en segundo plano no llegó a tiempo (p. ej. gateway caído)
+            token, generation = self._refresh(generation, "expired_token")
         else:
             langfuse.update_current_span(
                 metadata={"auth.reason": "cached_token"}
             )
 
         # 2 Adjuntar token
-        request.headers["Authorization"] = f"Bearer {self.token}"
+        self._attach(request, token)
+
+        # 3️ Enviar request
+        response = yield request
+
+        # 4️ Retry UNA vez si token expiró
+        if self._should_retry(request, response):
+            # solo el primero que ve vencida esta generación hace login
+            token, _ = self._refresh(generation, "token_expired")
+            self._mark_retry(request, token)
+
+            yield request
+
+    async def async_auth_flow(self, request):
+        token, generation = self._state
+        if not token:
+            token, generation = await self._refresh_async(generation, "missing_token")
+            self._ensure_refresher()
+        elif self._expired():
+            token, generation = await self._refresh_async(generation, "expired_token")
+        else:
+            langfuse.update_current_span(
+                metadata={"auth.reason": "cached_token"}
+            )
+
+        self._attach(request, token)
+
+        response = yield request
+
+        if self._should_retry(request, response):
+            token, _ = await self._refresh_async(generation, "token_expired")
+            self._mark_retry(request, token)
+
+            yield request
+
+    def _attach(self, request: httpx.Request, token: str) -> None:
+        request.headers["Authorization"] = f"Bearer {token}"
         logger.debug("Enviando request con token %s", request.headers["Authorization"])
         langfuse.update_current_span(
             metadata={"auth.token_attached": True}
         )
 
-        # 3️ Enviar request
-        response = yield request
+    def _should_retry(self, request: httpx.Request, response: httpx.Response) -> bool:
+        return (
+            response.status_code == HTTPStatus.UNAUTHORIZED
+            and not request.headers.get(_sdk_settings.circuit_breaker.retry_header)
+        )
 
-        # 4️ Retry UNA vez si token expiró
-        if response.status_code == HTTPStatus.UNAUTHORIZED and not request.headers.get(_sdk_settings.circuit_breaker.retry_header):
-            logger.warning("401 recibido, refrescando token")
+    def _mark_retry(self, request: httpx.Request, token: str) -> None:
+        request.headers["Authorization"] = f"Bearer {token}"
+        retry = _sdk_settings.circuit_breaker
+        request.headers[retry.retry_header] = str(retry.retry_value)
+        logger.debug("Reintentando request con nuevo token %s", request.headers["Authorization"])
+
+    @property
+    def token(self) -> Optional[str]:
+        return self._state[0]
+
+    @token.setter
+    def token(self, value: Optional[str]) -> None:
+        with self._lock:
+            self._state = (value, self._state[1] + 1)
+
+    @property
+    def generation(self) -> int:
+        return self._state[1]
 
+    def _refresh(self, seen: int, reason: str) -> tuple[str, int]:
+        """
+        Login deduplicado: `seen` es la generación que el caller encontró
+        ausente, vencida o rechazada. Devuelve el (token, generación) nuevo.
+        """
+        with self._lock:
+            token, generation = self._state
+            if token and generation != seen:
+                self.shared_refreshes += 1
+                return self._state
+
+            flight = self._inflight
+            leader = flight is None
+            if leader:
+                flight = self._inflight = _Refresh()
+            else:
+                self.shared_refreshes += 1
+
+        if not leader:
             langfuse.update_current_span(
-                metadata={"auth.reason": "token_expired"}
+                metadata={"auth.reason": reason, "auth.refresh_shared": True}
             )
+            flight.event.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.state
 
+        self._log_reason(reason)
+
+        try:
+            token = self._obtain(token)
             with self._lock:
-                self.token = self._login()
+                self._state = flight.state = (token, self._state[1] + 1)
+            return flight.state
+        except BaseException as exc:
+            flight.error = exc
+            raise
+        finally:
+            with self._lock:
+                self._inflight = None
+            flight.event.set()
 
-            request.headers["Authorization"] = f"Bearer {self.token}"
-            request.headers[_sdk_settings.circuit_breaker.retry_header] = _sdk_settings.circuit_breaker.retry_value
-            logger.debug("Reintentando request con nuevo token", request.headers["Authorization"])
+    async def _refresh_async(self, seen: int, reason: str) -> tuple[str, int]:
+        """Como `_refresh`, con el login en curso compartido como una Task."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            token, generation = self._state
+            if token and generation != seen:
+                self.shared_refreshes += 1
+                return self._state
 
-            yield request
+            flight = self._async_inflight
+            if flight is None or flight.get_loop() is not loop:
+                flight = self._async_inflight = loop.create_task(self._login_flight_async(token, reason))
+            else:
+                self.shared_refreshes += 1
+                langfuse.update_current_span(
+                    metadata={"auth.reason": reason, "auth.refresh_shared": True}
+                )
+
+        # shield: si se cancela la request que inició el login, las demás lo siguen esperando
+        return await asyncio.shield(flight)
+
+    async def _login_flight_async(self, stale: Optional[str], reason: str) -> tuple[str, int]:
+        self._log_reason(reason)
+        try:
+            token = await self._obtain_async(stale)
+            with self._lock:
+                self._state = (token, self._state[1] + 1)
+                return self._state
+        finally:
+            with self._lock:
+                if self._async_inflight is asyncio.current_task():
+                    self._async_inflight = None
+
+    def _obtain(self, stale: Optional[str]) -> str:
+        """Token nuevo: el que otro proceso dejó en el store o un login propio."""
+        if self._store is None:
+            return self._count(self._login())
+
+        with self._store.locked(self.settings.token_store_lock_timeout):
+            shared = self._from_store(stale)
+            if shared is not None:
+                return shared
+            token = self._count(self._login())
+            self._store.save(token, self.expires_at)
+            return token
+
+    async def _obtain_async(self, stale: Optional[str]) -> str:
+        if self._store is None:
+            return self._count(await self._login_async())
+
+        async with self._store.alocked(self.settings.token_store_lock_timeout):
+            shared = self._from_store(stale)
+            if shared is not None:
+                return shared
+            token = self._count(await self._login_async())
+            self._store.save(token, self.expires_at)
+            return token
+
+    def _from_store(self, stale: Optional[str]) -> Optional[str]:
+        # el token que este proceso ya vio rechazado o vencido no sirve aunque esté en el store
+        stored = self._store.load()
+        if stored is None or stored.token == stale or not stored.valid():
+            return None
+
+        logger.info("Token reutilizado del store compartido")
+        langfuse.update_current_span(
+            metadata={"auth.token_store": "hit"}
+        )
+        self.issued_at = time.time()
+        self.expires_at = stored.expires_at
+        with self._lock:
+            self.store_reuses += 1
+        return stored.token
+
+    def _count(self, token: str) -> str:
+        with self._lock:
+            self.logins += 1
+        return token
+
+    def _log_reason(self, reason: str) -> None:
+        if reason == "token_expired":
+            logger.warning(_REASONS[reason])
+        else:
+            logger.info(_REASONS[reason])
+        langfuse.update_current_span(
+            metadata={"auth.reason": reason}
+        )
 
     @observe(
         name="llm.auth.login",
@@ -87,6 +340,35 @@ class TokenManager(httpx.Auth):
         capture_output=False,
     )
     def _login(self) -> str:
+        self._allow_login()
+        try:
+            url, auth = self._login_args()
+            return self._accept(self._login_client.post(url, auth=auth))
+        except Exception as e:
+            raise self._login_failed(e) from e
+
+    @observe(
+        name="llm.auth.login_async",
+        capture_input=False,
+        capture_output=False,
+    )
+    async def _login_async(self) -> str:
+        self._allow_login()
+        try:
+            url, auth = self._login_args()
+            return self._accept(await self._async_client().post(url, auth=auth))
+        except Exception as e:
+            raise self._login_failed(e) from e
+
+    def _async_client(self) -> httpx.AsyncClient:
+        # un AsyncClient no puede usarse desde otro event loop (p. ej. otro asyncio.run)
+        loop = asyncio.get_running_loop()
+        if self._async_login_client is None or self._async_loop is not loop:
+            self._async_login_client = HttpClientFactory.create_async(timeout=self.timeout)
+            self._async_loop = loop
+        return self._async_login_client
+
+    def _allow_login(self) -> None:
         # Circuit breaker: ¿se permite intentar login?
         if not self._circuit.allow_request():
             langfuse.update_current_span(
@@ -94,63 +376,136 @@ class TokenManager(httpx.Auth):
             )
             raise AuthError("Circuit breaker abierto: login bloqueado")
 
-        try:
-            login_endpoint = _sdk_settings.llm.endpoints.login
-            langfuse.update_current_span(
-                metadata={"login.endpoint": login_endpoint}
-            )
-            resp = self._login_client.post(
-                f"{self.base_url}{login_endpoint}",
-                auth=(self.username, self.password),
-            )
-            resp.raise_for_status()
+    def _login_args(self) -> tuple[str, tuple[str, str]]:
+        login_endpoint = _sdk_settings.llm.endpoints.login
+        langfuse.update_current_span(
+            metadata={"login.endpoint": login_endpoint}
+        )
+        return f"{self.base_url}{login_endpoint}", (self.username, self.password)
 
-            data = resp.json()
-            token = data.get("token")
+    def _accept(self, resp: httpx.Response) -> str:
+        resp.raise_for_status()
 
-            if not token:
-                raise AuthError("Login exitoso pero sin token")
+        data = resp.json()
+        token = data.get("token")
 
-            self._circuit.record_success()
-            return token
+        if not token:
+            raise AuthError("Login exitoso pero sin token")
+
+        self._circuit.record_success()
+        self.issued_at = time.time()
+        self.expires_at = self._expiry(data, token)
+        return token
 
-        except httpx.TimeoutException as e:
-            self._circuit.record_failure()
+    def _login_failed(self, e: Exception) -> AuthError:
+        self._circuit.record_failure()
+        langfuse.update_current_span(
+            metadata={"circuit": self._circuit._state.value, "error": type(e).__name__}
+        )
+
+        if isinstance(e, httpx.TimeoutException):
             logger.error("Timeout durante login")
-            langfuse.update_current_span(
-                metadata={"circuit": self._circuit._state.value, "error": type(e).__name__}
-            )
-            raise AuthError("Timeout durante login") from e
+            return AuthError("Timeout durante login")
 
-        except httpx.RequestError as e:
-            self._circuit.record_failure()
+        if isinstance(e, httpx.RequestError):
             logger.error("Error de conexión durante login")
-            langfuse.update_current_span(
-                metadata={"circuit": self._circuit._state.value, "error": type(e).__name__}
-            )
-            raise AuthError(f"Error de conexión durante login: {e}") from e
+            return AuthError(f"Error de conexión durante login: {e}")
 
-        except httpx.HTTPStatusError as e:
-            self._circuit.record_failure()
+        if isinstance(e, httpx.HTTPStatusError):
             logger.error(
                 "Error HTTP durante login",
                 extra={"status_code": e.response.status_code},
             )
-            langfuse.update_current_span(
-                metadata={"circuit": self._circuit._state.value, "error": type(e).__name__}
-            )
-            raise AuthError(
+            return AuthError(
                 f"Error HTTP durante login: {e.response.status_code}"
-            ) from e
+            )
 
-        except Exception as e:
-            self._circuit.record_failure()
-            logger.exception("Error inesperado durante login")
-            langfuse.update_current_span(
-                metadata={"circuit": self._circuit._state.value, "error": type(e).__name__}
+        logger.exception("Error inesperado durante login")
+        return AuthError("Error inesperado durante login")
+
+    def _expiry(self, data: dict, token: str) -> Optional[float]:
+        expires_in = data.get("expires_in")
+        if isinstance(expires_in, (int, float)) and not isinstance(expires_in, bool):
+            return time.time() + expires_in
+
+        exp = jwt_expiry(token)
+        if exp is not None:
+            return exp
+
+        if self.settings.token_ttl:
+            return time.time() + self.settings.token_ttl
+        return None
+
+    def _expired(self) -> bool:
+        return self.expires_at is not None and time.time() >= self.expires_at
+
+    def _ensure_refresher(self) -> None:
+        if not self.settings.background_refresh or self.expires_at is None or self._refresher is not None:
+            return
+
+        with self._lock:
+            if self._refresher is not None:
+                return
+            self._refresher = threading.Thread(
+                target=self._refresh_loop,
+                name="llm-token-refresher",
+                daemon=True,
             )
-            raise AuthError("Error inesperado durante login") from e
-    
+            self._refresher.start()
+
+    def _refresh_margin(self, expires_at: float) -> float:
+        # con un token de vida menor que refresh_margin se renueva a mitad de su vida,
+        # no apenas emitido
+        ttl = expires_at - (self.issued_at or time.time())
+        return max(0.0, min(self.settings.refresh_margin, ttl / 2))
+
+    def _refresh_loop(self) -> None:
+        last_refresh: Optional[float] = None
+        while not self._stop.is_set():
+            generation, expires_at = self.generation, self.expires_at
+            if expires_at is None:
+                return
+
+            wait = expires_at - self._refresh_margin(expires_at) - time.time()
+            if last_refresh is not None:
+                wait = max(wait, last_refresh + self.settings.min_refresh_interval - time.monotonic())
+            if wait > 0:
+                if self._stop.wait(wait):
+                    return
+                continue
+
+            try:
+                last_refresh = time.monotonic()
+                # si un 401 ya forzó un login, la generación cambió y no se repite
+                self._refresh(generation, "proactive_refresh")
+            except AuthError as exc:
+                retry = min(30.0, max(1.0, (expires_at - time.time()) / 2))
+                logger.warning("Renovación del token fallida (%s), reintento en %.0fs", exc, retry)
+                if self._stop.wait(retry):
+                    return
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "generation": self._state[1],
+                "logins": self.logins,
+                "shared_refreshes": self.shared_refreshes,
+                "store_reuses": self.store_reuses,
+                "expires_at": self.expires_at,
+            }
+
+    def close(self) -> None:
+        """Detiene la renovación en segundo plano y cierra el cliente de login."""
+        self._stop.set()
+        self._login_client.close()
+
+    async def aclose(self) -> None:
+        """Como `close`, cerrando también el cliente de login async."""
+        self.close()
+        if self._async_login_client is not None:
+            await self._async_login_client.aclose()
+            self._async_login_client = None
+
     def _validate(self):
         if not self.base_url:
             raise RuntimeError("LLM_BASE_URL no configurada")
@@ -0,0 +1,148 @@
+import os
+import json
+import time
+import asyncio
+import logging
+from contextlib import asynccontextmanager, contextmanager
+from dataclasses import dataclass
+from typing import Optional
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+logger = logging.getLogger("llm.sdk.auth.token_store")
+
+# cada cuánto se reintenta tomar el lock mientras otro proceso hace login
+_POLL_INTERVAL = 0.02
+
+
+@dataclass(slots=True)
+class StoredToken:
+    token: str
+    expires_at: Optional[float]
+
+    def valid(self, now: float = None) -> bool:
+        return self.expires_at is None or self.expires_at > (now or time.time())
+
+
+class FileTokenStore:
+    """
+    Token del gateway compartido por los procesos de una máquina (workers
+    de gunicorn, Celery...) en un archivo JSON.
+
+    El login se hace con un lock advisory (`flock`) sobre `<path>.lock`:
+    el primer proceso que lo toma hace login y escribe el token; los que
+    esperaban lo leen al entrar y no llaman a /llm/login. La escritura es
+    atómica (archivo temporal + `os.replace`), así que leer no necesita
+    lock.
+
+    `owner` identifica gateway y usuario: un token de otras credenciales
+    que comparta el archivo se ignora. Cualquier error de disco se
+    registra y se trata como miss; el store nunca hace fallar un login.
+    El archivo guarda el token en claro, por eso se crea con permisos 0600.
+    """
+
+    def __init__(self, path: str, owner: str):
+        self.path = os.path.expanduser(path)
+        self.owner = owner
+        self._lock_path = f"{self.path}.lock"
+
+        if fcntl is None:
+            logger.warning("fcntl no disponible: el token se comparte sin lock entre procesos")
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def load(self) -> Optional[StoredToken]:
+        try:
+            with open(self.path, encoding="utf-8") as fh:
+                data = json.load(fh)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as exc:
+            logger.warning("No se pudo leer el token compartido %s: %s", self.path, exc)
+            return None
+
+        if not isinstance(data, dict) or data.get("owner") != self.owner or not data.get("token"):
+            return None
+        return StoredToken(token=data["token"], expires_at=data.get("expires_at"))
+
+    def save(self, token: str, expires_at: Optional[float]) -> None:
+        tmp = f"{self.path}.{os.getpid()}.tmp"
+        payload = json.dumps({"owner": self.owner, "token": token, "expires_at": expires_at})
+        try:
+            fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, "w", encoding="utf-8") as fh:
+                fh.write(payload)
+            os.replace(tmp, self.path)
+        except OSError as exc:
+            logger.warning("No se pudo guardar el token compartido %s: %s", self.path, exc)
+
+    def _try_lock(self) -> Optional[int]:
+        """fd con el lock tomado, o None si lo tiene otro proceso."""
+        fd = os.open(self._lock_path, os.O_RDWR | os.O_CREAT, 0o600)
+        if fcntl is None:
+            return fd
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            os.close(fd)
+            return None
+        return fd
+
+    @staticmethod
+    def _unlock(fd: Optional[int]) -> None:
+        if fd is None:
+            return
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+        os.close(fd)
+
+    def _lock_timed_out(self, timeout: float) -> None:
+        logger.warning("Lock del token compartido ocupado más de %.0fs; login sin esperar", timeout)
+
+    @contextmanager
+    def locked(self, timeout: float):
+        """
+        Lock exclusivo entre procesos. Si no se obtiene en `timeout`
+        segundos (p. ej. el dueño quedó colgado) se sigue sin él.
+        """
+        deadline = time.monotonic() + timeout
+        fd = None
+        try:
+            fd = self._try_lock()
+            while fd is None and time.monotonic() < deadline:
+                time.sleep(_POLL_INTERVAL)
+                fd = self._try_lock()
+            if fd is None:
+                self._lock_timed_out(timeout)
+        except OSError as exc:
+            logger.warning("No se pudo tomar el lock del token compartido: %s", exc)
+
+        try:
+            yield
+        finally:
+            self._unlock(fd)
+
+    @asynccontextmanager
+    async def alocked(self, timeout: float):
+        """Como `locked`, esperando con asyncio.sleep en lugar de bloquear el event loop."""
+        deadline = time.monotonic() + timeout
+        fd = None
+        try:
+            fd = self._try_lock()
+            while fd is None and time.monotonic() < deadline:
+                await asyncio.sleep(_POLL_INTERVAL)
+                fd = self._try_lock()
+            if fd is None:
+                self._lock_timed_out(timeout)
+        except OSError as exc:
+            logger.warning("No se pudo tomar el lock del token compartido: %s", exc)
+
+        try:
+            yield
+        finally:
+            self._unlock(fd)
@@ -0,0 +1,261 @@
+import time
+import asyncio
+import httpx
+import logging
+from http import HTTPStatus
+from typing import AsyncIterator, Optional
+
+from .base_client import AsyncBaseClient
+from .chat_completions import AsyncChatCompletions
+from .client_core import ClientCore
+from .completions import AsyncCompletions
+from .embeddings import AsyncEmbeddings
+from ..transport.concurrency import Permit
+from ..transport.hedging import without_slot
+from ..transport.load_balancer import Backend
+from ..transport.rate_limiter import Reservation
+from .response_cache import ResponseCache
+from ..transport.sse import aiter_sse_data
+from langfuse import observe, get_client
+from ..config.settings import _sdk_settings
+
+
+langfuse = get_client()
+
+logger = logging.getLogger("llm.sdk.client.async")
+
+
+def _usable(task: asyncio.Task) -> bool:
+    """Una respuesta cuenta como ganadora si llegó y no es un 5xx."""
+    return task.exception() is None and task.result().status_code < HTTPStatus.INTERNAL_SERVER_ERROR
+
+
+async def _discard(task: asyncio.Task) -> None:
+    if not task.done():
+        task.cancel()
+    try:
+        resp = await task
+    except BaseException:
+        return
+    await resp.aclose()
+
+
+class AsyncLlmClient(ClientCore, AsyncBaseClient):
+    """
+    Cliente asíncrono para llama-server sobre un único httpx.AsyncClient.
+
+    Mantiene el mismo contrato que LlmClient (circuit breaker, auth y
+    observabilidad) pero permite tener cientos de requests en vuelo
+    desde un solo event loop.
+    """
+
+    _completions_class = AsyncCompletions
+    _chat_class = AsyncChatCompletions
+    _embeddings_class = AsyncEmbeddings
+
+    def __init__(
+        self,
+        base_url: str,
+        http_client: httpx.AsyncClient,
+        backends: Optional[list[str]] = None,
+        response_cache: Optional[ResponseCache] = None,
+        lean: bool = False,
+    ):
+        super().__init__(base_url, http_client, backends, response_cache, lean)
+
+    async def __aenter__(self) -> "AsyncLlmClient":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        await self._http_client.aclose()
+
+    async def _admit(self, kwargs: dict, prefer: Optional[str]) -> tuple[Optional[Reservation], Permit, Backend]:
+        """Cuota, hueco de concurrencia y backend para una request."""
+        reservation = self._reserve(kwargs)
+        try:
+            if reservation is not None and reservation.delay > 0:
+                await asyncio.sleep(reservation.delay)
+            permit = self._granted(await self._limiter.acquire_async()) if self._limiter is not None else Permit(None)
+        except BaseException:
+            self._refund(reservation)
+            raise
+
+        return reservation, permit, self._select_backend(prefer, reservation, permit)
+
+    async def _send(self, backend: Backend, method: str, endpoint: str, **kwargs) -> httpx.Response:
+        """
+        Envía la request aplicando la RetryPolicy. Solo el resultado final
+        se registra en el circuit breaker, los intentos intermedios no.
+        """
+        url = f"{backend.url}{endpoint}"
+        kwargs = self._encode_body(kwargs)
+        self._retry.budget.deposit()
+
+        attempt, delay = 0, None
+        while True:
+            attempt += 1
+            try:
+                resp = await self._http_client.request(method, url, **kwargs)
+            except (httpx.TimeoutException, httpx.RequestError) as e:
+                if not self._retry.should_retry_error(e, method, endpoint, attempt):
+                    raise
+                delay = self._retry.backoff(delay)
+                reason = type(e).__name__
+            else:
+                retry_after = resp.headers.get("Retry-After")
+                if not self._retry.should_retry_status(resp.status_code, method, endpoint, attempt, retry_after):
+                    return resp
+                delay = self._retry.backoff(delay, retry_after)
+                reason = resp.status_code
+                await resp.aclose()
+
+            logger.warning(
+                "Reintentando %s %s (intento %s, motivo %s) en %.2fs",
+                method, endpoint, attempt + 1, reason, delay,
+            )
+            langfuse.update_current_span(metadata={"retries": attempt})
+            await asyncio.sleep(delay)
+
+    async def _tracked_send(self, backend: Backend, method: str, endpoint: str, **kwargs) -> httpx.Response:
+        with self._balancer.track(backend):
+            return await self._send(backend, method, endpoint, **kwargs)
+
+    async def _dispatch(self, backend: Backend, method: str, endpoint: str, **kwargs) -> tuple[httpx.Response, Backend]:
+        """
+        Envía la request y devuelve (respuesta, backend que respondió).
+
+        Con hedging habilitado, si la respuesta tarda más que el percentil
+        configurado se lanza un duplicado a otro backend (o, sin réplicas,
+        a otro slot del mismo); gana la primera respuesta válida y la otra
+        task se cancela.
+        """
+        if self._hedging is None or not self._hedging.applies_to(endpoint):
+            return await self._tracked_send(backend, method, endpoint, **kwargs), backend
+
+        started = time.monotonic()
+        delay = self._hedging.delay()
+
+        if delay is None:
+            resp = await self._tracked_send(backend, method, endpoint, **kwargs)
+            self._hedging.observe(time.monotonic() - started)
+            return resp, backend
+
+        primary = asyncio.ensure_future(self._tracked_send(backend, method, endpoint, **kwargs))
+        done, _ = await asyncio.wait({primary}, timeout=delay)
+
+        permit = None
+        if not done:
+            alternate = self._balancer.pick(exclude=[backend]) or backend
+            permit = self._hedge_slot(alternate, kwargs)
+
+        if permit is None:
+            resp = await primary
+            self._hedging.observe(time.monotonic() - started)
+            return resp, backend
+
+        hedge = asyncio.ensure_future(
+            self._tracked_send(alternate, method, endpoint, **without_slot(kwargs))
+        )
+        hedge.add_done_callback(lambda t: permit.cancel() if t.cancelled() else permit.release())
+        logger.debug("Hedging %s %s hacia %s tras %.3fs", method, endpoint, alternate.url, delay)
+
+        winner, pending = None, {primary, hedge}
+        try:
+            while pending and winner is None:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                winner = next((t for t in done if _usable(t)), None)
+        except BaseException:
+            await asyncio.gather(_discard(primary), _discard(hedge))
+            raise
+
+        # si ambos fallaron se propaga el resultado del original
+        winner = winner or primary
+        await _discard(hedge if winner is primary else primary)
+
+        self._hedging.observe(time.monotonic() - started, hedge_won=winner is hedge)
+        langfuse.update_current_span(
+            metadata={"hedged": True, "hedge.winner": "hedge" if winner is hedge else "primary"}
+        )
+
+        return await winner, alternate if winner is hedge else backend
+
+    @observe(
+        name="llama.client.arequest",
+        capture_input=False,
+        capture_output=False,
+    )
+    async def _request(
+        self,
+        method: str,
+        endpoint: str,
+        affinity_key: Optional[str] = None,
+        decode_as: Optional[type] = None,
+        **kwargs,
+    ):
+        key, prefer, kwargs = self._prepare_affinity(endpoint, kwargs, affinity_key)
+        reservation, permit, backend = await self._admit(kwargs, prefer)
+        kwargs = self._pin_slot(key, backend, kwargs)
+        circuit = backend.circuit
+
+        try:
+            resp, backend = await self._dispatch(backend, method, endpoint, **kwargs)
+            circuit = backend.circuit
+            self._check_status(resp, circuit, permit)
+            return self._complete(resp, method, endpoint, backend, permit, reservation, key, prefer, decode_as)
+
+        except httpx.HTTPStatusError as e:
+            raise self._status_error(e, endpoint) from e
+
+        except (httpx.TimeoutException, httpx.RequestError) as e:
+            raise self._transport_error(e, endpoint, backend, permit) from e
+
+        finally:
+            permit.release()
+
+    @observe(
+        name="llama.client.astream",
+        capture_input=False,
+        capture_output=False,
+    )
+    async def _stream(self, method: str, endpoint: str, affinity_key: Optional[str] = None, **kwargs) -> AsyncIterator[dict]:
+        key, prefer, kwargs = self._prepare_affinity(endpoint, kwargs, affinity_key)
+        reservation, permit, backend = await self._admit(kwargs, prefer)
+        kwargs = self._pin_slot(key, backend, kwargs)
+        circuit = backend.circuit
+
+        try:
+            with self._balancer.track(backend):
+                async with self._http_client.stream(
+                    method,
+                    f"{backend.url}{endpoint}",
+                    **kwargs,
+                ) as resp:
+                    if resp.status_code >= HTTPStatus.BAD_REQUEST:
+                        # el body del error solo está disponible tras leerlo
+                        await resp.aread()
+                    self._check_status(resp, circuit, permit)
+                    self._trace_response(resp, method, endpoint, backend, stream=True)
+
+                    async for event in aiter_sse_data(resp.aiter_lines()):
+                        self._observe_event(event, backend, permit, reservation, key)
+                        yield event
+
+        except httpx.HTTPStatusError as e:
+            raise self._status_error(e, endpoint) from e
+
+        except (httpx.TimeoutException, httpx.RequestError) as e:
+            raise self._transport_error(e, endpoint, backend, permit) from e
+
+        finally:
+            permit.release()
+
+    @observe(
+        name="llama.client.ahealth",
+        capture_input=False,
+        capture_output=False,
+    )
+    async def health(self):
+        return await self._request("GET", _sdk_settings.llm.endpoints.health)
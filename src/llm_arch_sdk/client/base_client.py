@@ -1,8 +1,22 @@
 from abc import ABC, abstractmethod
-from typing import Any
+from typing import Any, AsyncIterator, Iterator
 
 
 class BaseClient(ABC):
     @abstractmethod
     def _request(self, method: str, endpoint: str, **kwargs) -> Any:
         pass
+
+    @abstractmethod
+    def _stream(self, method: str, endpoint: str, **kwargs) -> Iterator[dict]:
+        pass
+
+
+class AsyncBaseClient(ABC):
+    @abstractmethod
+    async def _request(self, method: str, endpoint: str, **kwargs) -> Any:
+        pass
+
+    @abstractmethod
+    def _stream(self, method: str, endpoint: str, **kwargs) -> AsyncIterator[dict]:
+        pass
@@ -1,18 +1,149 @@
 
 import logging
-from typing import Optional
+from typing import AsyncIterator, Iterator, Optional
 
-from .base_client import BaseClient
-from ..models.chat_completion import ChatCompletionResult
+from .base_client import AsyncBaseClient, BaseClient
+from .codec import decode_kwargs
+from .response_cache import ResponseCache, cache_key
+from .singleflight import AsyncSingleFlight, SingleFlight
+from .slot_affinity import affinity_kwargs
+from ..models.chat_completion import (
+    ChatChoice,
+    ChatCompletionChunk,
+    ChatCompletionResult,
+    ChatMessage,
+)
 from ..config.settings import _sdk_settings
 
 
 logger = logging.getLogger("llm.client.chatcompletions")
 
 
+class _ChatStreamAssembler:
+    """
+    Reconstruye el ChatCompletionResult a partir de los deltas.
+
+    Cada choice acumula sus fragmentos en una lista y el texto se une una
+    sola vez en `result()`, así una respuesta larga sigue siendo O(n).
+    """
+
+    def __init__(self):
+        self._first: Optional[ChatCompletionChunk] = None
+        self._roles: dict[int, str] = {}
+        self._parts: dict[int, list[str]] = {}
+        self._finish: dict[int, Optional[str]] = {}
+        self._usage = None
+        self._timings = None
+
+    def add(self, chunk: ChatCompletionChunk) -> None:
+        if self._first is None:
+            self._first = chunk
+
+        for choice in chunk.choices:
+            parts = self._parts.setdefault(choice.index, [])
+            if choice.delta.role:
+                self._roles[choice.index] = choice.delta.role
+            if choice.delta.content:
+                parts.append(choice.delta.content)
+            if choice.finish_reason:
+                self._finish[choice.index] = choice.finish_reason
+
+        if chunk.usage:
+            self._usage = chunk.usage
+        if chunk.timings:
+            self._timings = chunk.timings
+
+    def result(self) -> ChatCompletionResult:
+        first = self._first
+        return ChatCompletionResult(
+            id=first.id if first else None,
+            model=first.model if first else None,
+            created=first.created if first else None,
+            object="chat.completion",
+            system_fingerprint=first.system_fingerprint if first else None,
+            choices=[
+                ChatChoice(
+                    index=index,
+                    finish_reason=self._finish.get(index),
+                    message=ChatMessage(
+                        role=self._roles.get(index, "assistant"),
+                        content="".join(parts),
+                    ),
+                )
+                for index, parts in sorted(self._parts.items())
+            ],
+            usage=self._usage,
+            timings=self._timings,
+        )
+
+
+class ChatCompletionStream:
+    """
+    Iterador de ChatCompletionChunk. Al agotarse, `final()` devuelve el
+    ChatCompletionResult completo (incluye usage y timings).
+    """
+
+    def __init__(self, events: Iterator[dict]):
+        self._events = events
+        self._assembler = _ChatStreamAssembler()
+        self._result: Optional[ChatCompletionResult] = None
+
+    def __iter__(self) -> Iterator[ChatCompletionChunk]:
+        for event in self._events:
+            chunk = ChatCompletionChunk.from_dict(event)
+            self._assembler.add(chunk)
+            yield chunk
+        self._result = self._assembler.result()
+
+    def final(self) -> ChatCompletionResult:
+        """Consume lo que quede del stream y devuelve el resultado final."""
+        if self._result is None:
+            for _ in self:
+                pass
+        return self._result
+
+
+class AsyncChatCompletionStream:
+    """Versión asíncrona de ChatCompletionStream."""
+
+    def __init__(self, events: AsyncIterator[dict]):
+        self._events = events
+        self._assembler = _ChatStreamAssembler()
+        self._result: Optional[ChatCompletionResult] = None
+
+    async def __aiter__(self) -> AsyncIterator[ChatCompletionChunk]:
+        async for event in self._events:
+            chunk = ChatCompletionChunk.from_dict(event)
+            self._assembler.add(chunk)
+            yield chunk
+        self._result = self._assembler.result()
+
+    async def final(self) -> ChatCompletionResult:
+        """Consume lo que quede del stream y devuelve el resultado final."""
+        if self._result is None:
+            async for _ in self:
+                pass
+        return self._result
+
+
+def _stream_payload(model: str, messages: list, **kwargs) -> dict:
+    payload = {
+        "model": model,
+        "messages": messages,
+        **kwargs,
+        "stream": True,
+    }
+    # pedimos usage en el último frame salvo que el caller decida otra cosa
+    payload.setdefault("stream_options", {"include_usage": True})
+    return payload
+
+
 class ChatCompletions:
-    def __init__(self, client: BaseClient):
+    def __init__(self, client: BaseClient, cache: Optional[ResponseCache] = None, scope: str = ""):
         self._client = client
+        self._cache = cache
+        self._scope = scope
+        self._singleflight = SingleFlight(scope=scope)
 
     def create(
         self,
@@ -20,6 +151,8 @@ class ChatCompletions:
         messages: list,
         trace_metadata: Optional[dict] = None,
         trace_tags: Optional[list[str]] = None,
+        affinity_key: Optional[str] = None,
+        use_cache: bool = True,
         **kwargs,
     ):
         payload = {
@@ -30,18 +163,144 @@ class ChatCompletions:
 
         logger.debug("llm.client.chatcompletions.create %s", payload)
                
-        try:
+        endpoint = _sdk_settings.llm.endpoints.chat_completions
+
+        key = cache_key(self._cache, endpoint, payload, use_cache, self._scope)
+        if key is not None:
+            cached = self._cache.get(key)
+            if cached is not None:
+                logger.debug("llm.client.chatcompletions.create cache hit")
+                return ChatCompletionResult.from_dict(cached)
+
+        def fetch() -> ChatCompletionResult:
             raw = self._client._request(
                 "POST",
-                _sdk_settings.llm.endpoints.chat_completions,
+                endpoint,
                 json=payload,
+                **affinity_kwargs(affinity_key),
+                # la caché guarda el dict crudo; sin ella el codec puede decodificar directo al modelo
+                **(decode_kwargs(ChatCompletionResult) if key is None else {}),
             )
 
             logger.debug("llm.client.chatcompletions.create response %s", raw)
 
+            if isinstance(raw, ChatCompletionResult):
+                return raw
+
+            if key is not None:
+                self._cache.set(key, raw)
+
             return ChatCompletionResult.from_dict(raw)
+
+        try:
+            return self._singleflight.run(endpoint, payload, fetch)
         except Exception as exc:
             logger.error("Error in chat completions: %s", exc)
             raise
         finally:
-            pass
\ No newline at end of file
+            pass
+
+    def stream(
+        self,
+        model: str,
+        messages: list,
+        trace_metadata: Optional[dict] = None,
+        trace_tags: Optional[list[str]] = None,
+        affinity_key: Optional[str] = None,
+        **kwargs,
+    ) -> ChatCompletionStream:
+        payload = _stream_payload(model, messages, **kwargs)
+
+        logger.debug("llm.client.chatcompletions.stream %s", payload)
+
+        return ChatCompletionStream(
+            self._client._stream(
+                "POST",
+                _sdk_settings.llm.endpoints.chat_completions,
+                json=payload,
+                **affinity_kwargs(affinity_key),
+            )
+        )
+
+
+class AsyncChatCompletions:
+    def __init__(self, client: AsyncBaseClient, cache: Optional[ResponseCache] = None, scope: str = ""):
+        self._client = client
+        self._cache = cache
+        self._scope = scope
+        self._singleflight = AsyncSingleFlight(scope=scope)
+
+    async def create(
+        self,
+        model: str,
+        messages: list,
+        trace_metadata: Optional[dict] = None,
+        trace_tags: Optional[list[str]] = None,
+        affinity_key: Optional[str] = None,
+        use_cache: bool = True,
+        **kwargs,
+    ):
+        payload = {
+            "model": model,
+            "messages": messages,
+            **kwargs,
+        }
+
+        logger.debug("llm.client.chatcompletions.acreate %s", payload)
+
+        endpoint = _sdk_settings.llm.endpoints.chat_completions
+
+        key = cache_key(self._cache, endpoint, payload, use_cache, self._scope)
+        if key is not None:
+            cached = self._cache.get(key)
+            if cached is not None:
+                logger.debug("llm.client.chatcompletions.acreate cache hit")
+                return ChatCompletionResult.from_dict(cached)
+
+        async def fetch() -> ChatCompletionResult:
+            raw = await self._client._request(
+                "POST",
+                endpoint,
+                json=payload,
+                **affinity_kwargs(affinity_key),
+                # la caché guarda el dict crudo; sin ella el codec puede decodificar directo al modelo
+                **(decode_kwargs(ChatCompletionResult) if key is None else {}),
+            )
+
+            logger.debug("llm.client.chatcompletions.acreate response %s", raw)
+
+            if isinstance(raw, ChatCompletionResult):
+                return raw
+
+            if key is not None:
+                self._cache.set(key, raw)
+
+            return ChatCompletionResult.from_dict(raw)
+
+        try:
+            return await self._singleflight.run(endpoint, payload, fetch)
+        except Exception as exc:
+            logger.error("Error in chat completions: %s", exc)
+            raise
+
+    def stream(
+        self,
+        model: str,
+        messages: list,
+        trace_metadata: Optional[dict] = None,
+        trace_tags: Optional[list[str]] = None,
+        affinity_key: Optional[str] = None,
+        **kwargs,
+    ) -> AsyncChatCompletionStream:
+        payload = _stream_payload(model, messages, **kwargs)
+
+        logger.debug("llm.client.chatcompletions.astream %s", payload)
+
+        return AsyncChatCompletionStream(
+            self._client._stream(
+                "POST",
+                _sdk_settings.llm.endpoints.chat_completions,
+                json=payload,
+                **affinity_kwargs(affinity_key),
+            )
+        )
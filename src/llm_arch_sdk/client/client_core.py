@@ -0,0 +1,333 @@
+import httpx
+from http import HTTPStatus
+from typing import Any, Optional
+
+from ..transport.circuit_breaker import CircuitBreaker, CircuitBreakerOpen, CircuitState
+from ..transport.concurrency import OVERLOAD_STATUSES, ConcurrencyLimiter, Permit
+from ..transport.hedging import HedgePolicy
+from ..transport.load_balancer import Backend, LoadBalancer
+from ..transport.rate_limiter import RateLimiter, Reservation
+from ..transport.retry import RetryPolicy
+from .codec import JsonCodec
+from .embedding_batches import payload_too_large
+from .embedding_cache import EmbeddingCache
+from .response_cache import ResponseCache, default_response_cache
+from .slot_affinity import SlotAffinity
+from langfuse import get_client
+from ..config.settings import _sdk_settings
+
+
+langfuse = get_client()
+
+
+class LlmAPIError(Exception):
+    def __init__(self, message: str, status_code: Optional[int] = None, body: Optional[str] = None):
+        super().__init__(message)
+        self.status_code = status_code
+        self.body = body
+
+
+class ClientCore:
+    """
+    Estado y contabilidad comunes a LlmClient y AsyncLlmClient: réplicas,
+    circuit breakers, afinidad de slots, hedging, límites, codec y la
+    interpretación de cada respuesta. Aquí no hay I/O; cada cliente solo
+    aporta el envío y las esperas en su modelo de concurrencia.
+    """
+
+    _completions_class: type
+    _chat_class: type
+    _embeddings_class: type
+
+    def __init__(
+        self,
+        base_url: str,
+        http_client: Any,
+        backends: Optional[list[str]] = None,
+        response_cache: Optional[ResponseCache] = None,
+        lean: bool = False,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self._http_client = http_client
+        self._retry = RetryPolicy()
+
+        self._balancer = LoadBalancer(backends or self._replicas())
+        self._circuit = self._balancer.backends[0].circuit
+        # la caché y el single-flight no comparten respuestas entre clientes de otros servidores
+        self._scope = ",".join(sorted(b.url for b in self._balancer.backends))
+        self._affinity = SlotAffinity() if _sdk_settings.slot_affinity.enabled else None
+        self._hedging = HedgePolicy() if _sdk_settings.hedging.enabled else None
+        # un único límite para todos los clientes del proceso, sync y async
+        self._limiter = ConcurrencyLimiter.shared() if _sdk_settings.concurrency.enabled else None
+        self._rate_limiter = RateLimiter.shared() if _sdk_settings.rate_limit.enabled else None
+        self._codec = JsonCodec() if _sdk_settings.codec.enabled else None
+
+        if response_cache is None:
+            response_cache = default_response_cache()
+        self._response_cache = response_cache
+
+        self.completions = self._completions_class(self, cache=response_cache, lean=lean, scope=self._scope)
+        self.chat = self._chat_class(self, cache=response_cache, scope=self._scope)
+        self.embeddings = self._embeddings_class(
+            self,
+            cache=response_cache,
+            text_cache=EmbeddingCache() if _sdk_settings.embedding_cache.enabled else None,
+            scope=self._scope,
+        )
+
+    def _replicas(self) -> list[str]:
+        """
+        Réplicas de LLM_BASE_URLS solo si base_url es el LLM_BASE_URL
+        configurado; un base_url explícito distinto es el único backend.
+        """
+        configured = (_sdk_settings.llm.base_url or "").rstrip("/")
+        if _sdk_settings.llm.base_urls and self.base_url == configured:
+            return _sdk_settings.llm.base_urls
+        return [self.base_url]
+
+    @property
+    def response_cache(self) -> Optional[ResponseCache]:
+        """Caché de respuestas deterministas (None si está deshabilitada)."""
+        return self._response_cache
+
+    @property
+    def slot_affinity(self) -> Optional[SlotAffinity]:
+        """Afinidad de slots (None si está deshabilitada en settings)."""
+        return self._affinity
+
+    @property
+    def hedging(self) -> Optional[HedgePolicy]:
+        """Política de hedging (None si está deshabilitada en settings)."""
+        return self._hedging
+
+    @property
+    def concurrency(self) -> Optional[ConcurrencyLimiter]:
+        """Limitador de concurrencia adaptativo (None si está deshabilitado)."""
+        return self._limiter
+
+    @property
+    def rate_limiter(self) -> Optional[RateLimiter]:
+        """Rate limiter de requests/tokens (None si está deshabilitado)."""
+        return self._rate_limiter
+
+    # -------------------------
+    # Admisión
+    # -------------------------
+
+    def _prepare_affinity(
+        self, endpoint: str, kwargs: dict, affinity_key: Optional[str]
+    ) -> tuple[Optional[str], Optional[str], dict]:
+        if self._affinity is None:
+            return None, None, kwargs
+        return self._affinity.prepare(endpoint, kwargs, affinity_key)
+
+    def _pin_slot(self, key: Optional[str], backend: Backend, kwargs: dict) -> dict:
+        if key is None:
+            return kwargs
+        return self._affinity.pin(key, backend.url, kwargs)
+
+    def _reserve(self, kwargs: dict) -> Optional[Reservation]:
+        """Reserva cuota sin dormir; el cliente cumple `reservation.delay` a su manera."""
+        if self._rate_limiter is None:
+            return None
+
+        reservation = self._rate_limiter.reserve(self._rate_limiter.estimate(kwargs.get("json")))
+        langfuse.update_current_span(
+            metadata={"ratelimit.tokens": reservation.tokens, "ratelimit.wait": reservation.delay}
+        )
+        return reservation
+
+    def _refund(self, reservation: Optional[Reservation]) -> None:
+        if reservation is not None:
+            self._rate_limiter.refund(reservation)
+
+    def _granted(self, permit: Permit) -> Permit:
+        if self._limiter is not None:
+            langfuse.update_current_span(
+                metadata={"concurrency.limit": self._limiter.limit, "concurrency.queued": permit.queued}
+            )
+        return permit
+
+    def _pick_backend(self, prefer: Optional[str] = None) -> Backend:
+        backend = self._balancer.pick(prefer=prefer)
+
+        if backend is None or not backend.circuit.allow_request():
+            langfuse.update_current_span(
+                metadata={"circuit": CircuitState.OPEN.value, "blocked": True}
+            )
+
+            raise CircuitBreakerOpen("Circuit abierto para llama-server")
+
+        return backend
+
+    def _select_backend(self, prefer: Optional[str], reservation: Optional[Reservation], permit: Permit) -> Backend:
+        """Último paso de la admisión: si falla se devuelve lo ya tomado, la request no salió."""
+        try:
+            return self._pick_backend(prefer)
+        except BaseException:
+            permit.cancel()
+            self._refund(reservation)
+            raise
+
+    def _hedge_slot(self, backend: Backend, kwargs: dict) -> Optional[Permit]:
+        """
+        Recursos del duplicado, sin esperar: hueco de concurrencia, cuota
+        del rate limiter, presupuesto de hedging y permiso del circuit
+        breaker del backend alternativo. None si falta alguno; el hedge
+        nunca encola ni deja pasar carga que una request original no tendría.
+        """
+        permit = self._limiter.try_acquire() if self._limiter is not None else Permit(None)
+        if permit is None:
+            return None
+
+        reservation = None
+        if self._rate_limiter is not None:
+            reservation = self._rate_limiter.try_reserve(kwargs.get("json"))
+            if reservation is None:
+                permit.cancel()
+                return None
+
+        if self._hedging.try_hedge() and backend.circuit.allow_request():
+            return permit
+
+        permit.cancel()
+        self._refund(reservation)
+        return None
+
+    # -------------------------
+    # Codec
+    # -------------------------
+
+    def _encode_body(self, kwargs: dict) -> dict:
+        """Con el codec habilitado el cuerpo JSON se serializa aquí y no en httpx."""
+        if self._codec is None or "json" not in kwargs:
+            return kwargs
+
+        kwargs = dict(kwargs)
+        body = self._codec.encode(kwargs.pop("json"))
+        kwargs["headers"] = {**(kwargs.get("headers") or {}), "Content-Type": "application/json"}
+        return {**kwargs, "content": body}
+
+    def _decode(self, resp: httpx.Response, decode_as: Optional[type] = None) -> tuple[Any, Any]:
+        """(resultado, dict que leen los hooks); con `decode_as` el resultado ya es el modelo tipado."""
+        if self._codec is None:
+            raw = resp.json()
+            return raw, raw
+        if decode_as is not None:
+            return self._codec.decode_as(resp.content, decode_as)
+        raw = self._codec.decode(resp.content)
+        return raw, raw
+
+    # -------------------------
+    # Respuestas
+    # -------------------------
+
+    def _check_status(self, resp: httpx.Response, circuit: CircuitBreaker, permit: Permit) -> None:
+        """
+        Registra un único resultado por respuesta en el circuit breaker y el
+        limitador. Lanza LlmAPIError ante 5xx y HTTPStatusError ante 4xx; en
+        streaming el body de un error ya debe estar leído.
+
+        Un 4xx es un error del caller, no del backend: cuenta como éxito
+        salvo el 429, que indica saturación.
+        """
+        if resp.status_code in OVERLOAD_STATUSES:
+            permit.drop()
+
+        if resp.status_code >= HTTPStatus.INTERNAL_SERVER_ERROR:
+            # un rechazo por tamaño es un error de la request, no del backend
+            if payload_too_large(resp.status_code, resp.text):
+                circuit.record_success()
+            else:
+                circuit.record_failure()
+            raise LlmAPIError(f"Error {resp.status_code}", status_code=resp.status_code, body=resp.text)
+
+        if resp.status_code == HTTPStatus.TOO_MANY_REQUESTS:
+            circuit.record_failure()
+        else:
+            circuit.record_success()
+        resp.raise_for_status()
+
+    def _trace_response(self, resp: httpx.Response, method: str, endpoint: str, backend: Backend, **extra) -> None:
+        # no capturamos body ni headers
+        langfuse.update_current_span(
+            metadata={
+                "status_code": resp.status_code,
+                "endpoint": endpoint,
+                "method": method,
+                "backend": backend.url,
+                **extra,
+            }
+        )
+
+    def _complete(
+        self,
+        resp: httpx.Response,
+        method: str,
+        endpoint: str,
+        backend: Backend,
+        permit: Permit,
+        reservation: Optional[Reservation],
+        key: Optional[str],
+        prefer: Optional[str],
+        decode_as: Optional[type],
+    ) -> Any:
+        """Decodifica una respuesta 2xx y alimenta limitador, rate limiter y afinidad."""
+        self._trace_response(resp, method, endpoint, backend)
+
+        result, raw = self._decode(resp, decode_as)
+        if isinstance(raw, dict):
+            permit.observe(raw.get("timings"))
+        if reservation is not None:
+            self._rate_limiter.settle(reservation, raw)
+        if key is not None:
+            self._affinity.record(key, backend.url, raw)
+            langfuse.update_current_span(
+                metadata={"affinity.hit": prefer == backend.url, "id_slot": raw.get("id_slot")}
+            )
+
+        return result
+
+    def _observe_event(
+        self,
+        event: dict,
+        backend: Backend,
+        permit: Permit,
+        reservation: Optional[Reservation],
+        key: Optional[str],
+    ) -> None:
+        if "timings" in event:
+            permit.observe(event["timings"])
+        if reservation is not None and ("usage" in event or "timings" in event):
+            self._rate_limiter.settle(reservation, event)
+        if key is not None and (event.get("stop") or "timings" in event):
+            self._affinity.record(key, backend.url, event)
+
+    def _status_error(self, e: httpx.HTTPStatusError, endpoint: str) -> LlmAPIError:
+        """LlmAPIError de un 4xx; `_check_status` ya registró el resultado."""
+        langfuse.update_current_span(
+            metadata={
+                "status_code": e.response.status_code,
+                "endpoint": endpoint,
+            }
+        )
+        return LlmAPIError(
+            f"HTTP {e.response.status_code}: {e.response.text}",
+            status_code=e.response.status_code,
+            body=e.response.text,
+        )
+
+    def _transport_error(
+        self, e: httpx.HTTPError, endpoint: str, backend: Backend, permit: Permit
+    ) -> LlmAPIError:
+        backend.circuit.record_failure()
+        if isinstance(e, httpx.TimeoutException):
+            permit.drop()
+        langfuse.update_current_span(
+            metadata={
+                "endpoint": endpoint,
+                "backend": backend.url,
+                "error_type": type(e).__name__,
+            }
+        )
+        return LlmAPIError(str(e))
@@ -0,0 +1,114 @@
+import json
+import logging
+from dataclasses import asdict, is_dataclass
+from functools import lru_cache
+from typing import Any, TypeVar
+
+from ..config.settings import CodecSettings, _sdk_settings
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+logger = logging.getLogger("llm.sdk.client.codec")
+
+T = TypeVar("T")
+
+_BACKENDS = ("msgspec", "orjson", "json")
+
+# campos que leen los hooks de _request (rate limiter, concurrencia, afinidad)
+_META_FIELDS = ("id_slot", "timings", "usage", "tokens_evaluated", "tokens_predicted", "tokens_cached")
+
+
+def decode_kwargs(model_type: type) -> dict:
+    """kwargs extra para _request; vacío si el codec está deshabilitado."""
+    return {"decode_as": model_type} if _sdk_settings.codec.enabled else {}
+
+
+def _available(backend: str) -> bool:
+    return backend == "json" or {"msgspec": msgspec, "orjson": orjson}.get(backend) is not None
+
+
+if msgspec is not None:
+    @lru_cache(maxsize=None)
+    def _decoder(model_type: type) -> "msgspec.json.Decoder":
+        # el schema se compila una vez por tipo
+        return msgspec.json.Decoder(model_type)
+
+
+def _meta(result: Any) -> dict:
+    # los sub-modelos (Timings, Usage) vuelven a dict, que es lo que esperan los hooks
+    meta = {}
+    for name in _META_FIELDS:
+        value = getattr(result, name, None)
+        if value is not None:
+            meta[name] = asdict(value) if is_dataclass(value) else value
+    return meta
+
+
+class JsonCodec:
+    """
+    Codifica los cuerpos de request y decodifica las respuestas con el
+    codec más rápido disponible: msgspec, orjson o el json de la stdlib.
+
+    Con msgspec, `decode_as` pasa de los bytes de la respuesta directo a
+    los dataclasses tipados (CompletionResult, ChatCompletionResult...)
+    con un decoder compilado por tipo, sin armar el árbol de dicts que
+    luego recorre `from_dict`. Si la respuesta no encaja en el schema
+    (campos faltantes o de otro tipo) se usa `from_dict`, que es tolerante.
+    """
+
+    def __init__(self, settings: CodecSettings = None):
+        self.settings = settings or _sdk_settings.codec
+        self.backend = self._resolve(self.settings.backend)
+
+    @staticmethod
+    def _resolve(backend: str) -> str:
+        if backend == "auto":
+            return next(b for b in _BACKENDS if _available(b))
+
+        if backend not in _BACKENDS:
+            raise ValueError(f"Codec desconocido: {backend}")
+
+        if not _available(backend):
+            fallback = next(b for b in _BACKENDS if _available(b))
+            logger.warning("Codec '%s' solicitado pero no está instalado; se usa '%s'", backend, fallback)
+            return fallback
+
+        return backend
+
+    def encode(self, obj: Any) -> bytes:
+        if self.backend == "msgspec":
+            return msgspec.json.encode(obj)
+        if self.backend == "orjson":
+            return orjson.dumps(obj)
+        return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode()
+
+    def decode(self, data: bytes) -> Any:
+        if self.backend == "msgspec":
+            return msgspec.json.decode(data)
+        if self.backend == "orjson":
+            return orjson.loads(data)
+        return json.loads(data)
+
+    def decode_as(self, data: bytes, model_type: type[T]) -> tuple[T, dict]:
+        """
+        Devuelve (modelo tipado, meta), donde meta es un dict con los
+        campos que usan los hooks del cliente (timings, usage, id_slot...).
+        """
+        if self.backend == "msgspec":
+            try:
+                result = _decoder(model_type).decode(data)
+            except msgspec.ValidationError as exc:
+                logger.debug("Respuesta fuera del schema de %s (%s); se usa from_dict", model_type.__name__, exc)
+            else:
+                return result, _meta(result)
+
+        raw = self.decode(data)
+        return model_type.from_dict(raw), raw
@@ -1,9 +1,13 @@
 
 import logging
-from typing import Optional
+from typing import AsyncIterator, Iterator, Optional
 
-from .base_client import BaseClient
-from ..models.completion import CompletionResult
+from .base_client import AsyncBaseClient, BaseClient
+from .codec import decode_kwargs
+from .response_cache import ResponseCache, cache_key
+from .singleflight import AsyncSingleFlight, SingleFlight
+from .slot_affinity import affinity_kwargs
+from ..models.completion import CompletionChunk, CompletionResult
 from ..config.settings import _sdk_settings
 from langfuse import observe, get_client
 
@@ -12,9 +16,37 @@ langfuse = get_client()
 logger = logging.getLogger("llm.client.completions")
 
 
+def _collect_chunk(event: dict, parts: list[str], tokens: list[int], lean: bool = False) -> CompletionChunk:
+    # acumulamos en listas y unimos una sola vez al final (O(n))
+    chunk = CompletionChunk.from_dict(event)
+    if chunk.content:
+        parts.append(chunk.content)
+    if chunk.tokens:
+        tokens.extend(chunk.tokens)
+
+    if chunk.stop:
+        # cada evento trae solo sus propios tokens: el resultado lleva todos los del stream
+        chunk.result = CompletionResult.from_dict(
+            {**event, "content": "".join(parts), "tokens": tokens or None}, lean=lean
+        )
+        logger.debug("llm.client.completions.stream result %s", chunk.result)
+
+    return chunk
+
+
 class Completions:
-    def __init__(self, client: BaseClient):
+    def __init__(
+        self,
+        client: BaseClient,
+        cache: Optional[ResponseCache] = None,
+        lean: bool = False,
+        scope: str = "",
+    ):
         self._client = client
+        self._cache = cache
+        self._lean = lean
+        self._scope = scope
+        self._singleflight = SingleFlight(scope=scope)
 
     @observe(
         name="llama.client.completions.create",
@@ -27,6 +59,9 @@ class Completions:
         n_predict: int,
         trace_metadata: Optional[dict] = None,
         trace_tags: Optional[list[str]] = None,
+        affinity_key: Optional[str] = None,
+        use_cache: bool = True,
+        lean: Optional[bool] = None,
         **kwargs,
     ):
         payload = {
@@ -45,15 +80,212 @@ class Completions:
             }
         )
 
-        raw = self._client._request(
+        endpoint = _sdk_settings.llm.endpoints.completions
+        lean = self._lean if lean is None else lean
+
+        key = cache_key(self._cache, endpoint, payload, use_cache, self._scope)
+        if key is not None:
+            cached = self._cache.get(key)
+            if cached is not None:
+                logger.debug("llm.client.completions.create cache hit")
+                return CompletionResult.from_dict(cached, lean=lean)
+
+        def fetch() -> CompletionResult:
+            raw = self._client._request(
+                "POST",
+                endpoint,
+                json=payload,
+                **affinity_kwargs(affinity_key),
+                # la caché guarda el dict crudo; sin ella el codec puede decodificar directo al modelo
+                **(decode_kwargs(CompletionResult) if key is None else {}),
+            )
+
+            logger.debug("llm.client.completions.create response %s", raw)
+
+            if isinstance(raw, CompletionResult):
+                return raw.drop_echo() if lean else raw
+
+            if key is not None:
+                self._cache.set(key, raw)
+
+            return CompletionResult.from_dict(raw, lean=lean)
+
+        # lean y completo no comparten el resultado en vuelo
+        return self._singleflight.run(f"{endpoint}#lean" if lean else endpoint, payload, fetch)
+
+    @observe(
+        name="llama.client.completions.stream",
+        as_type="generation",
+        capture_output=False,
+    )
+    def stream(
+        self,
+        prompt: str,
+        temperature: float,
+        n_predict: int,
+        trace_metadata: Optional[dict] = None,
+        trace_tags: Optional[list[str]] = None,
+        affinity_key: Optional[str] = None,
+        lean: Optional[bool] = None,
+        **kwargs,
+    ) -> Iterator[CompletionChunk]:
+        """
+        Genera los tokens a medida que llama-server los emite (SSE).
+        El último CompletionChunk trae el CompletionResult completo.
+        """
+        payload = {
+            "prompt": prompt,
+            "temperature": temperature,
+            "n_predict": n_predict,
+            **kwargs,
+            "stream": True,
+        }
+
+        logger.debug("llm.client.completions.stream %s", payload)
+        langfuse.update_current_span(
+            input=prompt,
+            metadata={
+                "temperature": temperature,
+                "n_predict": n_predict,
+                "stream": True,
+            }
+        )
+
+        parts: list[str] = []
+        tokens: list[int] = []
+        for event in self._client._stream(
             "POST",
             _sdk_settings.llm.endpoints.completions,
             json=payload,
+            **affinity_kwargs(affinity_key),
+        ):
+            yield _collect_chunk(event, parts, tokens, self._lean if lean is None else lean)
+
+
+
+class AsyncCompletions:
+    def __init__(
+        self,
+        client: AsyncBaseClient,
+        cache: Optional[ResponseCache] = None,
+        lean: bool = False,
+        scope: str = "",
+    ):
+        self._client = client
+        self._cache = cache
+        self._lean = lean
+        self._scope = scope
+        self._singleflight = AsyncSingleFlight(scope=scope)
+
+    @observe(
+        name="llama.client.completions.acreate",
+        as_type="generation"
+    )
+    async def create(
+        self,
+        prompt: str,
+        temperature: float ,
+        n_predict: int,
+        trace_metadata: Optional[dict] = None,
+        trace_tags: Optional[list[str]] = None,
+        affinity_key: Optional[str] = None,
+        use_cache: bool = True,
+        lean: Optional[bool] = None,
+        **kwargs,
+    ):
+        payload = {
+            "prompt": prompt,
+            "temperature": temperature,
+            "n_predict": n_predict,
+            **kwargs,
+        }
+
+        logger.debug("llm.client.completions.acreate %s", payload)
+        langfuse.update_current_span(
+            input=prompt,
+            metadata={
+                "temperature": temperature,
+                "n_predict": n_predict,
+            }
         )
 
-        logger.debug("llm.client.completions.create response %s", raw)
-            
-        result = CompletionResult.from_dict(raw)
+        endpoint = _sdk_settings.llm.endpoints.completions
+        lean = self._lean if lean is None else lean
+
+        key = cache_key(self._cache, endpoint, payload, use_cache, self._scope)
+        if key is not None:
+            cached = self._cache.get(key)
+            if cached is not None:
+                logger.debug("llm.client.completions.acreate cache hit")
+                return CompletionResult.from_dict(cached, lean=lean)
+
+        async def fetch() -> CompletionResult:
+            raw = await self._client._request(
+                "POST",
+                endpoint,
+                json=payload,
+                **affinity_kwargs(affinity_key),
+                # la caché guarda el dict crudo; sin ella el codec puede decodificar directo al modelo
+                **(decode_kwargs(CompletionResult) if key is None else {}),
+            )
 
-        return result
-        
+            logger.debug("llm.client.completions.acreate response %s", raw)
+
+            if isinstance(raw, CompletionResult):
+                return raw.drop_echo() if lean else raw
+
+            if key is not None:
+                self._cache.set(key, raw)
+
+            return CompletionResult.from_dict(raw, lean=lean)
+
+        # lean y completo no comparten el resultado en vuelo
+        return await self._singleflight.run(f"{endpoint}#lean" if lean else endpoint, payload, fetch)
+
+    @observe(
+        name="llama.client.completions.astream",
+        as_type="generation",
+        capture_output=False,
+    )
+    async def stream(
+        self,
+        prompt: str,
+        temperature: float,
+        n_predict: int,
+        trace_metadata: Optional[dict] = None,
+        trace_tags: Optional[list[str]] = None,
+        affinity_key: Optional[str] = None,
+        lean: Optional[bool] = None,
+        **kwargs,
+    ) -> AsyncIterator[CompletionChunk]:
+        """
+        Genera los tokens a medida que llama-server los emite (SSE).
+        El último CompletionChunk trae el CompletionResult completo.
+        """
+        payload = {
+            "prompt": prompt,
+            "temperature": temperature,
+            "n_predict": n_predict,
+            **kwargs,
+            "stream": True,
+        }
+
+        logger.debug("llm.client.completions.astream %s", payload)
+        langfuse.update_current_span(
+            input=prompt,
+            metadata={
+                "temperature": temperature,
+                "n_predict": n_predict,
+                "stream": True,
+            }
+        )
+
+        parts: list[str] = []
+        tokens: list[int] = []
+        async for event in self._client._stream(
+            "POST",
+            _sdk_settings.llm.endpoints.completions,
+            json=payload,
+            **affinity_kwargs(affinity_key),
+        ):
+            yield _collect_chunk(event, parts, tokens, self._lean if lean is None else lean)
@@ -0,0 +1,156 @@
+import time
+import threading
+import logging
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Optional
+
+from .embeddings import Embeddings
+from ..config.settings import EmbeddingMicroBatchSettings, _sdk_settings
+
+logger = logging.getLogger("llm.sdk.client.embedding_batcher")
+
+
+class EmbeddingBatcher:
+    """
+    Junta embeddings de un solo texto pedidos desde muchos threads en una
+    request a /v1/embeddings por modelo.
+
+    `submit` devuelve un Future al instante; un thread en segundo plano
+    envía el lote de cada modelo al llegar a `max_items` textos o cuando
+    el más antiguo lleva `max_wait_ms` esperando (la latencia máxima que
+    se añade a cada texto). Textos repetidos dentro de un lote se piden
+    una sola vez. Un error en la request se propaga a todos los Futures
+    del lote.
+    """
+
+    def __init__(self, embeddings: Embeddings, settings: EmbeddingMicroBatchSettings = None):
+        self._embeddings = embeddings
+        self.settings = settings or _sdk_settings.embedding_micro_batch
+
+        self._pending: dict[str, list[tuple[str, Future]]] = {}
+        self._deadlines: dict[str, float] = {}
+        self._cond = threading.Condition()
+        self._closed = False
+        self._thread: Optional[threading.Thread] = None
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.settings.max_concurrency,
+            thread_name_prefix="llm-embedding-batcher",
+        )
+
+        self.batches = 0
+        self.items = 0
+
+    def submit(self, model: str, text: str) -> Future:
+        future: Future = Future()
+
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("EmbeddingBatcher cerrado")
+            self._ensure_thread()
+
+            items = self._pending.setdefault(model, [])
+            if not items:
+                self._deadlines[model] = time.monotonic() + self.settings.max_wait_ms / 1000
+            items.append((text, future))
+
+            if len(items) >= self.settings.max_items:
+                # con el lock tomado: close() no puede apagar el executor entre medio
+                self._dispatch(model, self._take(model))
+            else:
+                self._cond.notify()
+
+        return future
+
+    def embed(self, model: str, text: str, timeout: Optional[float] = None) -> list[float]:
+        return self.submit(model, text).result(timeout)
+
+    def _ensure_thread(self) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="llm-embedding-batcher", daemon=True)
+            self._thread.start()
+
+    def _take(self, model: str) -> list[tuple[str, Future]]:
+        self._deadlines.pop(model, None)
+        return self._pending.pop(model)
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while True:
+                    now = time.monotonic()
+                    due = [m for m, deadline in self._deadlines.items() if self._closed or deadline <= now]
+                    if due or self._closed:
+                        break
+                    timeout = min(self._deadlines.values()) - now if self._deadlines else None
+                    self._cond.wait(timeout)
+
+                batches = [(model, self._take(model)) for model in due]
+                stop = self._closed and not self._pending
+
+            for model, batch in batches:
+                self._dispatch(model, batch)
+            if stop:
+                return
+
+    def _dispatch(self, model: str, batch: list[tuple[str, Future]]) -> None:
+        # los Futures cancelados por el caller no se envían
+        batch = [(text, future) for text, future in batch if future.set_running_or_notify_cancel()]
+        if not batch:
+            return
+
+        with self._cond:
+            self.batches += 1
+            self.items += len(batch)
+
+        try:
+            self._executor.submit(self._send, model, batch)
+        except RuntimeError as exc:
+            # executor ya apagado (p. ej. al terminar el intérprete): nadie debe quedar esperando
+            for _, future in batch:
+                future.set_exception(exc)
+
+    def _send(self, model: str, batch: list[tuple[str, Future]]) -> None:
+        texts = list(dict.fromkeys(text for text, _ in batch))
+        logger.debug("llm.client.embedding_batcher model=%s textos=%s únicos=%s", model, len(batch), len(texts))
+
+        try:
+            raw = self._embeddings.create(model=model, input=texts)
+            data = sorted(raw.get("data") or [], key=lambda item: item.get("index", 0))
+            if len(data) != len(texts):
+                raise ValueError(f"/v1/embeddings devolvió {len(data)} vectores para {len(texts)} textos")
+        except BaseException as exc:
+            for _, future in batch:
+                future.set_exception(exc)
+            return
+
+        vectors = {text: item["embedding"] for text, item in zip(texts, data)}
+        for text, future in batch:
+            future.set_result(vectors[text])
+
+    def close(self) -> None:
+        """Envía lo pendiente y espera a que terminen las requests en vuelo."""
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify()
+            thread = self._thread
+
+        if thread is not None:
+            thread.join()
+        self._executor.shutdown(wait=True)
+
+    def __enter__(self) -> "EmbeddingBatcher":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def stats(self) -> dict:
+        with self._cond:
+            return {
+                "pending": sum(len(items) for items in self._pending.values()),
+                "batches": self.batches,
+                "items": self.items,
+                "avg_batch_size": self.items / self.batches if self.batches else 0.0,
+            }
@@ -0,0 +1,87 @@
+import re
+import math
+import logging
+from typing import Iterable
+
+from ..config.settings import EmbeddingBatchSettings
+from ..transport.concurrency import OVERLOAD_STATUSES
+
+logger = logging.getLogger("llm.sdk.client.embedding_batches")
+
+# mensajes de llama-server cuando el lote no entra en el contexto / batch físico:
+# "input (N tokens) is too large to process. increase the physical batch size",
+# "the request exceeds the available context size", "input is larger than the max context size"
+_TOO_LARGE = re.compile(
+    r"is too large to process|physical batch size"
+    r"|exceeds the (?:available )?context size|larger than the max context size",
+    re.IGNORECASE,
+)
+
+
+def split_batches(texts: list[str], settings: EmbeddingBatchSettings) -> list[list[str]]:
+    """
+    Parte `texts` en lotes consecutivos de como mucho `max_items` textos y
+    `max_tokens` tokens estimados. Un texto que por sí solo supera
+    `max_tokens` va en su propio lote.
+    """
+    batches: list[list[str]] = []
+    current: list[str] = []
+    tokens = 0
+
+    for text in texts:
+        cost = math.ceil(len(text) / settings.chars_per_token)
+        if current and (len(current) >= settings.max_items or tokens + cost > settings.max_tokens):
+            batches.append(current)
+            current, tokens = [], 0
+        current.append(text)
+        tokens += cost
+
+    if current:
+        batches.append(current)
+    return batches
+
+
+def merge_responses(responses: Iterable[dict]) -> dict:
+    """Une las respuestas de varios lotes renumerando `index` en orden."""
+    data: list[dict] = []
+    prompt_tokens = total_tokens = 0
+    model = None
+
+    for raw in responses:
+        model = model or raw.get("model")
+        offset = len(data)
+        for item in sorted(raw.get("data") or [], key=lambda item: item.get("index", 0)):
+            data.append({**item, "index": offset + item.get("index", 0)})
+
+        usage = raw.get("usage") or {}
+        prompt_tokens += usage.get("prompt_tokens", 0) or 0
+        total_tokens += usage.get("total_tokens", 0) or 0
+
+    return {
+        "object": "list",
+        "model": model,
+        "data": data,
+        "usage": {"prompt_tokens": prompt_tokens, "total_tokens": total_tokens},
+    }
+
+
+def payload_too_large(status_code: int, body: str) -> bool:
+    """
+    True si la respuesta rechaza la request por tamaño: 413 o el error de
+    contexto / batch físico de llama-server. Un 429/503 es sobrecarga,
+    nunca tamaño, diga lo que diga el body.
+    """
+    if status_code == 413:
+        return True
+    if status_code < 400 or status_code in OVERLOAD_STATUSES:
+        return False
+    return isinstance(body, str) and bool(_TOO_LARGE.search(body))
+
+
+def is_too_large(exc: Exception) -> bool:
+    """True si el servidor rechazó el lote por tamaño (413 o error de contexto)."""
+    status = getattr(exc, "status_code", None)
+    if status is None:
+        return False
+    body = getattr(exc, "body", None)
+    return payload_too_large(status, body if isinstance(body, str) else str(exc))
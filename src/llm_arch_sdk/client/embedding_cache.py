@@ -0,0 +1,154 @@
+import hashlib
+import threading
+import logging
+from dataclasses import dataclass, field
+from typing import Optional, Union
+
+from .persistent_cache import open_persistent_cache
+from .response_cache import InMemoryResponseCache, ResponseCache, TieredResponseCache
+from ..config.settings import (
+    EmbeddingCacheSettings,
+    PersistentCacheSettings,
+    ResponseCacheSettings,
+    _sdk_settings,
+)
+
+logger = logging.getLogger("llm.sdk.client.embedding_cache")
+
+Vector = Union[tuple[float, ...], list[float], str]
+
+
+def _freeze(vector: Vector) -> Vector:
+    """Lo que se guarda es inmutable: base64 ya es str, los floats pasan a tupla."""
+    return vector if isinstance(vector, str) else tuple(vector)
+
+
+def _thaw(vector: Vector) -> Vector:
+    """Cada respuesta recibe su propia lista; mutarla no toca la caché."""
+    return vector if isinstance(vector, str) else list(vector)
+
+
+@dataclass
+class EmbeddingPlan:
+    """Resultado de consultar la caché para un `input`: qué hay y qué falta."""
+    model: str
+    texts: list[str]
+    vectors: list[Optional[Vector]]
+    # textos sin vector, sin duplicados y en orden de primera aparición
+    misses: list[str] = field(default_factory=list)
+    encoding_format: Optional[str] = None
+
+
+class EmbeddingCache:
+    """
+    Caché de embeddings por texto, con clave hash(model, text).
+
+    `plan` resuelve lo que ya está en caché y deja solo los textos que
+    faltan (deduplicados) para enviar a /v1/embeddings; `complete` guarda
+    los vectores nuevos y arma la respuesta en el orden original del
+    caller, con la misma forma que devuelve llama-server.
+    """
+
+    def __init__(self, settings: EmbeddingCacheSettings = None, store: ResponseCache = None):
+        self.settings = settings or _sdk_settings.embedding_cache
+        self._store = store or self._default_store()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.duplicates = 0
+
+    def _default_store(self) -> ResponseCache:
+        s = self.settings
+        memory = InMemoryResponseCache(
+            ResponseCacheSettings(enabled=True, max_entries=s.max_entries, ttl_seconds=s.ttl_seconds)
+        )
+        if not s.persistent:
+            return memory
+
+        disk = open_persistent_cache(
+            PersistentCacheSettings(enabled=True, path=s.path, ttl_seconds=s.ttl_seconds, max_bytes=s.max_bytes)
+        )
+        return memory if disk is None else TieredResponseCache(memory, disk)
+
+    @staticmethod
+    def key(model: str, text: str, encoding_format: Optional[str] = None) -> str:
+        # base64 y floats JSON se guardan por separado: la respuesta conserva el formato pedido
+        suffix = f"\x1f{encoding_format}" if encoding_format and encoding_format != "float" else ""
+        return hashlib.sha256(f"{model}\x1f{text}{suffix}".encode()).hexdigest()
+
+    def plan(self, model: str, input: Union[str, list[str]], encoding_format: Optional[str] = None) -> EmbeddingPlan:
+        texts = [input] if isinstance(input, str) else list(input)
+        plan = EmbeddingPlan(
+            model=model, texts=texts, vectors=[None] * len(texts), encoding_format=encoding_format
+        )
+
+        seen: dict[str, Optional[Vector]] = {}
+        hits = duplicates = 0
+        for i, text in enumerate(texts):
+            if text in seen:
+                duplicates += 1
+                plan.vectors[i] = seen[text]
+                continue
+
+            entry = self._store.get(self.key(model, text, encoding_format))
+            vector = entry["embedding"] if entry is not None else None
+            seen[text] = vector
+            plan.vectors[i] = vector
+
+            if vector is None:
+                plan.misses.append(text)
+            else:
+                hits += 1
+
+        with self._lock:
+            self.hits += hits
+            self.misses += len(plan.misses)
+            self.duplicates += duplicates
+
+        return plan
+
+    def complete(self, plan: EmbeddingPlan, raw: Optional[dict]) -> dict:
+        """Guarda los vectores de `raw` (respuesta a `plan.misses`) y arma la respuesta final."""
+        usage = {"prompt_tokens": 0, "total_tokens": 0}
+        model = plan.model
+
+        if plan.misses:
+            data = sorted(raw.get("data") or [], key=lambda item: item.get("index", 0))
+            if len(data) != len(plan.misses):
+                raise ValueError(
+                    f"/v1/embeddings devolvió {len(data)} vectores para {len(plan.misses)} textos"
+                )
+
+            fresh = {}
+            for text, item in zip(plan.misses, data):
+                fresh[text] = _freeze(item["embedding"])
+                self._store.set(self.key(plan.model, text, plan.encoding_format), {"embedding": fresh[text]})
+
+            for i, text in enumerate(plan.texts):
+                if plan.vectors[i] is None:
+                    plan.vectors[i] = fresh[text]
+
+            usage = raw.get("usage") or usage
+            model = raw.get("model") or model
+
+        return {
+            "object": "list",
+            "model": model,
+            "data": [
+                {"object": "embedding", "index": i, "embedding": _thaw(vector)}
+                for i, vector in enumerate(plan.vectors)
+            ],
+            "usage": usage,
+        }
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "duplicates": self.duplicates,
+                "hit_ratio": self.hits / total if total else 0.0,
+                "store": self._store.stats(),
+            }
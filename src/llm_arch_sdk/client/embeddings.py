@@ -1,16 +1,38 @@
 
+import copy
+import asyncio
 import logging
-from typing import Optional
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Union
 
-from .base_client import BaseClient
-from ..config.settings import _sdk_settings
+from .base_client import AsyncBaseClient, BaseClient
+from .embedding_batches import is_too_large, merge_responses, split_batches
+from .embedding_cache import EmbeddingCache
+from .response_cache import ResponseCache, cache_key
+from .singleflight import AsyncSingleFlight, SingleFlight
+from ..config.settings import EmbeddingBatchSettings, _sdk_settings
+from ..models.embedding import EmbeddingResult
 
 logger = logging.getLogger("llm.client.embeddings")
 
 
 class Embeddings:
-    def __init__(self, client: BaseClient):
+    def __init__(
+        self,
+        client: BaseClient,
+        cache: Optional[ResponseCache] = None,
+        text_cache: Optional[EmbeddingCache] = None,
+        batching: EmbeddingBatchSettings = None,
+        scope: str = "",
+    ):
         self._client = client
+        self._cache = cache
+        self._scope = scope
+        self._text_cache = text_cache
+        self._batching = batching or _sdk_settings.embedding_batch
+        self._singleflight = SingleFlight(scope=scope)
+        self._executor: Optional[ThreadPoolExecutor] = None
 
     def create(
         self,
@@ -18,17 +40,187 @@ class Embeddings:
         input: list[str],
         trace_metadata: Optional[dict] = None,
         trace_tags: Optional[list[str]] = None,
-    ):
+        use_cache: bool = True,
+        encoding_format: Optional[str] = None,
+        as_array: bool = False,
+    ) -> Union[dict, EmbeddingResult]:
         logger.debug("llm.client.embeddings.create model=%s input=%s", model, input)
+
+        if self._text_cache is None or not use_cache:
+            raw = self._fetch(model, input, use_cache, encoding_format)
+        else:
+            # solo los textos que no están en caché, sin duplicados, van al servidor
+            plan = self._text_cache.plan(model, input, encoding_format)
+            misses = self._fetch(model, plan.misses, False, encoding_format) if plan.misses else None
+            raw = self._text_cache.complete(plan, misses)
+
+        return EmbeddingResult.from_dict(raw) if as_array else raw
+
+    def _fetch(
+        self,
+        model: str,
+        input: Union[str, list[str]],
+        use_cache: bool = True,
+        encoding_format: Optional[str] = None,
+    ) -> dict:
+        batches = [input] if isinstance(input, str) else split_batches(input, self._batching)
+        if len(batches) <= 1:
+            return self._send(model, input, use_cache, encoding_format)
+
+        logger.debug("llm.client.embeddings %s textos en %s lotes", len(input), len(batches))
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self._batching.max_concurrency,
+                thread_name_prefix="llm-embeddings",
+            )
+
+        futures = [
+            self._executor.submit(
+                contextvars.copy_context().run, self._send, model, batch, use_cache, encoding_format
+            )
+            for batch in batches
+        ]
+        return merge_responses(future.result() for future in futures)
+
+    def _send(
+        self, model: str, input: Union[str, list[str]], use_cache: bool, encoding_format: Optional[str]
+    ) -> dict:
+        """Envía un lote; si el servidor lo rechaza por tamaño, lo parte en dos."""
+        try:
+            return self._request_batch(model, input, use_cache, encoding_format)
+        except Exception as exc:
+            if isinstance(input, str) or len(input) < 2 or not is_too_large(exc):
+                raise
+
+            half = len(input) // 2
+            logger.warning("Lote de %s embeddings demasiado grande, se parte en dos", len(input))
+            return merge_responses([
+                self._send(model, input[:half], use_cache, encoding_format),
+                self._send(model, input[half:], use_cache, encoding_format),
+            ])
+
+    def _request_batch(
+        self, model: str, input: Union[str, list[str]], use_cache: bool, encoding_format: Optional[str]
+    ) -> dict:
         payload = {"model": model, "input": input}
+        if encoding_format is not None:
+            payload["encoding_format"] = encoding_format
+
+        endpoint = _sdk_settings.llm.endpoints.embeddings
+
+        key = cache_key(self._cache, endpoint, payload, use_cache, self._scope)
+        if key is not None:
+            cached = self._cache.get(key)
+            if cached is not None:
+                logger.debug("llm.client.embeddings.fetch cache hit")
+                # copia: lo que el caller haga con la respuesta no debe alterar la caché
+                return copy.deepcopy(cached)
+
+        def fetch() -> dict:
+            raw = self._client._request("POST", endpoint, json=payload)
+            if key is not None:
+                self._cache.set(key, copy.deepcopy(raw))
+            return raw
+
+        return self._singleflight.run(endpoint, payload, fetch)
+
+
+class AsyncEmbeddings:
+    def __init__(
+        self,
+        client: AsyncBaseClient,
+        cache: Optional[ResponseCache] = None,
+        text_cache: Optional[EmbeddingCache] = None,
+        batching: EmbeddingBatchSettings = None,
+        scope: str = "",
+    ):
+        self._client = client
+        self._cache = cache
+        self._scope = scope
+        self._text_cache = text_cache
+        self._batching = batching or _sdk_settings.embedding_batch
+        self._singleflight = AsyncSingleFlight(scope=scope)
+
+    async def create(
+        self,
+        model: str,
+        input: list[str],
+        trace_metadata: Optional[dict] = None,
+        trace_tags: Optional[list[str]] = None,
+        use_cache: bool = True,
+        encoding_format: Optional[str] = None,
+        as_array: bool = False,
+    ) -> Union[dict, EmbeddingResult]:
+        logger.debug("llm.client.embeddings.acreate model=%s input=%s", model, input)
+
+        if self._text_cache is None or not use_cache:
+            raw = await self._fetch(model, input, use_cache, encoding_format)
+        else:
+            # solo los textos que no están en caché, sin duplicados, van al servidor
+            plan = self._text_cache.plan(model, input, encoding_format)
+            misses = await self._fetch(model, plan.misses, False, encoding_format) if plan.misses else None
+            raw = self._text_cache.complete(plan, misses)
+
+        return EmbeddingResult.from_dict(raw) if as_array else raw
+
+    async def _fetch(
+        self,
+        model: str,
+        input: Union[str, list[str]],
+        use_cache: bool = True,
+        encoding_format: Optional[str] = None,
+    ) -> dict:
+        batches = [input] if isinstance(input, str) else split_batches(input, self._batching)
+        if len(batches) <= 1:
+            return await self._send(model, input, use_cache, encoding_format)
+
+        logger.debug("llm.client.embeddings %s textos en %s lotes", len(input), len(batches))
+        semaphore = asyncio.Semaphore(self._batching.max_concurrency)
+
+        async def bounded(batch: list[str]) -> dict:
+            async with semaphore:
+                return await self._send(model, batch, use_cache, encoding_format)
 
+        return merge_responses(await asyncio.gather(*(bounded(batch) for batch in batches)))
+
+    async def _send(
+        self, model: str, input: Union[str, list[str]], use_cache: bool, encoding_format: Optional[str]
+    ) -> dict:
+        """Envía un lote; si el servidor lo rechaza por tamaño, lo parte en dos."""
         try:
-            return self._client._request(
-                "POST",
-                _sdk_settings.llm.endpoints.embeddings,
-                json=payload,
-            )
+            return await self._request_batch(model, input, use_cache, encoding_format)
         except Exception as exc:
-            raise
-        finally:
-            pass
\ No newline at end of file
+            if isinstance(input, str) or len(input) < 2 or not is_too_large(exc):
+                raise
+
+            half = len(input) // 2
+            logger.warning("Lote de %s embeddings demasiado grande, se parte en dos", len(input))
+            return merge_responses([
+                await self._send(model, input[:half], use_cache, encoding_format),
+                await self._send(model, input[half:], use_cache, encoding_format),
+            ])
+
+    async def _request_batch(
+        self, model: str, input: Union[str, list[str]], use_cache: bool, encoding_format: Optional[str]
+    ) -> dict:
+        payload = {"model": model, "input": input}
+        if encoding_format is not None:
+            payload["encoding_format"] = encoding_format
+
+        endpoint = _sdk_settings.llm.endpoints.embeddings
+
+        key = cache_key(self._cache, endpoint, payload, use_cache, self._scope)
+        if key is not None:
+            cached = self._cache.get(key)
+            if cached is not None:
+                logger.debug("llm.client.embeddings.afetch cache hit")
+                # copia: lo que el caller haga con la respuesta no debe alterar la caché
+                return copy.deepcopy(cached)
+
+        async def fetch() -> dict:
+            raw = await self._client._request("POST", endpoint, json=payload)
+            if key is not None:
+                self._cache.set(key, copy.deepcopy(raw))
+            return raw
+
+        return await self._singleflight.run(endpoint, payload, fetch)
@@ -1,12 +1,25 @@
+import time
 import httpx
 import logging
+import threading
+import contextvars
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, TimeoutError as FutureTimeout, wait
 from http import HTTPStatus
+from typing import Iterator, Optional
 
 from .base_client import BaseClient
 from .chat_completions import ChatCompletions
+from .client_core import ClientCore
+# LlmAPIError vive en client_core; se re-exporta porque es parte de la API pública
+from .client_core import LlmAPIError  # noqa: F401
 from .completions import Completions
 from .embeddings import Embeddings
-from ..transport.circuit_breaker import CircuitBreaker, CircuitBreakerOpen
+from ..transport.concurrency import Permit
+from ..transport.hedging import without_slot
+from ..transport.load_balancer import Backend
+from ..transport.rate_limiter import Reservation
+from .response_cache import ResponseCache
+from ..transport.sse import iter_sse_data
 from langfuse import observe, get_client
 from ..config.settings import _sdk_settings
 
@@ -15,83 +28,295 @@ langfuse = get_client()
 
 logger = logging.getLogger("llm.sdk.client")
 
-class LlmAPIError(Exception):
-    pass
 
+def _usable(future: Future) -> bool:
+    """Una respuesta cuenta como ganadora si llegó y no es un 5xx."""
+    return future.exception() is None and future.result().status_code < HTTPStatus.INTERNAL_SERVER_ERROR
 
-class LlmClient(BaseClient):
+
+def _discard(future: Future) -> None:
+    if not future.cancelled() and future.exception() is None:
+        future.result().close()
+
+
+class LlmClient(ClientCore, BaseClient):
     """
     Cliente liviano para llama-server compatible con OpenAI-style APIs
     """
 
-    def __init__(self, base_url: str, http_client: httpx.Client):
-        self.base_url = base_url.rstrip("/")
-        self._http_client = http_client
-        self._circuit = CircuitBreaker()
+    _completions_class = Completions
+    _chat_class = ChatCompletions
+    _embeddings_class = Embeddings
+
+    def __init__(
+        self,
+        base_url: str,
+        http_client: httpx.Client,
+        backends: Optional[list[str]] = None,
+        response_cache: Optional[ResponseCache] = None,
+        lean: bool = False,
+    ):
+        super().__init__(base_url, http_client, backends, response_cache, lean)
+        self._hedge_executor: Optional[ThreadPoolExecutor] = None
+        self._hedge_lock = threading.Lock()
+        # threads libres del pool de hedges: sin hueco el duplicado no se lanza
+        self._hedge_room: Optional[threading.Semaphore] = None
+        self._closed = False
+
+    def __enter__(self) -> "LlmClient":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """
+        Detiene el pool de los hedges; las requests siguientes ya no se
+        duplican. El httpx.Client no se cierra: es de quien lo creó (p. ej.
+        el TransportRegistry del adapter).
+        """
+        with self._hedge_lock:
+            self._closed = True
+            executor, self._hedge_executor = self._hedge_executor, None
+        if executor is not None:
+            executor.shutdown(wait=False)
+
+    def _admit(self, kwargs: dict, prefer: Optional[str]) -> tuple[Optional[Reservation], Permit, Backend]:
+        """Cuota, hueco de concurrencia y backend para una request."""
+        reservation = self._reserve(kwargs)
+        try:
+            if reservation is not None and reservation.delay > 0:
+                time.sleep(reservation.delay)
+            permit = self._granted(self._limiter.acquire()) if self._limiter is not None else Permit(None)
+        except BaseException:
+            self._refund(reservation)
+            raise
+
+        return reservation, permit, self._select_backend(prefer, reservation, permit)
+
+    def _send(self, backend: Backend, method: str, endpoint: str, **kwargs) -> httpx.Response:
+        """
+        Envía la request aplicando la RetryPolicy. Solo el resultado final
+        se registra en el circuit breaker, los intentos intermedios no.
+        """
+        url = f"{backend.url}{endpoint}"
+        kwargs = self._encode_body(kwargs)
+        self._retry.budget.deposit()
+
+        attempt, delay = 0, None
+        while True:
+            attempt += 1
+            try:
+                resp = self._http_client.request(method, url, **kwargs)
+            except (httpx.TimeoutException, httpx.RequestError) as e:
+                if not self._retry.should_retry_error(e, method, endpoint, attempt):
+                    raise
+                delay = self._retry.backoff(delay)
+                reason = type(e).__name__
+            else:
+                retry_after = resp.headers.get("Retry-After")
+                if not self._retry.should_retry_status(resp.status_code, method, endpoint, attempt, retry_after):
+                    return resp
+                delay = self._retry.backoff(delay, retry_after)
+                reason = resp.status_code
+                resp.close()
+
+            logger.warning(
+                "Reintentando %s %s (intento %s, motivo %s) en %.2fs",
+                method, endpoint, attempt + 1, reason, delay,
+            )
+            langfuse.update_current_span(metadata={"retries": attempt})
+            time.sleep(delay)
+
+    def _tracked_send(self, backend: Backend, method: str, endpoint: str, **kwargs) -> httpx.Response:
+        with self._balancer.track(backend):
+            return self._send(backend, method, endpoint, **kwargs)
+
+    def _start_primary(self, backend: Backend, method: str, endpoint: str, **kwargs) -> Future:
+        """
+        La request original corre en un thread propio y no en el pool de
+        hedges: no compite por `max_workers` ni suma espera en cola a la
+        latencia que decide los hedges. No se ejecuta en el thread del
+        caller porque una llamada bloqueante de httpx no se puede abandonar
+        cuando gana el duplicado.
+        """
+        future: Future = Future()
+        # cada intento corre con una copia del contexto para conservar el span actual
+        ctx = contextvars.copy_context()
+
+        def run():
+            future.set_running_or_notify_cancel()
+            try:
+                future.set_result(ctx.run(self._tracked_send, backend, method, endpoint, **kwargs))
+            except BaseException as exc:
+                future.set_exception(exc)
+
+        threading.Thread(target=run, name="llm-request", daemon=True).start()
+        return future
+
+    def _hedge_pool(self) -> Optional[ThreadPoolExecutor]:
+        """Pool de los duplicados, creado en el primer hedge; None tras `close()`."""
+        with self._hedge_lock:
+            if self._hedge_executor is None and not self._closed:
+                self._hedge_executor = ThreadPoolExecutor(
+                    max_workers=self._hedging.settings.max_workers,
+                    thread_name_prefix="llm-hedge",
+                )
+                self._hedge_room = threading.Semaphore(self._hedging.settings.max_workers)
+            return self._hedge_executor
+
+    def _start_hedge(self, backend: Backend, method: str, endpoint: str, kwargs: dict) -> Optional[Future]:
+        """Lanza el duplicado en el pool; sin thread libre no hay hedge, nunca se encola."""
+        executor = self._hedge_pool()
+        if executor is None or not self._hedge_room.acquire(blocking=False):
+            return None
+
+        permit = self._hedge_slot(backend, kwargs)
+        if permit is None:
+            self._hedge_room.release()
+            return None
+
+        ctx = contextvars.copy_context()
+        try:
+            hedge = executor.submit(ctx.run, self._tracked_send, backend, method, endpoint, **without_slot(kwargs))
+        except RuntimeError:
+            # close() concurrente
+            permit.cancel()
+            self._hedge_room.release()
+            return None
+
+        def finished(future: Future) -> None:
+            permit.cancel() if future.cancelled() else permit.release()
+            self._hedge_room.release()
+
+        hedge.add_done_callback(finished)
+        return hedge
+
+    def _dispatch(self, backend: Backend, method: str, endpoint: str, **kwargs) -> tuple[httpx.Response, Backend]:
+        """
+        Envía la request y devuelve (respuesta, backend que respondió).
+
+        Con hedging habilitado, si la respuesta tarda más que el percentil
+        configurado se lanza un duplicado a otro backend (o, sin réplicas,
+        a otro slot del mismo) y se queda la primera respuesta válida.
+        """
+        if self._hedging is None or not self._hedging.applies_to(endpoint):
+            return self._tracked_send(backend, method, endpoint, **kwargs), backend
+
+        started = time.monotonic()
+        delay = self._hedging.delay()
+
+        if delay is None:
+            resp = self._tracked_send(backend, method, endpoint, **kwargs)
+            self._hedging.observe(time.monotonic() - started)
+            return resp, backend
+
+        primary = self._start_primary(backend, method, endpoint, **kwargs)
+        try:
+            resp = primary.result(timeout=delay)
+        except FutureTimeout:
+            pass
+        else:
+            self._hedging.observe(time.monotonic() - started)
+            return resp, backend
+
+        alternate = self._balancer.pick(exclude=[backend]) or backend
+        hedge = self._start_hedge(alternate, method, endpoint, kwargs)
+        if hedge is None:
+            resp = primary.result()
+            self._hedging.observe(time.monotonic() - started)
+            return resp, backend
+
+        logger.debug("Hedging %s %s hacia %s tras %.3fs", method, endpoint, alternate.url, delay)
+
+        winner, pending = None, {primary, hedge}
+        while pending and winner is None:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            winner = next((f for f in done if _usable(f)), None)
+
+        # si ambos fallaron se propaga el resultado del original
+        winner = winner or primary
+        loser = hedge if winner is primary else primary
+        # un hilo no se puede interrumpir: la respuesta perdedora se cierra al llegar
+        loser.cancel()
+        loser.add_done_callback(_discard)
+
+        self._hedging.observe(time.monotonic() - started, hedge_won=winner is hedge)
+        langfuse.update_current_span(
+            metadata={"hedged": True, "hedge.winner": "hedge" if winner is hedge else "primary"}
+        )
+
+        return winner.result(), alternate if winner is hedge else backend
 
-        self.completions = Completions(self)
-        self.chat = ChatCompletions(self)
-        self.embeddings = Embeddings(self)
-    
     @observe(
         name="llama.client.request",
         capture_input=False,
         capture_output=False,
     )
-    def _request(self, method: str, endpoint: str, **kwargs):
-        if not self._circuit.allow_request():
-            langfuse.update_current_span(
-                metadata={"circuit": self._circuit._state.value, "blocked": True}
-            )
-            
-            raise CircuitBreakerOpen("Circuit abierto para llama-server")
-        
+    def _request(
+        self,
+        method: str,
+        endpoint: str,
+        affinity_key: Optional[str] = None,
+        decode_as: Optional[type] = None,
+        **kwargs,
+    ):
+        key, prefer, kwargs = self._prepare_affinity(endpoint, kwargs, affinity_key)
+        reservation, permit, backend = self._admit(kwargs, prefer)
+        kwargs = self._pin_slot(key, backend, kwargs)
+        circuit = backend.circuit
+
         try:
-            
-            resp = self._http_client.request(
+            resp, backend = self._dispatch(backend, method, endpoint, **kwargs)
+            circuit = backend.circuit
+            self._check_status(resp, circuit, permit)
+            return self._complete(resp, method, endpoint, backend, permit, reservation, key, prefer, decode_as)
+
+        except httpx.HTTPStatusError as e:
+            raise self._status_error(e, endpoint) from e
+
+        except (httpx.TimeoutException, httpx.RequestError) as e:
+            raise self._transport_error(e, endpoint, backend, permit) from e
+
+        finally:
+            permit.release()
+
+    @observe(
+        name="llama.client.stream",
+        capture_input=False,
+        capture_output=False,
+    )
+    def _stream(self, method: str, endpoint: str, affinity_key: Optional[str] = None, **kwargs) -> Iterator[dict]:
+        key, prefer, kwargs = self._prepare_affinity(endpoint, kwargs, affinity_key)
+        reservation, permit, backend = self._admit(kwargs, prefer)
+        kwargs = self._pin_slot(key, backend, kwargs)
+        circuit = backend.circuit
+
+        try:
+            with self._balancer.track(backend), self._http_client.stream(
                 method,
-                f"{self.base_url}{endpoint}",
+                f"{backend.url}{endpoint}",
                 **kwargs,
-            )
-            if resp.status_code >= HTTPStatus.INTERNAL_SERVER_ERROR:
-                self._circuit.record_failure()
-                raise LlmAPIError(f"Error {resp.status_code}")
-
-            self._circuit.record_success()
-            resp.raise_for_status()
-            
-            # no capturamos body ni headers
-            langfuse.update_current_span(
-                metadata={
-                    "status_code": resp.status_code,
-                    "endpoint": endpoint,
-                    "method": method,
-                }
-            )
-            
-            return resp.json()
-            
+            ) as resp:
+                if resp.status_code >= HTTPStatus.BAD_REQUEST:
+                    # el body del error solo está disponible tras leerlo
+                    resp.read()
+                self._check_status(resp, circuit, permit)
+                self._trace_response(resp, method, endpoint, backend, stream=True)
+
+                for event in iter_sse_data(resp.iter_lines()):
+                    self._observe_event(event, backend, permit, reservation, key)
+                    yield event
+
         except httpx.HTTPStatusError as e:
-            self._circuit.record_failure()
-            
-            langfuse.update_current_span(
-                metadata={
-                    "status_code": e.response.status_code,
-                    "endpoint": endpoint,
-                }
-            )
-            raise LlmAPIError(f"HTTP {e.response.status_code}: {e.response.text}") from e
-        
+            raise self._status_error(e, endpoint) from e
+
         except (httpx.TimeoutException, httpx.RequestError) as e:
-            self._circuit.record_failure()
-            langfuse.update_current_span(
-                metadata={
-                    "endpoint": endpoint,
-                    "error_type": type(e).__name__,
-                }
-            )
-            raise LlmAPIError(str(e)) from e
-    
+            raise self._transport_error(e, endpoint, backend, permit) from e
+
+        finally:
+            permit.release()
+
     @observe(
         name="llama.client.health",
         capture_input=False,
@@ -0,0 +1,274 @@
+import os
+import time
+import zlib
+import sqlite3
+import threading
+import logging
+from typing import Any, Optional
+
+from .codec import JsonCodec
+from .response_cache import ResponseCache
+from ..config.settings import PersistentCacheSettings, _sdk_settings
+
+logger = logging.getLogger("llm.sdk.client.persistent_cache")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    value BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    expires_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses (accessed_at);
+"""
+
+# primer byte del blob: formato del resto
+_JSON = b"j"
+_ZLIB_JSON = b"z"
+
+
+def dumps(value: Any, compress_min_bytes: int, codec: JsonCodec = None) -> bytes:
+    data = (codec or JsonCodec()).encode(value)
+    if len(data) >= compress_min_bytes:
+        packed = zlib.compress(data, 1)
+        if len(packed) < len(data):
+            return _ZLIB_JSON + packed
+    return _JSON + data
+
+
+def loads(blob: bytes, codec: JsonCodec = None) -> Any:
+    """Decodifica un blob de `dumps`; ValueError o zlib.error si está corrupto."""
+    tag, data = blob[:1], blob[1:]
+    if tag == _ZLIB_JSON:
+        data = zlib.decompress(data)
+    elif tag != _JSON:
+        raise ValueError(f"Formato de blob desconocido: {tag!r}")
+    return (codec or JsonCodec()).decode(data)
+
+
+def open_persistent_cache(settings: PersistentCacheSettings = None) -> Optional["SqliteResponseCache"]:
+    """SqliteResponseCache o None si la base no se puede abrir (p. ej. ruta sin permisos)."""
+    try:
+        return SqliteResponseCache(settings)
+    except (OSError, sqlite3.Error) as exc:
+        path = (settings or _sdk_settings.persistent_cache).path
+        logger.warning("No se pudo abrir la caché en disco %s (%s); se usa solo memoria", path, exc)
+        return None
+
+
+class SqliteResponseCache(ResponseCache):
+    """
+    Caché de respuestas en disco compartida entre procesos (p. ej. workers
+    de gunicorn) sobre SQLite en modo WAL: lectores y un escritor a la vez
+    sin bloquearse.
+
+    - Valores en JSON, comprimidos con zlib si superan
+      `compress_min_bytes`.
+    - Un hit no escribe en disco: las claves leídas se acumulan en memoria
+      y se vuelcan a `accessed_at` en la compactación (LRU aproximado).
+    - Un thread en segundo plano purga expirados, expulsa por
+      `accessed_at` hasta bajar de `max_bytes` y hace checkpoint del WAL.
+
+    Los valores se guardan como JSON (codec configurado) y zlib, nunca
+    pickle: leer el archivo no ejecuta código aunque lo comparta otro
+    usuario. Cualquier error de SQLite o una fila corrupta se registra y
+    se trata como miss (la fila se borra): la caché nunca hace fallar una
+    request. El archivo se crea con permisos 0600.
+    """
+
+    def __init__(self, settings: PersistentCacheSettings = None, path: Optional[str] = None):
+        self.settings = settings or _sdk_settings.persistent_cache
+        self.path = os.path.expanduser(path or self.settings.path)
+
+        self._codec = JsonCodec()
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._touched: set[str] = set()
+        self._stop = threading.Event()
+        self._compactor: Optional[threading.Thread] = None
+        self._compactor_pid: Optional[int] = None
+
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+        self.evictions = 0
+
+        self._init_db()
+
+    def _connect(self) -> sqlite3.Connection:
+        # una conexión por thread y por proceso (una conexión no sobrevive a fork)
+        conn = getattr(self._local, "conn", None)
+        if conn is not None and self._local.pid == os.getpid():
+            return conn
+
+        conn = sqlite3.connect(
+            self.path,
+            timeout=self.settings.busy_timeout_ms / 1000,
+            isolation_level=None,
+        )
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(f"PRAGMA busy_timeout={int(self.settings.busy_timeout_ms)}")
+
+        self._local.conn = conn
+        self._local.pid = os.getpid()
+        return conn
+
+    def _init_db(self) -> None:
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        os.close(os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600))
+
+        conn = self._connect()
+        # solo tiene efecto antes de crear la primera tabla
+        conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+        conn.executescript(_SCHEMA)
+
+    def _ensure_compactor(self) -> None:
+        if self.settings.compaction_interval <= 0 or self._compactor_pid == os.getpid():
+            return
+
+        with self._lock:
+            if self._compactor_pid == os.getpid():
+                return
+            self._compactor_pid = os.getpid()
+            self._compactor = threading.Thread(
+                target=self._compaction_loop,
+                name="llm-cache-compactor",
+                daemon=True,
+            )
+            self._compactor.start()
+
+    def _compaction_loop(self) -> None:
+        while not self._stop.wait(self.settings.compaction_interval):
+            try:
+                self.compact()
+            except sqlite3.Error as exc:
+                logger.warning("Compactación de la caché en disco fallida: %s", exc)
+
+    def get(self, key: str) -> Optional[dict]:
+        self._ensure_compactor()
+        try:
+            row = self._connect().execute(
+                "SELECT value, expires_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+        except sqlite3.Error as exc:
+            logger.warning("Lectura de la caché en disco fallida: %s", exc)
+            with self._lock:
+                self.errors += 1
+                self.misses += 1
+            return None
+
+        if row is None or row[1] <= time.time():
+            with self._lock:
+                self.misses += 1
+            return None
+
+        try:
+            value = loads(row[0], self._codec)
+        except (ValueError, zlib.error) as exc:
+            logger.warning("Entrada corrupta en la caché en disco (%s); se descarta", exc)
+            self._discard(key)
+            with self._lock:
+                self.errors += 1
+                self.misses += 1
+            return None
+
+        with self._lock:
+            self.hits += 1
+            self._touched.add(key)
+        return value
+
+    def _discard(self, key: str) -> None:
+        try:
+            self._connect().execute("DELETE FROM responses WHERE key = ?", (key,))
+        except sqlite3.Error as exc:
+            logger.warning("No se pudo borrar la entrada corrupta: %s", exc)
+
+    def set(self, key: str, value: dict) -> None:
+        self._ensure_compactor()
+        blob = dumps(value, self.settings.compress_min_bytes, self._codec)
+        now = time.time()
+
+        try:
+            self._connect().execute(
+                "INSERT OR REPLACE INTO responses (key, value, size, expires_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, blob, len(blob), now + self.settings.ttl_seconds, now),
+            )
+        except sqlite3.Error as exc:
+            logger.warning("Escritura en la caché en disco fallida: %s", exc)
+            with self._lock:
+                self.errors += 1
+
+    def compact(self) -> dict:
+        """Purga expirados y expulsa por LRU hasta quedar bajo `max_bytes`."""
+        now = time.time()
+        with self._lock:
+            touched, self._touched = self._touched, set()
+
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.executemany(
+                "UPDATE responses SET accessed_at = ? WHERE key = ?",
+                ((now, key) for key in touched),
+            )
+            expired = conn.execute("DELETE FROM responses WHERE expires_at <= ?", (now,)).rowcount
+
+            total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+            victims: list[tuple[str]] = []
+            if total > self.settings.max_bytes:
+                # se libera hasta el 90% para no compactar en cada pasada
+                excess = total - int(self.settings.max_bytes * 0.9)
+                for key, size in conn.execute("SELECT key, size FROM responses ORDER BY accessed_at"):
+                    if excess <= 0:
+                        break
+                    victims.append((key,))
+                    excess -= size
+                conn.executemany("DELETE FROM responses WHERE key = ?", victims)
+
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+        with self._lock:
+            self.evictions += len(victims)
+
+        conn.execute("PRAGMA incremental_vacuum")
+        conn.execute("PRAGMA wal_checkpoint(PASSIVE)")
+
+        logger.debug("Caché en disco compactada: %s expirados, %s expulsados", expired, len(victims))
+        return {"expired": expired, "evicted": len(victims)}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._touched.clear()
+        self._connect().execute("DELETE FROM responses")
+
+    def close(self) -> None:
+        self._stop.set()
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def stats(self) -> dict:
+        entries, size = self._connect().execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()
+
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "entries": entries,
+                "bytes": size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "errors": self.errors,
+                "hit_ratio": self.hits / total if total else 0.0,
+            }
@@ -0,0 +1,164 @@
+import time
+import threading
+import logging
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+
+from .singleflight import is_deterministic, request_key
+from ..config.settings import ResponseCacheSettings, _sdk_settings
+
+logger = logging.getLogger("llm.sdk.client.response_cache")
+
+
+def cache_key(
+    cache: Optional["ResponseCache"], endpoint: str, payload: dict, use_cache: bool = True, scope: str = ""
+) -> Optional[str]:
+    """Clave de caché o None si la request no se debe cachear; `scope` son los servidores del cliente."""
+    if cache is None or not use_cache or not is_deterministic(payload):
+        return None
+    return request_key(endpoint, payload, scope)
+
+
+class ResponseCache(ABC):
+    """
+    Caché de respuestas crudas (el dict JSON de llama-server) por clave
+    canónica de endpoint + payload. Los resources reconstruyen el modelo
+    tipado en cada hit, así ningún caller comparte un objeto mutable.
+    """
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[dict]:
+        pass
+
+    @abstractmethod
+    def set(self, key: str, value: dict) -> None:
+        pass
+
+    @abstractmethod
+    def clear(self) -> None:
+        pass
+
+    @abstractmethod
+    def stats(self) -> dict:
+        pass
+
+
+@dataclass
+class _Entry:
+    value: dict
+    expires_at: float
+
+
+class InMemoryResponseCache(ResponseCache):
+    """LRU acotado por `max_entries` con TTL por entrada."""
+
+    def __init__(self, settings: ResponseCacheSettings = None):
+        self.settings = settings or _sdk_settings.response_cache
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: str) -> Optional[dict]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            if entry.expires_at <= time.monotonic():
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry.value
+
+    def set(self, key: str, value: dict) -> None:
+        with self._lock:
+            self._entries[key] = _Entry(
+                value=value,
+                expires_at=time.monotonic() + self.settings.ttl_seconds,
+            )
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.settings.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    @property
+    def hit_ratio(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "hit_ratio": self.hit_ratio,
+            }
+
+
+class TieredResponseCache(ResponseCache):
+    """
+    Encadena varias cachés (p. ej. memoria y luego disco). Un hit en un
+    nivel inferior se copia a los superiores; `set` escribe en todos.
+    """
+
+    def __init__(self, *tiers: ResponseCache):
+        self.tiers = tiers
+
+    def get(self, key: str) -> Optional[dict]:
+        for index, tier in enumerate(self.tiers):
+            value = tier.get(key)
+            if value is not None:
+                for upper in self.tiers[:index]:
+                    upper.set(key, value)
+                return value
+        return None
+
+    def set(self, key: str, value: dict) -> None:
+        for tier in self.tiers:
+            tier.set(key, value)
+
+    def clear(self) -> None:
+        for tier in self.tiers:
+            tier.clear()
+
+    def stats(self) -> dict:
+        return {"tiers": [tier.stats() for tier in self.tiers]}
+
+
+def default_response_cache() -> Optional[ResponseCache]:
+    """Caché según settings: memoria, disco, ambas en cascada o ninguna."""
+    from .persistent_cache import open_persistent_cache
+
+    tiers: list[ResponseCache] = []
+    if _sdk_settings.response_cache.enabled:
+        tiers.append(InMemoryResponseCache())
+    if _sdk_settings.persistent_cache.enabled:
+        disk = open_persistent_cache()
+        if disk is not None:
+            tiers.append(disk)
+        elif not tiers:
+            # sin disco se conserva al menos la caché en memoria
+            tiers.append(InMemoryResponseCache(ResponseCacheSettings(enabled=True)))
+
+    if not tiers:
+        return None
+    return tiers[0] if len(tiers) == 1 else TieredResponseCache(*tiers)
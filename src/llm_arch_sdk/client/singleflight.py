@@ -0,0 +1,164 @@
+import json
+import asyncio
+import hashlib
+import threading
+import logging
+from typing import Awaitable, Callable, Optional, TypeVar
+
+from ..config.settings import _sdk_settings
+from langfuse import get_client
+
+langfuse = get_client()
+
+logger = logging.getLogger("llm.sdk.client.singleflight")
+
+T = TypeVar("T")
+
+
+def request_key(endpoint: str, payload: dict, scope: str = "") -> str:
+    """
+    Hash canónico (claves ordenadas, sin espacios) de endpoint + payload.
+    `scope` identifica los servidores del cliente: el mismo payload contra
+    otro llama-server no es la misma request.
+    """
+    canonical = json.dumps(
+        {"scope": scope, "endpoint": endpoint, "payload": payload},
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False,
+        default=str,
+    )
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+def is_deterministic(payload: dict) -> bool:
+    """
+    True si dos requests con este payload deben dar la misma respuesta:
+    embeddings, temperature 0, top_k 1 o un seed fijo (-1 es aleatorio
+    en llama-server).
+    """
+    if "input" in payload:
+        return True
+
+    seed = payload.get("seed")
+    if isinstance(seed, int) and not isinstance(seed, bool) and seed >= 0:
+        return True
+
+    return payload.get("temperature") == 0 or payload.get("top_k") == 1
+
+
+class _Call:
+    __slots__ = ("event", "result", "error")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """
+    Coalesce requests deterministas idénticas que están en vuelo a la vez:
+    el primer thread hace la llamada HTTP y el resto espera y recibe el
+    mismo resultado ya parseado (o la misma excepción). No guarda nada
+    una vez terminada la llamada, así que no hay respuestas viejas.
+    """
+
+    def __init__(self, enabled: bool = None, scope: str = ""):
+        self.enabled = _sdk_settings.singleflight.enabled if enabled is None else enabled
+        self.scope = scope
+        self._calls: dict[str, _Call] = {}
+        self._lock = threading.Lock()
+
+        self.leaders = 0
+        self.shared = 0
+
+    def run(self, endpoint: str, payload: dict, fn: Callable[[], T]) -> T:
+        if not self.enabled or not is_deterministic(payload):
+            return fn()
+
+        key = request_key(endpoint, payload, self.scope)
+
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.leaders += 1
+            else:
+                self.shared += 1
+
+        if not leader:
+            logger.debug("singleflight: esperando request idéntica en vuelo %s", endpoint)
+            langfuse.update_current_span(metadata={"singleflight.shared": True})
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.event.set()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"in_flight": len(self._calls), "leaders": self.leaders, "shared": self.shared}
+
+
+class AsyncSingleFlight:
+    """SingleFlight para asyncio: los followers esperan el future del líder."""
+
+    def __init__(self, enabled: bool = None, scope: str = ""):
+        self.enabled = _sdk_settings.singleflight.enabled if enabled is None else enabled
+        self.scope = scope
+        self._calls: dict[tuple, asyncio.Future] = {}
+
+        self.leaders = 0
+        self.shared = 0
+
+    async def run(self, endpoint: str, payload: dict, fn: Callable[[], Awaitable[T]]) -> T:
+        if not self.enabled or not is_deterministic(payload):
+            return await fn()
+
+        loop = asyncio.get_running_loop()
+        key = (id(loop), request_key(endpoint, payload, self.scope))
+
+        while key in self._calls:
+            future = self._calls[key]
+            self.shared += 1
+            langfuse.update_current_span(metadata={"singleflight.shared": True})
+            try:
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                # si cancelaron al líder (y no a nosotros) se reintenta
+                if not future.cancelled():
+                    raise
+
+        future = self._calls[key] = loop.create_future()
+        self.leaders += 1
+
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as exc:
+            future.set_exception(exc)
+            # marcado como leído: sin followers no debe avisar al recolectarse
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            del self._calls[key]
+
+    def stats(self) -> dict:
+        return {"in_flight": len(self._calls), "leaders": self.leaders, "shared": self.shared}
@@ -0,0 +1,163 @@
+import hashlib
+import threading
+import time
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+
+from ..config.settings import SlotAffinitySettings, _sdk_settings
+
+logger = logging.getLogger("llm.sdk.client.slot_affinity")
+
+
+def affinity_kwargs(affinity_key: Optional[str]) -> dict:
+    """kwargs extra para _request/_stream; vacío si no hay affinity_key."""
+    return {"affinity_key": affinity_key} if affinity_key else {}
+
+
+@dataclass
+class SlotAssignment:
+    backend_url: str
+    id_slot: Optional[int]
+    expires_at: float
+
+
+class SlotAffinity:
+    """
+    Recuerda qué backend y qué slot de llama-server atendió un prefijo de
+    prompt (o una conversación) para que las siguientes requests vuelvan
+    al mismo slot con `cache_prompt` y reutilicen su KV cache en lugar de
+    reevaluar el prefijo.
+
+    La clave es `affinity_key` si el caller la pasa, o un hash de los
+    primeros `prefix_chars` caracteres del prompt / mensajes.
+    """
+
+    def __init__(self, settings: SlotAffinitySettings = None):
+        self.settings = settings or _sdk_settings.slot_affinity
+        self._entries: OrderedDict[str, SlotAssignment] = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.tokens_cached = 0
+        self.tokens_evaluated = 0
+
+    def applies_to(self, endpoint: str) -> bool:
+        endpoints = _sdk_settings.llm.endpoints
+        return endpoint in (endpoints.completions, endpoints.chat_completions)
+
+    def key_for(self, payload: dict) -> Optional[str]:
+        if "prompt" in payload:
+            text = str(payload["prompt"])
+        elif "messages" in payload:
+            text = "\x1e".join(
+                f"{m.get('role')}\x1f{m.get('content')}" for m in payload["messages"]
+            )
+        else:
+            return None
+
+        prefix = text[: self.settings.prefix_chars]
+        return hashlib.sha256(prefix.encode()).hexdigest()
+
+    def lookup(self, key: str) -> Optional[SlotAssignment]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            if entry.expires_at <= time.monotonic():
+                del self._entries[key]
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def prepare(self, endpoint: str, kwargs: dict, affinity_key: Optional[str] = None):
+        """
+        Devuelve (key, backend preferido, kwargs) con `cache_prompt`
+        añadido al payload. El `id_slot` lo pone `pin` una vez elegido el
+        backend. El payload del caller no se modifica.
+        """
+        payload = kwargs.get("json")
+        if not isinstance(payload, dict) or not self.applies_to(endpoint):
+            return None, None, kwargs
+
+        key = affinity_key or self.key_for(payload)
+        if key is None:
+            return None, None, kwargs
+
+        payload = {**payload}
+        payload.setdefault("cache_prompt", True)
+
+        entry = self.lookup(key)
+        return key, entry.backend_url if entry else None, {**kwargs, "json": payload}
+
+    def pin(self, key: Optional[str], backend_url: str, kwargs: dict) -> dict:
+        """
+        Añade el `id_slot` recordado si la request va al backend que la
+        atendió antes; un número de slot de un servidor no vale en otro.
+        """
+        payload = kwargs.get("json")
+        if key is None or not self.settings.pin_slot or not isinstance(payload, dict) or "id_slot" in payload:
+            return kwargs
+
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None or entry.id_slot is None or entry.backend_url != backend_url:
+            return kwargs
+
+        return {**kwargs, "json": {**payload, "id_slot": entry.id_slot}}
+
+    def record(self, key: Optional[str], backend_url: str, raw: dict) -> None:
+        if key is None or not isinstance(raw, dict):
+            return
+
+        cached, evaluated = self._cache_usage(raw)
+
+        with self._lock:
+            self.tokens_cached += cached
+            self.tokens_evaluated += evaluated
+
+            self._entries[key] = SlotAssignment(
+                backend_url=backend_url,
+                id_slot=raw.get("id_slot"),
+                expires_at=time.monotonic() + self.settings.ttl_seconds,
+            )
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.settings.max_entries:
+                self._entries.popitem(last=False)
+
+    @staticmethod
+    def _cache_usage(raw: dict) -> tuple[int, int]:
+        # /completion reporta tokens_cached sobre tokens_evaluated;
+        # chat solo trae timings (cache_n reutilizados + prompt_n procesados)
+        if "tokens_evaluated" in raw:
+            return raw.get("tokens_cached", 0) or 0, raw.get("tokens_evaluated", 0) or 0
+
+        timings = raw.get("timings") or {}
+        cached = timings.get("cache_n", 0) or 0
+        return cached, cached + (timings.get("prompt_n", 0) or 0)
+
+    @property
+    def hit_ratio(self) -> float:
+        """Proporción de tokens de prompt servidos desde el KV cache."""
+        if not self.tokens_evaluated:
+            return 0.0
+        return self.tokens_cached / self.tokens_evaluated
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "tokens_cached": self.tokens_cached,
+                "tokens_evaluated": self.tokens_evaluated,
+                "cache_hit_ratio": self.hit_ratio,
+            }
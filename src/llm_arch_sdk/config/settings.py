@@ -41,6 +41,10 @@ class LlmEndpoints:
 @dataclass
 class LlmBackendEnv:
     base_url: str = os.getenv("LLM_BASE_URL")
+    # réplicas de llama-server para balanceo (LLM_BASE_URLS=http://a,http://b)
+    base_urls: List[str] = field(default_factory=lambda: [
+        url.strip() for url in os.getenv("LLM_BASE_URLS", "").split(",") if url.strip()
+    ])
     username: str = os.getenv("LLM_USERNAME")
     password: str = os.getenv("LLM_PASSWORD")
     endpoints: LlmEndpoints = field(default_factory=LlmEndpoints)
@@ -79,10 +83,39 @@ class OtelEnv:
 class TransportSettings:
     timeout_seconds: float = 60.0
 
+    # timeouts granulares; None = usar timeout_seconds
+    connect_timeout: Optional[float] = None
+    read_timeout: Optional[float] = None
+    write_timeout: Optional[float] = None
+    pool_timeout: Optional[float] = None
+
+    # pool de conexiones (httpx.Limits)
+    max_connections: int = 100
+    max_keepalive_connections: int = 20
+    keepalive_expiry: float = 30.0
+
+    # requiere el extra `http2` (paquete h2)
+    http2: bool = False
+
 
 @dataclass
 class AuthSettings:
     token_timeout: float = 10.0
+    # vigencia si el login no trae `expires_in` ni el token es un JWT con `exp`
+    token_ttl: Optional[float] = None
+    # segundos antes del vencimiento en que se renueva el token en segundo plano
+    refresh_margin: float = 60.0
+    background_refresh: bool = True
+    # pausa mínima entre dos renovaciones en segundo plano (tokens de vida muy corta)
+    min_refresh_interval: float = 1.0
+    # token compartido entre procesos locales (workers) en un archivo con flock
+    shared_token_store: bool = False
+    token_store_path: str = os.getenv(
+        "LLM_TOKEN_STORE_PATH",
+        os.path.join(os.path.expanduser("~"), ".cache", "llm-arch-sdk", "token.json"),
+    )
+    # espera máxima por el login de otro proceso antes de hacerlo por cuenta propia
+    token_store_lock_timeout: float = 30.0
 
 # -------------------------
 # Circuit breaker
@@ -93,10 +126,216 @@ class CircuitBreakerSettings:
     failure_threshold: int = 3
     reset_timeout: int = 30
     half_open_success: int = 1
+    # tasa de fallos en una ventana deslizante, además de los fallos consecutivos
+    window_seconds: float = 60.0
+    window_buckets: int = 10
+    # la tasa solo abre el circuito con al menos este volumen en la ventana
+    minimum_requests: int = 20
+    failure_rate_threshold: float = 0.5
+    # pruebas simultáneas en HALF_OPEN; un permiso no devuelto vence a los reset_timeout segundos
+    half_open_max_probes: int = 1
     retry_header: str = "X-Retry"
     retry_value: int = 1
 
 
+# -------------------------
+# Retry
+# -------------------------
+
+@dataclass
+class RetrySettings:
+    enabled: bool = True
+    max_attempts: int = 3
+    # backoff "decorrelated jitter": sleep = min(max_delay, U(base_delay, prev * 3))
+    base_delay: float = 0.1
+    max_delay: float = 5.0
+    # tope para Retry-After enviado por el servidor
+    max_retry_after: float = 30.0
+    retry_statuses: List[int] = field(default_factory=lambda: [429, 502, 503, 504])
+    idempotent_methods: List[str] = field(default_factory=lambda: [
+        "GET", "HEAD", "OPTIONS", "PUT", "DELETE",
+    ])
+    # opt-in: reintentar POST de completions/chat/embeddings ante timeouts y
+    # 5xx. Un timeout no garantiza que llama-server no haya generado (y el
+    # gateway cobrado) la respuesta, así que por defecto no se reintentan.
+    # Un 429, o un 503 con Retry-After, se reintenta siempre: es un rechazo
+    # previo a la generación
+    retry_inference_posts: bool = False
+    # retry budget (token bucket): cada request deposita `budget_ratio`,
+    # cada reintento consume 1 token
+    budget_ratio: float = 0.1
+    budget_initial_tokens: float = 10.0
+    budget_max_tokens: float = 100.0
+
+
+# -------------------------
+# KV-cache slot affinity
+# -------------------------
+
+@dataclass
+class SlotAffinitySettings:
+    enabled: bool = False
+    # entradas (prefijo/conversación -> backend + slot) recordadas, LRU
+    max_entries: int = 10_000
+    # caracteres del prompt que forman la clave cuando no se pasa affinity_key
+    prefix_chars: int = 2048
+    # el slot se reasigna en el servidor; pasado este tiempo se olvida
+    ttl_seconds: float = 600.0
+    # enviar id_slot además de enrutar al mismo backend
+    pin_slot: bool = True
+
+
+# -------------------------
+# Hedged requests
+# -------------------------
+
+@dataclass
+class HedgingSettings:
+    enabled: bool = False
+    # se lanza un duplicado si no hay respuesta tras este percentil de latencia
+    percentile: float = 0.95
+    # muestras necesarias antes de empezar a hacer hedging
+    min_samples: int = 20
+    window: int = 512
+    min_delay: float = 0.01
+    # proporción máxima de requests que pueden duplicarse (token bucket)
+    max_ratio: float = 0.05
+    # threads para los duplicados del cliente síncrono; sin thread libre no se hace hedge
+    max_workers: int = 32
+
+
+# -------------------------
+# Request coalescing
+# -------------------------
+
+@dataclass
+class SingleFlightSettings:
+    # requests deterministas idénticas en vuelo comparten una sola llamada
+    enabled: bool = True
+
+
+# -------------------------
+# JSON codec
+# -------------------------
+
+@dataclass
+class CodecSettings:
+    # cuerpo de requests y respuestas con un codec compilado en lugar de httpx/json
+    enabled: bool = False
+    # "auto" (msgspec, orjson o json, el primero instalado), "msgspec", "orjson" o "json"
+    backend: str = "auto"
+
+
+# -------------------------
+# Response cache
+# -------------------------
+
+@dataclass
+class ResponseCacheSettings:
+    # solo se cachean requests deterministas (temperature 0, top_k 1 o seed fijo)
+    enabled: bool = False
+    max_entries: int = 1024
+    ttl_seconds: float = 300.0
+
+
+@dataclass
+class PersistentCacheSettings:
+    # segundo nivel en disco (SQLite/WAL) compartido por todos los procesos
+    enabled: bool = False
+    path: str = os.getenv(
+        "LLM_CACHE_PATH",
+        os.path.join(os.path.expanduser("~"), ".cache", "llm-arch-sdk", "responses.sqlite3"),
+    )
+    max_bytes: int = 512 * 1024 * 1024
+    ttl_seconds: float = 7 * 24 * 3600.0
+    # cada cuánto se purgan expirados / exceso de tamaño en segundo plano
+    compaction_interval: float = 300.0
+    # valores serializados mayores a esto se comprimen con zlib
+    compress_min_bytes: int = 1024
+    busy_timeout_ms: int = 5000
+
+
+@dataclass
+class EmbeddingCacheSettings:
+    # caché por texto: (model, text) -> vector
+    enabled: bool = False
+    max_entries: int = 100_000
+    ttl_seconds: float = 30 * 24 * 3600.0
+    # segundo nivel en disco (SQLite/WAL) compartido entre procesos
+    persistent: bool = False
+    path: str = os.getenv(
+        "LLM_EMBEDDING_CACHE_PATH",
+        os.path.join(os.path.expanduser("~"), ".cache", "llm-arch-sdk", "embeddings.sqlite3"),
+    )
+    max_bytes: int = 1024 * 1024 * 1024
+
+
+@dataclass
+class EmbeddingBatchSettings:
+    # límites por request a /v1/embeddings; un input mayor se parte en lotes
+    max_items: int = 128
+    max_tokens: int = 8192
+    # estimación de tokens por caracteres del texto
+    chars_per_token: float = 4.0
+    # lotes enviados en paralelo
+    max_concurrency: int = 4
+
+
+@dataclass
+class EmbeddingMicroBatchSettings:
+    # un lote se envía al juntar `max_items` textos o a los `max_wait_ms` del primero
+    max_items: int = 64
+    max_wait_ms: float = 5.0
+    # requests a /v1/embeddings en vuelo a la vez desde el dispatcher
+    max_concurrency: int = 4
+
+
+# -------------------------
+# Adaptive concurrency
+# -------------------------
+
+@dataclass
+class ConcurrencySettings:
+    enabled: bool = False
+    initial_limit: int = 8
+    min_limit: int = 1
+    max_limit: int = 256
+    # peso de cada muestra al mover el límite (EMA)
+    smoothing: float = 0.2
+    # peso de cada muestra en la latencia de referencia (EMA lenta)
+    baseline_smoothing: float = 0.05
+    # latencia tolerada sobre la referencia antes de bajar el límite
+    tolerance: float = 1.5
+    # factor multiplicativo ante 429/503/timeouts
+    backoff_ratio: float = 0.9
+    # requests en espera cuando se alcanza el límite; 0 = fallar de inmediato
+    max_queue: int = 1000
+    # espera máxima en cola (None = sin límite)
+    queue_timeout: Optional[float] = 30.0
+
+
+# -------------------------
+# Client-side rate limit
+# -------------------------
+
+@dataclass
+class RateLimitSettings:
+    enabled: bool = False
+    # None = sin límite en esa dimensión
+    requests_per_second: Optional[float] = None
+    tokens_per_second: Optional[float] = None
+    # ráfaga permitida; por defecto 1 segundo de cuota
+    request_burst: Optional[float] = None
+    token_burst: Optional[float] = None
+    # "wait": bloquear (o await en async) hasta que haya cuota; "fail": RateLimitExceeded
+    on_limit: str = "wait"
+    # espera máxima en modo "wait"; si la cuota tarda más se falla
+    max_wait: Optional[float] = 30.0
+    # estimación previa: caracteres por token del prompt y salida por defecto
+    chars_per_token: float = 4.0
+    default_max_tokens: int = 256
+
+
 # -------------------------
 # SDK identity
 # -------------------------
@@ -121,6 +360,18 @@ class SdkSettings:
     observability: ObservabilitySettings = field(default_factory=ObservabilitySettings)
     transport: TransportSettings = field(default_factory=TransportSettings)
     circuit_breaker: CircuitBreakerSettings = field(default_factory=CircuitBreakerSettings)
+    retry: RetrySettings = field(default_factory=RetrySettings)
+    slot_affinity: SlotAffinitySettings = field(default_factory=SlotAffinitySettings)
+    hedging: HedgingSettings = field(default_factory=HedgingSettings)
+    concurrency: ConcurrencySettings = field(default_factory=ConcurrencySettings)
+    rate_limit: RateLimitSettings = field(default_factory=RateLimitSettings)
+    singleflight: SingleFlightSettings = field(default_factory=SingleFlightSettings)
+    codec: CodecSettings = field(default_factory=CodecSettings)
+    response_cache: ResponseCacheSettings = field(default_factory=ResponseCacheSettings)
+    persistent_cache: PersistentCacheSettings = field(default_factory=PersistentCacheSettings)
+    embedding_cache: EmbeddingCacheSettings = field(default_factory=EmbeddingCacheSettings)
+    embedding_batch: EmbeddingBatchSettings = field(default_factory=EmbeddingBatchSettings)
+    embedding_micro_batch: EmbeddingMicroBatchSettings = field(default_factory=EmbeddingMicroBatchSettings)
     auth: AuthSettings = field(default_factory=AuthSettings)
     identity: SdkIdentitySettings = field(default_factory=SdkIdentitySettings)
     llm: LlmBackendEnv = field(default_factory=LlmBackendEnv)
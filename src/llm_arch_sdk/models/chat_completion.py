@@ -1,10 +1,11 @@
 from dataclasses import dataclass
 from typing import List, Optional
 
+from .lazy import lazy_fields
 from .timings import Timings
 from .usage import Usage
 
-@dataclass
+@dataclass(slots=True)
 class ChatMessage:
     role: str
     content: str
@@ -17,7 +18,7 @@ class ChatMessage:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class ChatChoice:
     index: int
     finish_reason: Optional[str]
@@ -32,7 +33,8 @@ class ChatChoice:
         )
 
 
-@dataclass
+@lazy_fields(usage=Usage.from_dict, timings=Timings.from_dict)
+@dataclass(slots=True)
 class ChatCompletionResult:
     id: str
     model: str
@@ -56,6 +58,64 @@ class ChatCompletionResult:
                 ChatChoice.from_dict(c)
                 for c in data.get("choices", [])
             ],
-            usage=Usage.from_dict(data["usage"]) if "usage" in data else None,
-            timings=Timings.from_dict(data["timings"]) if "timings" in data else None,
+            # dicts crudos: se materializan al primer acceso
+            usage=data.get("usage"),
+            timings=data.get("timings"),
+        )
+
+
+@dataclass(slots=True)
+class ChatDelta:
+    role: Optional[str] = None
+    content: Optional[str] = None
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "ChatDelta":
+        return cls(
+            role=data.get("role"),
+            content=data.get("content"),
+        )
+
+
+@dataclass(slots=True)
+class ChatChunkChoice:
+    index: int
+    delta: ChatDelta
+    finish_reason: Optional[str] = None
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "ChatChunkChoice":
+        return cls(
+            index=data.get("index", 0),
+            delta=ChatDelta.from_dict(data.get("delta") or {}),
+            finish_reason=data.get("finish_reason"),
+        )
+
+
+@dataclass(slots=True)
+class ChatCompletionChunk:
+    """Frame `chat.completion.chunk` de un stream OpenAI-style."""
+    id: str
+    model: str
+    created: int
+    choices: List[ChatChunkChoice]
+    usage: Optional[Usage] = None
+    system_fingerprint: Optional[str] = None
+    object: Optional[str] = None
+    timings: Optional[Timings] = None
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "ChatCompletionChunk":
+        return cls(
+            id=data.get("id"),
+            model=data.get("model"),
+            created=data.get("created"),
+            object=data.get("object"),
+            system_fingerprint=data.get("system_fingerprint"),
+            choices=[
+                ChatChunkChoice.from_dict(c)
+                for c in data.get("choices") or []
+            ],
+            usage=Usage.from_dict(data["usage"]) if data.get("usage") else None,
+            timings=Timings.from_dict(data["timings"]) if data.get("timings") else None,
         )
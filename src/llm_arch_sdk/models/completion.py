@@ -1,11 +1,28 @@
+from array import array
 from dataclasses import dataclass
-from typing import List, Optional
+from typing import List, Optional, Sequence
 
 from .timings import Timings
 from .generation_settings import GenerationSettings
+from .lazy import lazy_fields
 
-@dataclass
+
+def _token_array(tokens: Optional[Sequence[int]]) -> Optional[array]:
+    # 4 bytes por token frente a ~32 de un int en una lista
+    if tokens is None or isinstance(tokens, array):
+        return tokens
+    return array("i", tokens)
+
+
+@lazy_fields(generation_settings=GenerationSettings.from_dict, timings=Timings.from_dict)
+@dataclass(slots=True)
 class CompletionResult:
+    """
+    Resultado de /completion. `tokens` se guarda como `array('i')` y
+    `generation_settings` / `timings` se construyen al primer acceso.
+    En modo lean no se conservan el prompt repetido por el servidor ni
+    `generation_settings`.
+    """
     index: int
     content: str
     model: str
@@ -17,18 +34,27 @@ class CompletionResult:
     tokens_evaluated: int
     tokens_cached: int
 
-    prompt: str
+    prompt: Optional[str]
     has_new_line: bool
     truncated: bool
 
     id_slot: Optional[int] = None
-    tokens: Optional[List[int]] = None
+    tokens: Optional[Sequence[int]] = None
 
     generation_settings: Optional[GenerationSettings] = None
     timings: Optional[Timings] = None
 
+    def __post_init__(self):
+        self.tokens = _token_array(self.tokens)
+
+    def drop_echo(self) -> "CompletionResult":
+        """Pasa el resultado a modo lean: sin prompt ni generation_settings."""
+        self.prompt = None
+        self.generation_settings = None
+        return self
+
     @classmethod
-    def from_dict(cls, data: dict) -> "CompletionResult":
+    def from_dict(cls, data: dict, lean: bool = False) -> "CompletionResult":
         return cls(
             index=data.get("index"),
             content=data.get("content"),
@@ -41,19 +67,38 @@ class CompletionResult:
             tokens_evaluated=data.get("tokens_evaluated", 0),
             tokens_cached=data.get("tokens_cached", 0),
 
-            prompt=data.get("prompt"),
+            prompt=None if lean else data.get("prompt"),
             has_new_line=data.get("has_new_line", False),
             truncated=data.get("truncated", False),
 
             id_slot=data.get("id_slot"),
             tokens=data.get("tokens"),
 
-            generation_settings=(
-                GenerationSettings.from_dict(data["generation_settings"])
-                if "generation_settings" in data else None
-            ),
-            timings=(
-                Timings.from_dict(data["timings"])
-                if "timings" in data else None
-            ),
+            # dicts crudos: se materializan al primer acceso
+            generation_settings=None if lean else data.get("generation_settings"),
+            timings=data.get("timings"),
+        )
+
+
+@dataclass(slots=True)
+class CompletionChunk:
+    """
+    Fragmento de un stream de /completion. El último fragmento (stop=True)
+    lleva en `result` el CompletionResult completo con timings y stop_type.
+    """
+    content: str
+    stop: bool
+    index: int = 0
+    id_slot: Optional[int] = None
+    tokens: Optional[List[int]] = None
+    result: Optional[CompletionResult] = None
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "CompletionChunk":
+        return cls(
+            content=data.get("content", ""),
+            stop=data.get("stop", False),
+            index=data.get("index", 0),
+            id_slot=data.get("id_slot"),
+            tokens=data.get("tokens"),
         )
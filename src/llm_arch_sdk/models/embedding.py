@@ -0,0 +1,77 @@
+import base64
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Optional
+
+from .usage import Usage
+
+if TYPE_CHECKING:
+    import numpy as np
+
+
+def _numpy():
+    try:
+        import numpy
+    except ImportError as exc:
+        raise ImportError(
+            "EmbeddingResult requiere numpy: pip install llm-arch-sdk[numpy]"
+        ) from exc
+    return numpy
+
+
+@dataclass(slots=True)
+class EmbeddingResult:
+    """
+    Respuesta de /v1/embeddings con los vectores en una sola matriz
+    float32 contigua de forma (n, dim), en el orden del `input`.
+
+    Con `encoding_format="base64"` cada vector llega como los bytes
+    float32 little-endian del servidor y se decodifica con
+    `np.frombuffer`, sin crear un float de Python por componente.
+    """
+    model: Optional[str]
+    vectors: "np.ndarray"
+    usage: Optional[Usage] = None
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "EmbeddingResult":
+        return cls(
+            model=data.get("model"),
+            vectors=cls._matrix(data.get("data") or []),
+            usage=Usage.from_dict(data["usage"]) if data.get("usage") else None,
+        )
+
+    @staticmethod
+    def _matrix(items: list[dict]) -> "np.ndarray":
+        np = _numpy()
+        items = sorted(items, key=lambda item: item.get("index", 0))
+        embeddings: list[Any] = [item["embedding"] for item in items]
+
+        if not embeddings:
+            return np.empty((0, 0), dtype=np.float32)
+
+        if all(isinstance(e, str) for e in embeddings):
+            # un único buffer para todos los vectores: sin copias por fila
+            buffer = bytearray().join(base64.b64decode(e) for e in embeddings)
+            flat = np.frombuffer(buffer, dtype="<f4").astype(np.float32, copy=False)
+            if flat.size % len(embeddings):
+                raise ValueError("Los vectores base64 no tienen todos la misma dimensión")
+            return flat.reshape(len(embeddings), -1)
+
+        # respuesta mixta (p. ej. caché por texto) o en floats JSON
+        rows = [
+            np.frombuffer(base64.b64decode(e), dtype="<f4") if isinstance(e, str) else e
+            for e in embeddings
+        ]
+        if len({len(row) for row in rows}) > 1:
+            raise ValueError("Los vectores no tienen todos la misma dimensión")
+        return np.ascontiguousarray(np.array(rows, dtype=np.float32))
+
+    def __len__(self) -> int:
+        return self.vectors.shape[0]
+
+    @property
+    def dimensions(self) -> int:
+        return self.vectors.shape[1]
+
+    def tolist(self) -> list[list[float]]:
+        return self.vectors.tolist()
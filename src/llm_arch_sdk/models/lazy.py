@@ -0,0 +1,40 @@
+from typing import Any, Callable
+
+
+class _LazySlot:
+    """
+    Envuelve el slot de un campo: si guarda el dict crudo de la respuesta,
+    construye el sub-modelo en el primer acceso y lo deja en el slot.
+    """
+
+    __slots__ = ("slot", "factory")
+
+    def __init__(self, slot: Any, factory: Callable[[dict], Any]):
+        self.slot = slot
+        self.factory = factory
+
+    def __get__(self, obj: Any, owner: type = None) -> Any:
+        if obj is None:
+            return self
+        value = self.slot.__get__(obj, owner)
+        if isinstance(value, dict):
+            value = self.factory(value)
+            self.slot.__set__(obj, value)
+        return value
+
+    def __set__(self, obj: Any, value: Any) -> None:
+        self.slot.__set__(obj, value)
+
+
+def lazy_fields(**factories: Callable[[dict], Any]) -> Callable[[type], type]:
+    """
+    Decorador para dataclasses con `slots=True`: los campos indicados
+    aceptan el dict crudo y se materializan con su `from_dict` al leerlos.
+    """
+
+    def wrap(cls: type) -> type:
+        for name, factory in factories.items():
+            setattr(cls, name, _LazySlot(cls.__dict__[name], factory))
+        return cls
+
+    return wrap
@@ -2,10 +2,12 @@ from dataclasses import dataclass
 from typing import Any, Dict
 
 from .generation_settings import GenerationSettings
+from .lazy import lazy_fields
 from .stop_type import StopType
 from .timings import Timings
 
-@dataclass
+@lazy_fields(generation_settings=GenerationSettings.from_dict, timings=Timings.from_dict)
+@dataclass(slots=True)
 class LLMResponse:
     index: int
     content: str
@@ -50,10 +52,9 @@ class LLMResponse:
             prompt=data["prompt"],
             has_new_line=data.get("has_new_line", False),
             truncated=data.get("truncated", False),
-            generation_settings=GenerationSettings.from_dict(
-                data["generation_settings"]
-            ),
-            timings=Timings.from_dict(data["timings"]),
+            # dicts crudos: se materializan al primer acceso
+            generation_settings=data["generation_settings"],
+            timings=data["timings"],
         )
 
 #compliance y debugging.
@@ -1,7 +1,7 @@
 from dataclasses import dataclass
 from typing import Any, Dict
 
-@dataclass
+@dataclass(slots=True)
 class Timings:
     cache_n: int
     prompt_n: int
@@ -16,19 +16,38 @@ class AuthHttpClientFactory(HttpClientFactory):
     )
     def create(
         cls,
-        auth: TokenManager,
-        timeout: float,
+        auth: TokenManager = None,
+        timeout: float = None,
         extra_headers: dict = None,
     ) -> httpx.Client:
             
         auth = auth or TokenManager()
 
-        headers = cls._default_headers(extra_headers)
-
         logger.debug("Creando httpx.Client con Autenticacion común para LLM")
 
         return httpx.Client(
             auth=auth,
-            timeout=timeout,
-            headers=headers,
+            **cls._client_kwargs(timeout, extra_headers),
+        )
+
+    @classmethod
+    @observe(
+        name="llm.transport.async_http_client_factory",
+        capture_input=False,
+        capture_output=False,
+    )
+    def create_async(
+        cls,
+        auth: TokenManager = None,
+        timeout: float = None,
+        extra_headers: dict = None,
+    ) -> httpx.AsyncClient:
+
+        auth = auth or TokenManager()
+
+        logger.debug("Creando httpx.AsyncClient con Autenticacion común para LLM")
+
+        return httpx.AsyncClient(
+            auth=auth,
+            **cls._client_kwargs(timeout, extra_headers),
         )
@@ -1,4 +1,5 @@
 import time
+import threading
 import logging
 from enum import Enum
 
@@ -19,52 +20,183 @@ class CircuitBreakerOpen(Exception):
 class CircuitBreaker:
     """
     Circuit Breaker con estados:
+
+    - CLOSED: pasan todas las requests. Abre tras `failure_threshold`
+      fallos consecutivos o cuando la tasa de fallos de los últimos
+      `window_seconds` llega a `failure_rate_threshold` con al menos
+      `minimum_requests` requests en la ventana.
+    - OPEN: se bloquea todo durante `reset_timeout` segundos.
+    - HALF_OPEN: como mucho `half_open_max_probes` requests de prueba a
+      la vez; `half_open_success` éxitos cierran el circuito y un solo
+      fallo lo vuelve a abrir.
+
+    La ventana es un ring buffer de `window_buckets` buckets por tiempo:
+    registrar un resultado es O(1) y la tasa se calcula solo al fallar.
+    Los cambios de estado se hacen bajo un lock; `allow_request` en
+    CLOSED no lo toma. Ningún método bloquea, así que puede usarse
+    igual desde threads o desde el event loop.
     """
 
-    def __init__(self, failure_threshold: int = None, reset_timeout: int = None, half_open_success: int = None):
+    def __init__(
+        self,
+        failure_threshold: int = None,
+        reset_timeout: int = None,
+        half_open_success: int = None,
+        window_seconds: float = None,
+        window_buckets: int = None,
+        minimum_requests: int = None,
+        failure_rate_threshold: float = None,
+        half_open_max_probes: int = None,
+    ):
+        settings = _sdk_settings.circuit_breaker
 
-        self.failure_threshold = failure_threshold or _sdk_settings.circuit_breaker.failure_threshold
-        self.reset_timeout = reset_timeout or _sdk_settings.circuit_breaker.reset_timeout
-        self.half_open_success = half_open_success or _sdk_settings.circuit_breaker.half_open_success
+        self.failure_threshold = failure_threshold or settings.failure_threshold
+        self.reset_timeout = reset_timeout or settings.reset_timeout
+        self.half_open_success = half_open_success or settings.half_open_success
+        self.window_seconds = window_seconds or settings.window_seconds
+        self.window_buckets = window_buckets or settings.window_buckets
+        self.minimum_requests = minimum_requests or settings.minimum_requests
+        self.failure_rate_threshold = failure_rate_threshold or settings.failure_rate_threshold
+        self.half_open_max_probes = half_open_max_probes or settings.half_open_max_probes
 
+        self._lock = threading.Lock()
         self._state = CircuitState.CLOSED
         self._failure_count = 0
         self._success_count = 0
         self._open_until = None
 
+        # permisos de prueba entregados en HALF_OPEN y cuándo se dan por perdidos
+        self._probes = 0
+        self._probes_expire_at = 0.0
+
+        # ring buffer: tick (número de bucket desde epoch monotónico), éxitos y fallos
+        self._buckets_per_second = self.window_buckets / self.window_seconds
+        self._reset_window()
+
+    def is_available(self) -> bool:
+        """Como allow_request pero sin provocar la transición a HALF_OPEN ni tomar un permiso."""
+        state = self._state
+        if state == CircuitState.OPEN:
+            return time.time() >= self._open_until
+        if state == CircuitState.HALF_OPEN:
+            return self._probes < self.half_open_max_probes or time.monotonic() >= self._probes_expire_at
+        return True
+
     def allow_request(self) -> bool:
-        now = time.time()
+        # camino caliente: sin lock mientras el circuito está cerrado
+        if self._state == CircuitState.CLOSED:
+            return True
 
-        if self._state == CircuitState.OPEN:
-            if now >= self._open_until:
+        with self._lock:
+            if self._state == CircuitState.OPEN:
+                if time.time() < self._open_until:
+                    return False
                 self._state = CircuitState.HALF_OPEN
                 self._success_count = 0
+                self._probes = 0
                 logger.warning("Circuit breaker pasando a HALF_OPEN")
-                return True
-            return False
+
+            if self._state == CircuitState.HALF_OPEN:
+                return self._take_probe()
+            return True
+
+    def _take_probe(self) -> bool:
+        now = time.monotonic()
+        if self._probes >= self.half_open_max_probes:
+            if now < self._probes_expire_at:
+                return False
+            # quien tomó el permiso nunca registró el resultado
+            logger.warning("Permisos de prueba en HALF_OPEN vencidos; se liberan")
+            self._probes = 0
+
+        if self._probes == 0:
+            self._probes_expire_at = now + self.reset_timeout
+        self._probes += 1
         return True
-    
+
+    def _release_probe(self) -> None:
+        if self._probes:
+            self._probes -= 1
+
+    def _bucket(self) -> int:
+        """Índice del bucket actual; lo vacía si viene de una vuelta anterior del ring."""
+        tick = int(time.monotonic() * self._buckets_per_second)
+        if tick != self._tick:
+            self._tick = tick
+            self._index = i = tick % self.window_buckets
+            if self._ticks[i] != tick:
+                self._ticks[i] = tick
+                self._successes[i] = 0
+                self._failures[i] = 0
+        return self._index
+
+    def _window(self) -> tuple[int, int]:
+        """(requests, fallos) de los buckets que siguen dentro de la ventana."""
+        oldest = self._tick - self.window_buckets
+        total = failed = 0
+        for i, bucket_tick in enumerate(self._ticks):
+            if bucket_tick > oldest:
+                total += self._successes[i] + self._failures[i]
+                failed += self._failures[i]
+        return total, failed
+
+    def _reset_window(self) -> None:
+        self._tick = self._index = -1
+        self._ticks = [-1] * self.window_buckets
+        self._successes = [0] * self.window_buckets
+        self._failures = [0] * self.window_buckets
+
+    def failure_rate(self) -> float:
+        with self._lock:
+            self._bucket()
+            total, failed = self._window()
+        return failed / total if total else 0.0
 
     def record_success(self):
-        if self._state == CircuitState.HALF_OPEN:
-            self._success_count += 1
-            if self._success_count >= self.half_open_success:
-                logger.info("Circuit breaker cerrado tras éxito en HALF_OPEN")
-                self._state = CircuitState.CLOSED
+        with self._lock:
+            self._successes[self._bucket()] += 1
+
+            if self._state is CircuitState.HALF_OPEN:
+                self._release_probe()
+                self._success_count += 1
+                if self._success_count >= self.half_open_success:
+                    logger.info("Circuit breaker cerrado tras éxito en HALF_OPEN")
+                    self._state = CircuitState.CLOSED
+                    self._failure_count = 0
+                    self._success_count = 0
+                    self._open_until = None
+                    # los fallos que lo abrieron no cuentan para la próxima vez
+                    self._reset_window()
+            else:
                 self._failure_count = 0
-                self._success_count = 0
-                self._open_until = None
-        else:
-            self._failure_count = 0
 
     def record_failure(self):
-        self._failure_count += 1
-        logger.warning("Fallo, registrado en circuit breaker:  %s/%s", self._failure_count, self.failure_threshold)
-
-        if self._failure_count >= self.failure_threshold:
-            self._state = CircuitState.OPEN
-            self._open_until = time.time() + self.reset_timeout
-            logger.error(
-                "Circuit breaker ABIERTO",
-                extra={"open_until": self._open_until},
-            )
+        with self._lock:
+            self._failures[self._bucket()] += 1
+            self._failure_count += 1
+            logger.warning("Fallo, registrado en circuit breaker:  %s/%s", self._failure_count, self.failure_threshold)
+
+            if self._state == CircuitState.HALF_OPEN:
+                # una prueba fallida reabre siempre: el backend sigue fallando
+                self._open("half_open_probe")
+                return
+            elif self._state == CircuitState.OPEN:
+                # fallos de requests que ya estaban en vuelo: no extienden el bloqueo
+                return
+
+            if self._failure_count >= self.failure_threshold:
+                self._open("consecutive_failures")
+                return
+
+            total, failed = self._window()
+            if total >= self.minimum_requests and failed / total >= self.failure_rate_threshold:
+                self._open("failure_rate")
+
+    def _open(self, reason: str) -> None:
+        self._state = CircuitState.OPEN
+        self._open_until = time.time() + self.reset_timeout
+        self._probes = 0
+        logger.error(
+            "Circuit breaker ABIERTO",
+            extra={"open_until": self._open_until, "reason": reason},
+        )
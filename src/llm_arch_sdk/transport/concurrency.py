@@ -0,0 +1,273 @@
+import math
+import time
+import asyncio
+import threading
+import logging
+from collections import deque
+from typing import Optional
+
+from ..config.settings import ConcurrencySettings, _sdk_settings
+
+logger = logging.getLogger("llm.sdk.transport.concurrency")
+
+# respuestas que indican que llama-server (o el gateway) está saturado
+OVERLOAD_STATUSES = frozenset({429, 503})
+
+
+class ConcurrencyLimitExceeded(Exception):
+    pass
+
+
+class Permit:
+    """
+    Un hueco de concurrencia concedido por el limitador.
+
+    El cliente anota el resultado (`observe` con los timings de
+    llama-server o `drop` ante sobrecarga) y llama a `release` al terminar;
+    `release` es idempotente. Con `limiter=None` todo es no-op.
+    """
+
+    def __init__(self, limiter: Optional["ConcurrencyLimiter"], queued: bool = False):
+        self._limiter = limiter
+        self.queued = queued
+        self._started = time.monotonic()
+        self._timings: Optional[dict] = None
+        self._dropped = False
+        self._released = False
+
+    def observe(self, timings: Optional[dict]) -> None:
+        if isinstance(timings, dict):
+            self._timings = timings
+
+    def drop(self) -> None:
+        self._dropped = True
+
+    def release(self) -> None:
+        if self._limiter is None or self._released:
+            return
+        self._released = True
+        self._limiter._release(time.monotonic() - self._started, self._timings, self._dropped)
+
+    def cancel(self) -> None:
+        """Devuelve el hueco sin tomar muestra de latencia (la request no llegó a medirse)."""
+        if self._limiter is None or self._released:
+            return
+        self._released = True
+        self._limiter._release()
+
+
+class _AsyncWaiter:
+    __slots__ = ("loop", "future")
+
+    def __init__(self):
+        self.loop = asyncio.get_running_loop()
+        self.future = self.loop.create_future()
+
+    def wake(self) -> None:
+        self.loop.call_soon_threadsafe(self._resolve)
+
+    def _resolve(self) -> None:
+        if not self.future.done():
+            self.future.set_result(None)
+
+
+class _ThreadWaiter:
+    __slots__ = ("event",)
+
+    def __init__(self):
+        self.event = threading.Event()
+
+    def wake(self) -> None:
+        self.event.set()
+
+
+class ConcurrencyLimiter:
+    """
+    Limita las requests en vuelo hacia llama-server con un límite que se
+    ajusta solo (gradiente + AIMD).
+
+    - La muestra de latencia es el tiempo por token que reporta
+      llama-server (`prompt_ms` / `predicted_ms`) inflado por la relación
+      entre la latencia observada y el tiempo de cómputo del servidor, así
+      captura tanto la cola como la degradación al compartir slots y es
+      comparable entre prompts cortos y largos. Sin timings (embeddings)
+      se usa la latencia de la request.
+    - Si la muestra supera `tolerance` veces la referencia el límite baja
+      de forma proporcional; si no, sube en ~sqrt(limit).
+    - 429, 503 y timeouts reducen el límite en `backoff_ratio`.
+
+    Una misma instancia se comparte entre threads y tasks de asyncio: las
+    requests que exceden el límite esperan en una única cola FIFO o
+    fallan con ConcurrencyLimitExceeded si la cola está llena.
+    """
+
+    _shared: Optional["ConcurrencyLimiter"] = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, settings: ConcurrencySettings = None):
+        self.settings = settings or _sdk_settings.concurrency
+
+        self._limit = float(self.settings.initial_limit)
+        self._in_flight = 0
+        self._waiters: deque = deque()
+        self._baselines: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+        self.rejected = 0
+        self.dropped = 0
+
+    @classmethod
+    def shared(cls) -> "ConcurrencyLimiter":
+        """Limitador de proceso compartido por LlmClient y AsyncLlmClient."""
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+            return cls._shared
+
+    @property
+    def limit(self) -> int:
+        return max(self.settings.min_limit, int(self._limit))
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._waiters)
+
+    def _try_acquire_locked(self) -> bool:
+        if self._in_flight < self.limit and not self._waiters:
+            self._in_flight += 1
+            return True
+        return False
+
+    def _enqueue_locked(self, waiter) -> None:
+        if len(self._waiters) >= self.settings.max_queue:
+            self.rejected += 1
+            raise ConcurrencyLimitExceeded(
+                f"Límite de concurrencia alcanzado ({self.limit} en vuelo, {len(self._waiters)} en cola)"
+            )
+        self._waiters.append(waiter)
+
+    def _abandon(self, waiter) -> bool:
+        """Saca al waiter de la cola; False si ya se le había concedido el hueco."""
+        with self._lock:
+            try:
+                self._waiters.remove(waiter)
+            except ValueError:
+                return False
+            self.rejected += 1
+            return True
+
+    def try_acquire(self) -> Optional[Permit]:
+        """Hueco sin esperar ni encolarse; None si no hay uno libre."""
+        with self._lock:
+            if self._try_acquire_locked():
+                return Permit(self)
+        return None
+
+    def acquire(self) -> Permit:
+        with self._lock:
+            if self._try_acquire_locked():
+                return Permit(self)
+            waiter = _ThreadWaiter()
+            self._enqueue_locked(waiter)
+
+        if not waiter.event.wait(self.settings.queue_timeout) and self._abandon(waiter):
+            raise ConcurrencyLimitExceeded("Timeout esperando un hueco de concurrencia")
+
+        return Permit(self, queued=True)
+
+    async def acquire_async(self) -> Permit:
+        with self._lock:
+            if self._try_acquire_locked():
+                return Permit(self)
+            waiter = _AsyncWaiter()
+            self._enqueue_locked(waiter)
+
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter.future), self.settings.queue_timeout)
+        except asyncio.TimeoutError:
+            if self._abandon(waiter):
+                raise ConcurrencyLimitExceeded("Timeout esperando un hueco de concurrencia") from None
+        except asyncio.CancelledError:
+            if not self._abandon(waiter):
+                # el hueco llegó a la vez que la cancelación: se devuelve
+                self._release()
+            raise
+
+        return Permit(self, queued=True)
+
+    def _release(self, latency: Optional[float] = None, timings: Optional[dict] = None, dropped: bool = False) -> None:
+        with self._lock:
+            if latency is not None:
+                self._update_limit_locked(latency, timings, dropped)
+            self._in_flight -= 1
+
+            # el hueco pasa directamente al siguiente en la cola
+            woken = []
+            while self._waiters and self._in_flight < self.limit:
+                self._in_flight += 1
+                woken.append(self._waiters.popleft())
+
+        for waiter in woken:
+            waiter.wake()
+
+    @staticmethod
+    def _sample(latency: float, timings: Optional[dict]) -> tuple[str, float]:
+        timings = timings or {}
+        prompt_ms = timings.get("prompt_ms") or 0.0
+        predicted_ms = timings.get("predicted_ms") or 0.0
+        server_ms = prompt_ms + predicted_ms
+
+        if server_ms <= 0:
+            return "latency", latency
+
+        if timings.get("predicted_n"):
+            per_token = predicted_ms / timings["predicted_n"]
+        elif timings.get("prompt_n"):
+            per_token = prompt_ms / timings["prompt_n"]
+        else:
+            per_token = server_ms
+
+        return "timings", per_token * max(1.0, latency * 1000 / server_ms)
+
+    def _update_limit_locked(self, latency: float, timings: Optional[dict], dropped: bool) -> None:
+        s = self.settings
+
+        if dropped:
+            self.dropped += 1
+            self._limit = max(s.min_limit, self._limit * s.backoff_ratio)
+            logger.debug("Sobrecarga detectada, límite de concurrencia -> %.1f", self._limit)
+            return
+
+        kind, sample = self._sample(latency, timings)
+        if sample <= 0:
+            return
+
+        baseline = self._baselines.get(kind)
+        if baseline is None:
+            self._baselines[kind] = sample
+            return
+        self._baselines[kind] = baseline * (1 - s.baseline_smoothing) + sample * s.baseline_smoothing
+
+        gradient = max(0.5, min(1.0, s.tolerance * baseline / sample))
+        target = self._limit * gradient + math.sqrt(self._limit)
+
+        # sin demanda suficiente la latencia no dice nada sobre un límite mayor
+        if target > self._limit and self._in_flight * 2 < self._limit:
+            return
+
+        limit = self._limit * (1 - s.smoothing) + target * s.smoothing
+        self._limit = min(float(s.max_limit), max(float(s.min_limit), limit))
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "limit": self.limit,
+                "in_flight": self._in_flight,
+                "queue_depth": len(self._waiters),
+                "rejected": self.rejected,
+                "dropped": self.dropped,
+            }
@@ -0,0 +1,104 @@
+import math
+import threading
+import logging
+from collections import deque
+from typing import Optional
+
+from .retry import RetryBudget
+from ..config.settings import HedgingSettings, _sdk_settings
+
+logger = logging.getLogger("llm.sdk.transport.hedging")
+
+
+class LatencyTracker:
+    """Ventana deslizante de latencias recientes (segundos)."""
+
+    def __init__(self, window: int):
+        self._samples: deque[float] = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def observe(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+
+    def percentile(self, q: float) -> Optional[float]:
+        with self._lock:
+            if not self._samples:
+                return None
+            ordered = sorted(self._samples)
+
+        index = min(len(ordered) - 1, max(0, math.ceil(q * len(ordered)) - 1))
+        return ordered[index]
+
+
+class HedgePolicy:
+    """
+    Decide cuándo duplicar una request lenta.
+
+    Si la request original no respondió tras el percentil `percentile` de
+    las latencias recientes, se envía un duplicado a otro backend (u otro
+    slot) y gana la primera respuesta. Un token bucket limita el hedging
+    a `max_ratio` del tráfico para no duplicar la carga en un incidente.
+    """
+
+    def __init__(self, settings: HedgingSettings = None):
+        self.settings = settings or _sdk_settings.hedging
+        self.latencies = LatencyTracker(self.settings.window)
+        self.budget = RetryBudget(
+            ratio=self.settings.max_ratio,
+            initial=1.0,
+            maximum=max(1.0, self.settings.max_ratio * self.settings.window),
+        )
+
+        self.requests = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+        self._lock = threading.Lock()
+
+    def applies_to(self, endpoint: str) -> bool:
+        endpoints = _sdk_settings.llm.endpoints
+        return endpoint in (endpoints.completions, endpoints.embeddings)
+
+    def delay(self) -> Optional[float]:
+        """Segundos a esperar antes del duplicado; None si aún no hay historial."""
+        with self._lock:
+            self.requests += 1
+        self.budget.deposit()
+
+        if len(self.latencies) < self.settings.min_samples:
+            return None
+
+        return max(self.settings.min_delay, self.latencies.percentile(self.settings.percentile))
+
+    def try_hedge(self) -> bool:
+        if not self.budget.withdraw():
+            return False
+        with self._lock:
+            self.hedged += 1
+        return True
+
+    def observe(self, seconds: float, hedge_won: bool = False) -> None:
+        self.latencies.observe(seconds)
+        if hedge_won:
+            with self._lock:
+                self.hedge_wins += 1
+
+    def stats(self) -> dict:
+        return {
+            "requests": self.requests,
+            "hedged": self.hedged,
+            "hedge_wins": self.hedge_wins,
+            "delay": self.latencies.percentile(self.settings.percentile),
+        }
+
+
+def without_slot(kwargs: dict) -> dict:
+    """El duplicado no debe quedar atado al mismo id_slot que el original."""
+    payload = kwargs.get("json")
+    if isinstance(payload, dict) and "id_slot" in payload:
+        payload = {k: v for k, v in payload.items() if k != "id_slot"}
+        return {**kwargs, "json": payload}
+    return kwargs
@@ -1,4 +1,5 @@
 from typing import Dict, Mapping, Optional
+from importlib.util import find_spec
 import httpx
 import logging
 
@@ -18,6 +19,50 @@ class HttpClientFactory:
             headers.update(extra)
         return headers
 
+    @classmethod
+    def _timeout(cls, timeout: Optional[float] = None) -> httpx.Timeout:
+        settings = _sdk_settings.transport
+        default = timeout or settings.timeout_seconds
+
+        def pick(value: Optional[float]) -> float:
+            return default if value is None else value
+
+        return httpx.Timeout(
+            default,
+            connect=pick(settings.connect_timeout),
+            read=pick(settings.read_timeout),
+            write=pick(settings.write_timeout),
+            pool=pick(settings.pool_timeout),
+        )
+
+    @classmethod
+    def _limits(cls) -> httpx.Limits:
+        settings = _sdk_settings.transport
+        return httpx.Limits(
+            max_connections=settings.max_connections,
+            max_keepalive_connections=settings.max_keepalive_connections,
+            keepalive_expiry=settings.keepalive_expiry,
+        )
+
+    @classmethod
+    def _http2(cls) -> bool:
+        if not _sdk_settings.transport.http2:
+            return False
+
+        if find_spec("h2") is None:
+            logger.warning("HTTP/2 solicitado pero 'h2' no está instalado; se usa HTTP/1.1")
+            return False
+
+        return True
+
+    @classmethod
+    def _client_kwargs(cls, timeout: Optional[float], extra_headers: Optional[dict]) -> dict:
+        return {
+            "timeout": cls._timeout(timeout),
+            "headers": cls._default_headers(extra_headers),
+            "limits": cls._limits(),
+            "http2": cls._http2(),
+        }
 
     @classmethod
     def create(
@@ -26,11 +71,17 @@ class HttpClientFactory:
         extra_headers: dict = None,
     ) -> httpx.Client:
 
-        headers = cls._default_headers(extra_headers)
-
         logger.debug("Creando httpx.Client común para LLM")
 
-        return httpx.Client(
-            timeout=timeout,
-            headers=headers,
-        )
+        return httpx.Client(**cls._client_kwargs(timeout, extra_headers))
+
+    @classmethod
+    def create_async(
+        cls,
+        timeout: float,
+        extra_headers: dict = None,
+    ) -> httpx.AsyncClient:
+
+        logger.debug("Creando httpx.AsyncClient común para LLM")
+
+        return httpx.AsyncClient(**cls._client_kwargs(timeout, extra_headers))
@@ -0,0 +1,91 @@
+import random
+import threading
+import logging
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Iterable, Iterator, Optional
+
+from .circuit_breaker import CircuitBreaker
+
+logger = logging.getLogger("llm.sdk.transport.load_balancer")
+
+
+@dataclass(eq=False)
+class Backend:
+    """Una réplica de llama-server con su propio circuit breaker."""
+    url: str
+    circuit: CircuitBreaker = field(default_factory=CircuitBreaker)
+    outstanding: int = 0
+    served: int = 0
+
+
+class LoadBalancer:
+    """
+    Reparte las requests entre varias réplicas de llama-server.
+
+    Selección "power of two choices": se toman dos backends disponibles al
+    azar y se elige el que tenga menos requests en vuelo. Un backend cuyo
+    circuit breaker está OPEN queda fuera de la rotación y vuelve a entrar
+    solo cuando el breaker pasa a HALF_OPEN y la prueba sale bien.
+    """
+
+    def __init__(self, urls: Iterable[str]):
+        urls = [url.rstrip("/") for url in urls]
+        if not urls:
+            raise ValueError("LoadBalancer requiere al menos un backend")
+
+        self.backends = [Backend(url=url) for url in urls]
+
+        self._lock = threading.Lock()
+        self._rng = random.Random()
+
+    def pick(self, exclude: Iterable[Backend] = (), prefer: Optional[str] = None) -> Optional[Backend]:
+        """
+        Devuelve el backend elegido o None si no hay ninguno disponible.
+        `prefer` (url) se respeta mientras ese backend esté disponible.
+        """
+        excluded = set(exclude)
+
+        with self._lock:
+            candidates = [
+                b for b in self.backends
+                if b not in excluded and b.circuit.is_available()
+            ]
+
+            if not candidates:
+                return None
+
+            if prefer is not None:
+                for backend in candidates:
+                    if backend.url == prefer:
+                        return backend
+
+            if len(candidates) == 1:
+                return candidates[0]
+
+            first, second = self._rng.sample(candidates, 2)
+            return first if first.outstanding <= second.outstanding else second
+
+    @contextmanager
+    def track(self, backend: Backend) -> Iterator[Backend]:
+        """Cuenta la request como en vuelo mientras dure el bloque."""
+        with self._lock:
+            backend.outstanding += 1
+            backend.served += 1
+        try:
+            yield backend
+        finally:
+            with self._lock:
+                backend.outstanding -= 1
+
+    def stats(self) -> list[dict]:
+        with self._lock:
+            return [
+                {
+                    "url": b.url,
+                    "state": b.circuit._state.value,
+                    "outstanding": b.outstanding,
+                    "served": b.served,
+                }
+                for b in self.backends
+            ]
@@ -0,0 +1,231 @@
+import math
+import time
+import asyncio
+import threading
+import logging
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from ..config.settings import RateLimitSettings, _sdk_settings
+
+logger = logging.getLogger("llm.sdk.transport.rate_limiter")
+
+
+class RateLimitExceeded(Exception):
+    pass
+
+
+@dataclass
+class Reservation:
+    """Cuota reservada para una request: tokens estimados y espera necesaria."""
+    tokens: int
+    delay: float
+    settled: bool = False
+
+
+class _Bucket:
+    """
+    Token bucket con reserva: la cuota se descuenta al reservar aunque
+    quede en negativo y la deuda se traduce en tiempo de espera. Así la
+    decisión es atómica y los que esperan no compiten por re-intentar.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float]):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else rate
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_for(self, amount: float) -> float:
+        deficit = amount - self.tokens
+        return deficit / self.rate if deficit > 0 else 0.0
+
+
+class RateLimiter:
+    """
+    Rate limiter del lado cliente en requests/s y tokens/s, para no chocar
+    con las cuotas del gateway y ahorrarse los 429.
+
+    Antes de enviar se cobra un costo estimado (longitud del prompt más
+    `n_predict` / `max_tokens`); al llegar la respuesta se corrige con los
+    tokens reales de `usage` o `timings`. Es seguro entre threads y tasks
+    de asyncio: `reserve` no duerme, devuelve la espera y cada caller la
+    cumple con `time.sleep` o `asyncio.sleep`.
+    """
+
+    _shared: Optional["RateLimiter"] = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, settings: RateLimitSettings = None):
+        self.settings = settings or _sdk_settings.rate_limit
+
+        s = self.settings
+        self._requests = _Bucket(s.requests_per_second, s.request_burst) if s.requests_per_second else None
+        self._tokens = _Bucket(s.tokens_per_second, s.token_burst) if s.tokens_per_second else None
+        self._lock = threading.Lock()
+
+        self.throttled = 0
+        self.rejected = 0
+
+    @classmethod
+    def shared(cls) -> "RateLimiter":
+        """La cuota del gateway es por credenciales: un limitador por proceso."""
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+            return cls._shared
+
+    def _text_tokens(self, value: Any) -> int:
+        if value is None:
+            return 0
+        if isinstance(value, str):
+            return math.ceil(len(value) / self.settings.chars_per_token)
+        if isinstance(value, (list, tuple)):
+            # lista de prompts/inputs, de token ids o de partes de contenido
+            if value and all(isinstance(v, int) for v in value):
+                return len(value)
+            return sum(self._text_tokens(v) for v in value)
+        if isinstance(value, dict):
+            return self._text_tokens(value.get("content") or value.get("text"))
+        return 0
+
+    def estimate(self, payload: Optional[dict]) -> int:
+        """Tokens estimados (prompt + salida máxima) de un payload."""
+        if not isinstance(payload, dict):
+            return 0
+
+        if "input" in payload:
+            # embeddings: no hay salida generada
+            return self._text_tokens(payload["input"])
+
+        prompt = self._text_tokens(payload.get("prompt")) + self._text_tokens(payload.get("messages"))
+
+        output = payload.get("n_predict", payload.get("max_tokens"))
+        if not isinstance(output, int) or output < 0:
+            output = self.settings.default_max_tokens
+
+        return prompt + output
+
+    def reserve(self, tokens: int) -> Reservation:
+        """
+        Descuenta 1 request y `tokens` de cuota. Devuelve la espera
+        necesaria o lanza RateLimitExceeded si hay que fallar.
+        """
+        s = self.settings
+
+        with self._lock:
+            now = time.monotonic()
+            delay = 0.0
+            for bucket, amount in ((self._requests, 1), (self._tokens, tokens)):
+                if bucket is not None:
+                    bucket.refill(now)
+                    delay = max(delay, bucket.wait_for(amount))
+
+            if delay > 0 and (s.on_limit == "fail" or (s.max_wait is not None and delay > s.max_wait)):
+                self.rejected += 1
+                raise RateLimitExceeded(f"Cuota local agotada, disponible en {delay:.2f}s")
+
+            if self._requests is not None:
+                self._requests.tokens -= 1
+            if self._tokens is not None:
+                self._tokens.tokens -= tokens
+            if delay > 0:
+                self.throttled += 1
+
+        return Reservation(tokens=tokens, delay=delay)
+
+    def try_reserve(self, payload: Optional[dict]) -> Optional[Reservation]:
+        """Reserva solo si hay cuota inmediata; None en lugar de esperar o fallar."""
+        tokens = self.estimate(payload)
+
+        with self._lock:
+            now = time.monotonic()
+            for bucket, amount in ((self._requests, 1), (self._tokens, tokens)):
+                if bucket is not None:
+                    bucket.refill(now)
+                    if bucket.wait_for(amount) > 0:
+                        return None
+
+            if self._requests is not None:
+                self._requests.tokens -= 1
+            if self._tokens is not None:
+                self._tokens.tokens -= tokens
+
+        return Reservation(tokens=tokens, delay=0.0)
+
+    def refund(self, reservation: Optional[Reservation]) -> None:
+        """Devuelve la cuota de una reserva cuya request no llegó a enviarse."""
+        if reservation is None or reservation.settled:
+            return
+
+        reservation.settled = True
+        with self._lock:
+            now = time.monotonic()
+            for bucket, amount in ((self._requests, 1), (self._tokens, reservation.tokens)):
+                if bucket is not None:
+                    bucket.refill(now)
+                    bucket.tokens = min(bucket.capacity, bucket.tokens + amount)
+
+    def acquire(self, payload: Optional[dict]) -> Reservation:
+        reservation = self.reserve(self.estimate(payload))
+        if reservation.delay > 0:
+            time.sleep(reservation.delay)
+        return reservation
+
+    async def acquire_async(self, payload: Optional[dict]) -> Reservation:
+        reservation = self.reserve(self.estimate(payload))
+        if reservation.delay > 0:
+            await asyncio.sleep(reservation.delay)
+        return reservation
+
+    @staticmethod
+    def used_tokens(raw: Any) -> Optional[int]:
+        """Tokens reales según la respuesta: `usage` (OpenAI) o `timings` (llama-server)."""
+        if not isinstance(raw, dict):
+            return None
+
+        usage = raw.get("usage")
+        if isinstance(usage, dict) and usage.get("total_tokens"):
+            return usage["total_tokens"]
+
+        timings = raw.get("timings")
+        if isinstance(timings, dict) and ("prompt_n" in timings or "predicted_n" in timings):
+            # prompt_n no incluye lo reutilizado del KV cache, cache_n sí lo cobra el gateway
+            return (timings.get("cache_n") or 0) + (timings.get("prompt_n") or 0) + (timings.get("predicted_n") or 0)
+
+        if "tokens_evaluated" in raw:
+            return (raw.get("tokens_evaluated") or 0) + (raw.get("tokens_predicted") or 0)
+
+        return None
+
+    def settle(self, reservation: Optional[Reservation], raw: Any) -> None:
+        """Corrige la cuota con los tokens reales (devuelve o cobra la diferencia)."""
+        if reservation is None or reservation.settled or self._tokens is None:
+            return
+
+        used = self.used_tokens(raw)
+        if used is None:
+            return
+
+        reservation.settled = True
+        with self._lock:
+            self._tokens.refill(time.monotonic())
+            self._tokens.tokens = min(self._tokens.capacity, self._tokens.tokens + reservation.tokens - used)
+
+    def stats(self) -> dict:
+        with self._lock:
+            now = time.monotonic()
+            for bucket in (self._requests, self._tokens):
+                if bucket is not None:
+                    bucket.refill(now)
+
+            return {
+                "requests_available": self._requests.tokens if self._requests else None,
+                "tokens_available": self._tokens.tokens if self._tokens else None,
+                "throttled": self.throttled,
+                "rejected": self.rejected,
+            }
@@ -0,0 +1,137 @@
+import random
+import threading
+import time
+import logging
+from email.utils import parsedate_to_datetime
+from http import HTTPStatus
+from typing import Optional
+
+import httpx
+
+from ..config.settings import RetrySettings, _sdk_settings
+
+logger = logging.getLogger("llm.sdk.transport.retry")
+
+
+class RetryBudget:
+    """
+    Token bucket que limita la proporción de reintentos.
+
+    Cada request original deposita `ratio` tokens y cada reintento consume
+    uno, de modo que con ratio=0.1 como mucho ~10% del tráfico son
+    reintentos: una caída del backend no se convierte en una tormenta.
+    """
+
+    def __init__(self, ratio: float, initial: float, maximum: float):
+        self.ratio = ratio
+        self.maximum = maximum
+        self._tokens = min(initial, maximum)
+        self._lock = threading.Lock()
+
+    @property
+    def tokens(self) -> float:
+        return self._tokens
+
+    def deposit(self) -> None:
+        with self._lock:
+            self._tokens = min(self.maximum, self._tokens + self.ratio)
+
+    def withdraw(self) -> bool:
+        with self._lock:
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+
+
+class RetryPolicy:
+    """
+    Decide si un intento fallido se reintenta y cuánto esperar.
+
+    - Errores de conexión: siempre (la request no llegó al servidor).
+    - Timeouts / errores de lectura: solo si la request es idempotente.
+    - Status en `retry_statuses` (429/502/503/504): si es idempotente; un
+      429, o un 503 con Retry-After, también en POST de inferencia porque
+      el servidor rechazó la request sin procesarla.
+    """
+
+    def __init__(self, settings: RetrySettings = None):
+        self.settings = settings or _sdk_settings.retry
+        self.budget = RetryBudget(
+            ratio=self.settings.budget_ratio,
+            initial=self.settings.budget_initial_tokens,
+            maximum=self.settings.budget_max_tokens,
+        )
+
+    def is_idempotent(self, method: str, endpoint: str) -> bool:
+        if method.upper() in self.settings.idempotent_methods:
+            return True
+
+        if self.settings.retry_inference_posts:
+            endpoints = _sdk_settings.llm.endpoints
+            return endpoint in (
+                endpoints.completions,
+                endpoints.chat_completions,
+                endpoints.embeddings,
+            )
+        return False
+
+    def _allowed(self, attempt: int) -> bool:
+        if not self.settings.enabled or attempt >= self.settings.max_attempts:
+            return False
+
+        if not self.budget.withdraw():
+            logger.warning("Retry budget agotado, no se reintenta")
+            return False
+        return True
+
+    def should_retry_error(self, exc: Exception, method: str, endpoint: str, attempt: int) -> bool:
+        if isinstance(exc, (httpx.ConnectError, httpx.ConnectTimeout)):
+            retryable = True
+        elif isinstance(exc, (httpx.TimeoutException, httpx.RequestError)):
+            retryable = self.is_idempotent(method, endpoint)
+        else:
+            retryable = False
+
+        return retryable and self._allowed(attempt)
+
+    def should_retry_status(
+        self, status_code: int, method: str, endpoint: str, attempt: int, retry_after: Optional[str] = None
+    ) -> bool:
+        if status_code not in self.settings.retry_statuses:
+            return False
+
+        retryable = self.is_idempotent(method, endpoint) or self._rejected(status_code, retry_after)
+        return retryable and self._allowed(attempt)
+
+    @staticmethod
+    def _rejected(status_code: int, retry_after: Optional[str]) -> bool:
+        """429, o 503 con Retry-After: llama-server no llegó a generar nada."""
+        if status_code == HTTPStatus.TOO_MANY_REQUESTS:
+            return True
+        return status_code == HTTPStatus.SERVICE_UNAVAILABLE and bool(retry_after)
+
+    def backoff(self, previous: Optional[float], retry_after: Optional[str] = None) -> float:
+        """Decorrelated jitter; si el servidor envía Retry-After, se respeta."""
+        server_delay = self._parse_retry_after(retry_after)
+        if server_delay is not None:
+            return min(server_delay, self.settings.max_retry_after)
+
+        base = self.settings.base_delay
+        upper = max(base, (previous or base) * 3)
+        return min(self.settings.max_delay, random.uniform(base, upper))
+
+    @staticmethod
+    def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+        if not isinstance(value, str) or not value:
+            return None
+
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+
+        try:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return None
@@ -0,0 +1,76 @@
+import json
+import logging
+from typing import AsyncIterator, Iterable, Iterator, Optional
+
+logger = logging.getLogger("llm.sdk.transport.sse")
+
+SSE_DONE = "[DONE]"
+
+
+def _parse_data(buffer: list[str]) -> Optional[dict]:
+    if not buffer:
+        return None
+
+    data = "\n".join(buffer)
+    if data == SSE_DONE:
+        return None
+
+    try:
+        return json.loads(data)
+    except json.JSONDecodeError:
+        logger.warning("Evento SSE con JSON inválido descartado: %s", data)
+        return None
+
+
+def iter_sse_data(lines: Iterable[str]) -> Iterator[dict]:
+    """
+    Convierte las líneas de un stream text/event-stream en los payloads
+    JSON de cada evento ``data:``. Termina al recibir ``[DONE]``.
+    """
+    buffer: list[str] = []
+
+    for line in lines:
+        if not line:
+            event = _parse_data(buffer)
+            if buffer and buffer[-1] == SSE_DONE:
+                return
+            buffer.clear()
+            if event is not None:
+                yield event
+            continue
+
+        if line.startswith(":"):
+            # comentario / keep-alive
+            continue
+
+        if line.startswith("data:"):
+            buffer.append(line[5:].lstrip())
+
+    event = _parse_data(buffer)
+    if event is not None:
+        yield event
+
+
+async def aiter_sse_data(lines: AsyncIterator[str]) -> AsyncIterator[dict]:
+    """Versión asíncrona de iter_sse_data."""
+    buffer: list[str] = []
+
+    async for line in lines:
+        if not line:
+            event = _parse_data(buffer)
+            if buffer and buffer[-1] == SSE_DONE:
+                return
+            buffer.clear()
+            if event is not None:
+                yield event
+            continue
+
+        if line.startswith(":"):
+            continue
+
+        if line.startswith("data:"):
+            buffer.append(line[5:].lstrip())
+
+    event = _parse_data(buffer)
+    if event is not None:
+        yield event
@@ -0,0 +1,108 @@
+import hashlib
+import threading
+import logging
+from dataclasses import astuple, dataclass
+from typing import Optional
+
+import httpx
+
+from ..auth.token_manager import TokenManager
+from .auth_http_client_factory import AuthHttpClientFactory
+from ..config.settings import _sdk_settings
+
+logger = logging.getLogger("llm.sdk.transport.transport_registry")
+
+
+@dataclass
+class _SharedTransport:
+    auth: TokenManager
+    client: httpx.Client
+    refs: int = 0
+
+
+class TransportRegistry:
+    """
+    Registro de transportes compartidos a nivel de proceso.
+
+    Los adapters piden su httpx.Client aquí en vez de crearlo: todos los
+    que apuntan al mismo backend, con las mismas credenciales y la misma
+    configuración de transporte, reciben el mismo pool de conexiones y el
+    mismo TokenManager (un solo login). El cliente se cierra cuando el
+    último adapter lo libera.
+    """
+
+    _lock = threading.Lock()
+    _entries: dict[tuple, _SharedTransport] = {}
+
+    @classmethod
+    def _key(cls, base_url: str, timeout: Optional[float]) -> tuple:
+        llm = _sdk_settings.llm
+        password = hashlib.sha256((llm.password or "").encode()).hexdigest()
+        return (
+            base_url.rstrip("/"),
+            llm.base_url,
+            llm.username,
+            password,
+            timeout or _sdk_settings.transport.timeout_seconds,
+            astuple(_sdk_settings.transport),
+        )
+
+    @classmethod
+    def acquire(cls, base_url: str, timeout: float = None) -> httpx.Client:
+        """Devuelve el cliente compartido para la clave e incrementa su contador."""
+        key = cls._key(base_url, timeout)
+
+        with cls._lock:
+            entry = cls._entries.get(key)
+
+            if entry is None:
+                logger.debug("Creando transporte compartido para %s", base_url)
+                auth = TokenManager()
+                entry = _SharedTransport(
+                    auth=auth,
+                    client=AuthHttpClientFactory.create(auth=auth, timeout=timeout),
+                )
+                cls._entries[key] = entry
+
+            elif entry.client.is_closed:
+                # alguien cerró el cliente por fuera: reabrimos con el mismo TokenManager
+                logger.warning("Transporte compartido cerrado externamente, recreando")
+                entry.client = AuthHttpClientFactory.create(auth=entry.auth, timeout=timeout)
+
+            entry.refs += 1
+            return entry.client
+
+    @classmethod
+    def release(cls, client: httpx.Client) -> None:
+        """Libera una referencia; cierra el cliente al llegar a cero."""
+        with cls._lock:
+            for key, entry in cls._entries.items():
+                if entry.client is client:
+                    entry.refs -= 1
+                    if entry.refs <= 0:
+                        del cls._entries[key]
+                        logger.debug("Cerrando transporte compartido sin referencias")
+                        client.close()
+                        entry.auth.close()
+                    return
+
+        logger.debug("release() de un cliente no registrado, se ignora")
+
+    @classmethod
+    def stats(cls) -> dict:
+        with cls._lock:
+            return {
+                "transports": len(cls._entries),
+                "references": sum(e.refs for e in cls._entries.values()),
+            }
+
+    @classmethod
+    def clear(cls) -> None:
+        """Cierra y olvida todos los transportes (útil en tests y shutdown)."""
+        with cls._lock:
+            entries = list(cls._entries.values())
+            cls._entries.clear()
+
+        for entry in entries:
+            entry.client.close()
+            entry.auth.close()
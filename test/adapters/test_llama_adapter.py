@@ -1,36 +1,39 @@
 import pytest
 import os
-from unittest.mock import Mock, patch
+import asyncio
+from unittest.mock import AsyncMock, Mock, patch
 from llm_arch_sdk.adapters.llama_adapter import LlamaAdapter
 from llm_arch_sdk.client.llm_client import LlmClient
 
 
 class TestLlamaAdapter:
     @patch.dict(os.environ, {'LLM_BASE_URL': 'http://localhost:8000'}, clear=True)
-    @patch('llm_arch_sdk.adapters.llama_adapter.AuthHttpClientFactory')
-    def test_init_with_env_var(self, mock_auth_factory):
+    @patch('llm_arch_sdk.adapters.llama_adapter.TransportRegistry')
+    def test_init_with_env_var(self, mock_registry):
         mock_http_client = Mock()
-        mock_auth_factory.create.return_value = mock_http_client
+        mock_registry.acquire.return_value = mock_http_client
 
         adapter = LlamaAdapter()
 
         assert adapter.base_url == 'http://localhost:8000'
         assert adapter.timeout == 60.0
-        mock_auth_factory.create.assert_called_once_with(
+        mock_registry.acquire.assert_called_once_with(
+            base_url='http://localhost:8000',
             timeout=60.0
         )
 
     def test_init_with_custom_base_url(self):
-        with patch('llm_arch_sdk.adapters.llama_adapter.AuthHttpClientFactory') as mock_auth_factory:
+        with patch('llm_arch_sdk.adapters.llama_adapter.TransportRegistry') as mock_registry:
 
             mock_http_client = Mock()
-            mock_auth_factory.create.return_value = mock_http_client
+            mock_registry.acquire.return_value = mock_http_client
 
             adapter = LlamaAdapter(base_url="http://custom:9000", timeout=30.0)
 
             assert adapter.base_url == "http://custom:9000"
             assert adapter.timeout == 30.0
-            mock_auth_factory.create.assert_called_once_with(
+            mock_registry.acquire.assert_called_once_with(
+                base_url="http://custom:9000",
                 timeout=30.0
             )
 
@@ -40,11 +43,11 @@ class TestLlamaAdapter:
             LlamaAdapter()
 
     @patch.dict(os.environ, {'LLM_BASE_URL': 'http://localhost:8000'}, clear=True)
-    @patch('llm_arch_sdk.adapters.llama_adapter.AuthHttpClientFactory')
+    @patch('llm_arch_sdk.adapters.llama_adapter.TransportRegistry')
     @patch('llm_arch_sdk.adapters.llama_adapter.LlmClient')
-    def test_client_lazy_initialization(self, mock_llm_client_class, mock_auth_factory):
+    def test_client_lazy_initialization(self, mock_llm_client_class, mock_registry):
         mock_http_client = Mock()
-        mock_auth_factory.create.return_value = mock_http_client
+        mock_registry.acquire.return_value = mock_http_client
 
         mock_llm_client_instance = Mock(spec=LlmClient)
         mock_llm_client_class.return_value = mock_llm_client_instance
@@ -64,11 +67,11 @@ class TestLlamaAdapter:
         )
 
     @patch.dict(os.environ, {'LLM_BASE_URL': 'http://localhost:8000'}, clear=True)
-    @patch('llm_arch_sdk.adapters.llama_adapter.AuthHttpClientFactory')
+    @patch('llm_arch_sdk.adapters.llama_adapter.TransportRegistry')
     @patch('llm_arch_sdk.adapters.llama_adapter.LlmClient')
-    def test_client_initialization_params(self, mock_llm_client_class, mock_auth_factory):
+    def test_client_initialization_params(self, mock_llm_client_class, mock_registry):
         mock_http_client = Mock()
-        mock_auth_factory.create.return_value = mock_http_client
+        mock_registry.acquire.return_value = mock_http_client
 
         adapter = LlamaAdapter(base_url="http://test:8080", timeout=45.0)
         adapter.client()
@@ -76,4 +79,68 @@ class TestLlamaAdapter:
         mock_llm_client_class.assert_called_once_with(
             base_url="http://test:8080",
             http_client=mock_http_client
-        )
\ No newline at end of file
+        )
+
+    @patch('llm_arch_sdk.adapters.llama_adapter.TransportRegistry')
+    @patch('llm_arch_sdk.adapters.llama_adapter.AuthHttpClientFactory')
+    @patch('llm_arch_sdk.adapters.llama_adapter.AsyncLlmClient')
+    def test_aclient_lazy_initialization(self, mock_async_client_class, mock_auth_factory, mock_registry):
+        mock_http_client = Mock()
+        mock_async_http_client = Mock()
+        mock_registry.acquire.return_value = mock_http_client
+        mock_auth_factory.create_async.return_value = mock_async_http_client
+
+        adapter = LlamaAdapter(base_url="http://test:8080", timeout=45.0)
+        client1 = adapter.aclient()
+        client2 = adapter.aclient()
+
+        assert client1 is client2
+        # Reutiliza el TokenManager del cliente síncrono
+        mock_auth_factory.create_async.assert_called_once_with(
+            auth=mock_http_client.auth,
+            timeout=45.0
+        )
+        mock_async_client_class.assert_called_once_with(
+            base_url="http://test:8080",
+            http_client=mock_async_http_client
+        )
+
+    @patch('llm_arch_sdk.adapters.llama_adapter.TransportRegistry')
+    @patch('llm_arch_sdk.adapters.base.TransportRegistry')
+    def test_close_releases_shared_transport(self, mock_base_registry, mock_registry):
+        mock_http_client = Mock()
+        mock_registry.acquire.return_value = mock_http_client
+
+        adapter = LlamaAdapter(base_url="http://test:8080")
+        adapter.close()
+        adapter.close()
+
+        mock_base_registry.release.assert_called_once_with(mock_http_client)
+
+    @patch('llm_arch_sdk.adapters.llama_adapter.TransportRegistry')
+    @patch('llm_arch_sdk.adapters.base.TransportRegistry')
+    @patch('llm_arch_sdk.adapters.llama_adapter.AuthHttpClientFactory')
+    @patch('llm_arch_sdk.adapters.llama_adapter.AsyncLlmClient')
+    def test_aclose_closes_async_client(self, mock_async_client_class, mock_auth_factory, mock_base_registry, mock_registry):
+        mock_http_client = Mock()
+        mock_registry.acquire.return_value = mock_http_client
+        mock_async_client_class.return_value.aclose = AsyncMock()
+
+        adapter = LlamaAdapter(base_url="http://test:8080")
+        adapter.aclient()
+        asyncio.run(adapter.aclose())
+        asyncio.run(adapter.aclose())
+
+        mock_async_client_class.return_value.aclose.assert_awaited_once()
+        mock_base_registry.release.assert_called_once_with(mock_http_client)
+
+    @patch('llm_arch_sdk.adapters.llama_adapter.TransportRegistry')
+    @patch('llm_arch_sdk.adapters.base.TransportRegistry')
+    @patch('llm_arch_sdk.adapters.llama_adapter.LlmClient')
+    def test_close_closes_sync_client(self, mock_client_class, mock_base_registry, mock_registry):
+        adapter = LlamaAdapter(base_url="http://test:8080")
+        adapter.client()
+        adapter.close()
+        adapter.close()
+
+        mock_client_class.return_value.close.assert_called_once()
@@ -7,30 +7,32 @@ from llm_arch_sdk.adapters.open_ai_adapter import OpenAIAdapter
 
 class TestOpenAIAdapter:
     @patch.dict(os.environ, {'LLM_BASE_URL': 'https://api.openai.com'}, clear=True)
-    @patch('llm_arch_sdk.adapters.open_ai_adapter.AuthHttpClientFactory')
-    def test_init_with_env_var(self, mock_auth_factory):
+    @patch('llm_arch_sdk.adapters.open_ai_adapter.TransportRegistry')
+    def test_init_with_env_var(self, mock_registry):
         mock_http_client = Mock()
-        mock_auth_factory.create.return_value = mock_http_client
+        mock_registry.acquire.return_value = mock_http_client
 
         adapter = OpenAIAdapter(use_langfuse=False)
 
         assert adapter.base_url == 'https://api.openai.com'
         assert adapter.timeout == 60.0
-        mock_auth_factory.create.assert_called_once_with(
+        mock_registry.acquire.assert_called_once_with(
+            base_url='https://api.openai.com',
             timeout=60.0
         )
 
     def test_init_with_custom_base_url(self):
-        with patch('llm_arch_sdk.adapters.open_ai_adapter.AuthHttpClientFactory') as mock_auth_factory:
+        with patch('llm_arch_sdk.adapters.open_ai_adapter.TransportRegistry') as mock_registry:
 
             mock_http_client = Mock()
-            mock_auth_factory.create.return_value = mock_http_client
+            mock_registry.acquire.return_value = mock_http_client
 
             adapter = OpenAIAdapter(base_url="https://custom.openai.com", timeout=30.0, use_langfuse=False)
 
             assert adapter.base_url == "https://custom.openai.com"
             assert adapter.timeout == 30.0
-            mock_auth_factory.create.assert_called_once_with(
+            mock_registry.acquire.assert_called_once_with(
+                base_url="https://custom.openai.com",
                 timeout=30.0
             )
 
@@ -50,11 +52,11 @@ class TestOpenAIAdapter:
             OpenAIAdapter()
 
     @patch.dict(os.environ, {'LLM_BASE_URL': 'https://api.openai.com'}, clear=True)
-    @patch('llm_arch_sdk.adapters.open_ai_adapter.AuthHttpClientFactory')
+    @patch('llm_arch_sdk.adapters.open_ai_adapter.TransportRegistry')
     @patch('llm_arch_sdk.adapters.open_ai_adapter.OpenAI')
-    def test_client_lazy_initialization(self, mock_openai_class, mock_auth_factory):
+    def test_client_lazy_initialization(self, mock_openai_class, mock_registry):
         mock_http_client = Mock()
-        mock_auth_factory.create.return_value = mock_http_client
+        mock_registry.acquire.return_value = mock_http_client
 
         mock_openai_instance = Mock(spec=OpenAI)
         mock_openai_class.return_value = mock_openai_instance
@@ -76,11 +78,11 @@ class TestOpenAIAdapter:
         )
 
     @patch.dict(os.environ, {'LLM_BASE_URL': 'https://custom.api.com'}, clear=True)
-    @patch('llm_arch_sdk.adapters.open_ai_adapter.AuthHttpClientFactory')
+    @patch('llm_arch_sdk.adapters.open_ai_adapter.TransportRegistry')
     @patch('llm_arch_sdk.adapters.open_ai_adapter.OpenAI')
-    def test_client_initialization_params(self, mock_openai_class, mock_auth_factory):
+    def test_client_initialization_params(self, mock_openai_class, mock_registry):
         mock_http_client = Mock()
-        mock_auth_factory.create.return_value = mock_http_client
+        mock_registry.acquire.return_value = mock_http_client
 
         adapter = OpenAIAdapter(base_url="https://test.api.com", timeout=45.0, use_langfuse=False)
         adapter.client()
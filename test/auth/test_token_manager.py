@@ -1,8 +1,13 @@
+import asyncio
+import base64
+import json
+import time
 import pytest
 import httpx
 import os
 from unittest.mock import Mock, patch
-from llm_arch_sdk.auth.token_manager import TokenManager, AuthError
+from llm_arch_sdk.auth.token_manager import TokenManager, AuthError, jwt_expiry
+from llm_arch_sdk.config.settings import AuthSettings, _sdk_settings
 
 
 class TestTokenManager:
@@ -194,4 +199,265 @@ class TestTokenManager:
 
         # Should have retried and attached new token
         assert request.headers["Authorization"] == "Bearer token2"
-        assert request.headers["X-Retry"] == "1"
\ No newline at end of file
+        assert request.headers["X-Retry"] == "1"
+
+def _jwt(exp: float) -> str:
+    def part(obj):
+        return base64.urlsafe_b64encode(json.dumps(obj).encode()).rstrip(b"=").decode()
+
+    return f"{part({'alg': 'none'})}.{part({'exp': exp})}.firma"
+
+
+@pytest.fixture
+def credentials():
+    with patch.object(_sdk_settings.llm, "base_url", "http://localhost:8000"), \
+            patch.object(_sdk_settings.llm, "username", "testuser"), \
+            patch.object(_sdk_settings.llm, "password", "testpass"):
+        yield
+
+
+def _login_response(body):
+    response = Mock()
+    response.json.return_value = body
+    return response
+
+
+@pytest.mark.usefixtures("credentials")
+class TestTokenExpiry:
+    def test_jwt_expiry(self):
+        assert jwt_expiry(_jwt(1234)) == 1234.0
+        assert jwt_expiry("opaque-token") is None
+        assert jwt_expiry("a.b.c") is None
+
+    @patch('llm_arch_sdk.auth.token_manager.HttpClientFactory')
+    def test_expiry_sources(self, mock_factory):
+        manager = TokenManager(settings=AuthSettings(token_ttl=100))
+        post = mock_factory.create.return_value.post
+
+        post.return_value = _login_response({"token": "opaque", "expires_in": 10})
+        manager._login()
+        assert manager.expires_at == pytest.approx(time.time() + 10, abs=1)
+
+        post.return_value = _login_response({"token": _jwt(2_000_000_000)})
+        manager._login()
+        assert manager.expires_at == 2_000_000_000
+
+        post.return_value = _login_response({"token": "opaque"})
+        manager._login()
+        assert manager.expires_at == pytest.approx(time.time() + 100, abs=1)
+
+    @patch('llm_arch_sdk.auth.token_manager.HttpClientFactory')
+    def test_background_refresh_before_expiry(self, mock_factory):
+        tokens = iter(["token1", "token2", "token3"])
+        mock_factory.create.return_value.post.side_effect = lambda *a, **k: _login_response(
+            {"token": next(tokens), "expires_in": 0.5}
+        )
+        manager = TokenManager(settings=AuthSettings(refresh_margin=0.4))
+
+        request = httpx.Request("GET", "http://api.example.com/test")
+        next(manager.auth_flow(request))
+        assert request.headers["Authorization"] == "Bearer token1"
+
+        deadline = time.monotonic() + 2
+        while manager.token == "token1" and time.monotonic() < deadline:
+            time.sleep(0.01)
+        manager.close()
+
+        assert manager.token == "token2"
+        request = httpx.Request("GET", "http://api.example.com/test")
+        next(manager.auth_flow(request))
+        assert request.headers["Authorization"] == "Bearer token2"
+
+    @patch('llm_arch_sdk.auth.token_manager.HttpClientFactory')
+    def test_short_ttl_does_not_spin(self, mock_factory):
+        post = mock_factory.create.return_value.post
+        post.side_effect = lambda *a, **k: _login_response({"token": "token", "expires_in": 30})
+        # TTL (30s) menor que refresh_margin (60s): se renueva a los ~15s, no en bucle
+        manager = TokenManager(settings=AuthSettings(refresh_margin=60))
+
+        request = httpx.Request("GET", "http://api.example.com/test")
+        next(manager.auth_flow(request))
+        time.sleep(0.3)
+        manager.close()
+
+        assert post.call_count == 1
+        assert manager._refresh_margin(manager.expires_at) == pytest.approx(15, abs=1)
+
+    @patch('llm_arch_sdk.auth.token_manager.HttpClientFactory')
+    def test_expired_tokens_are_refreshed_at_min_interval(self, mock_factory):
+        post = mock_factory.create.return_value.post
+        # el gateway emite tokens ya vencidos: el refresher espera min_refresh_interval entre logins
+        post.side_effect = lambda *a, **k: _login_response({"token": "token", "expires_in": 0})
+        manager = TokenManager(settings=AuthSettings(min_refresh_interval=0.2))
+
+        request = httpx.Request("GET", "http://api.example.com/test")
+        next(manager.auth_flow(request))
+        time.sleep(0.5)
+        manager.close()
+
+        assert 2 <= post.call_count <= 5
+
+    @patch('llm_arch_sdk.auth.token_manager.HttpClientFactory')
+    def test_expired_token_logs_in_on_request(self, mock_factory):
+        tokens = iter(["token1", "token2"])
+        mock_factory.create.return_value.post.side_effect = lambda *a, **k: _login_response(
+            {"token": next(tokens), "expires_in": -1}
+        )
+        manager = TokenManager(settings=AuthSettings(background_refresh=False))
+        manager.token = manager._login()
+
+        request = httpx.Request("GET", "http://api.example.com/test")
+        next(manager.auth_flow(request))
+
+        assert request.headers["Authorization"] == "Bearer token2"
+
+
+@pytest.mark.usefixtures("credentials")
+class TestTokenGenerations:
+    @patch('llm_arch_sdk.auth.token_manager.HttpClientFactory')
+    def test_401_storm_logs_in_once(self, mock_factory):
+        import threading
+
+        counter = iter(range(1, 1000))
+
+        def login(*args, **kwargs):
+            time.sleep(0.05)
+            return _login_response({"token": f"token{next(counter)}"})
+
+        mock_factory.create.return_value.post.side_effect = login
+        manager = TokenManager(settings=AuthSettings(background_refresh=False))
+        manager.token = "stale"
+
+        barrier = threading.Barrier(100)
+        retried = []
+
+        def worker():
+            request = httpx.Request("GET", "http://api.example.com/test")
+            flow = manager.auth_flow(request)
+            next(flow)
+            barrier.wait()
+            retry = flow.send(Mock(status_code=401))
+            retried.append(retry.headers["Authorization"])
+
+        threads = [threading.Thread(target=worker) for _ in range(100)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert mock_factory.create.return_value.post.call_count == 1
+        assert set(retried) == {"Bearer token1"}
+        assert manager.stats()["logins"] == 1
+        assert manager.stats()["shared_refreshes"] == 99
+
+    @patch('llm_arch_sdk.auth.token_manager.HttpClientFactory')
+    def test_newer_generation_is_reused(self, mock_factory):
+        mock_factory.create.return_value.post.return_value = _login_response({"token": "fresh"})
+        manager = TokenManager(settings=AuthSettings(background_refresh=False))
+        manager.token = "old"
+        seen = manager.generation
+        manager.token = "newer"
+
+        assert manager._refresh(seen, "token_expired") == ("newer", seen + 1)
+        mock_factory.create.return_value.post.assert_not_called()
+
+    @patch('llm_arch_sdk.auth.token_manager.HttpClientFactory')
+    def test_waiters_share_login_error(self, mock_factory):
+        import threading
+
+        started = threading.Event()
+
+        def login(*args, **kwargs):
+            started.set()
+            time.sleep(0.05)
+            raise httpx.TimeoutException("timeout")
+
+        mock_factory.create.return_value.post.side_effect = login
+        manager = TokenManager(settings=AuthSettings(background_refresh=False))
+        errors = []
+
+        def call():
+            try:
+                manager._refresh(0, "missing_token")
+            except AuthError as exc:
+                errors.append(exc)
+
+        leader = threading.Thread(target=call)
+        leader.start()
+        started.wait()
+        follower = threading.Thread(target=call)
+        follower.start()
+        leader.join()
+        follower.join()
+
+        assert len(errors) == 2
+        assert mock_factory.create.return_value.post.call_count == 1
+
+
+def _async_gateway(mock_factory, delay=0.05):
+    """AsyncClient de login contra un MockTransport que emite token1, token2..."""
+    logins = []
+
+    async def login(request):
+        logins.append(request)
+        await asyncio.sleep(delay)
+        return httpx.Response(200, json={"token": f"token{len(logins)}"})
+
+    mock_factory.create_async.side_effect = lambda **kwargs: httpx.AsyncClient(
+        transport=httpx.MockTransport(login)
+    )
+    return logins
+
+
+@pytest.mark.usefixtures("credentials")
+class TestAsyncAuthFlow:
+    @patch('llm_arch_sdk.auth.token_manager.HttpClientFactory')
+    def test_concurrent_401s_log_in_once(self, mock_factory):
+        logins = _async_gateway(mock_factory)
+        manager = TokenManager(settings=AuthSettings(background_refresh=False))
+        manager.token = "stale"
+
+        def api(request):
+            ok = request.headers["Authorization"] == "Bearer token1"
+            return httpx.Response(200 if ok else 401)
+
+        async def run():
+            async with httpx.AsyncClient(auth=manager, transport=httpx.MockTransport(api)) as client:
+                responses = await asyncio.gather(
+                    *(client.get("http://api.example.com/test") for _ in range(200))
+                )
+            await manager.aclose()
+            return responses
+
+        responses = asyncio.run(run())
+
+        assert {r.status_code for r in responses} == {200}
+        assert len(logins) == 1
+        assert logins[0].headers["Authorization"].startswith("Basic ")
+        assert manager.stats()["logins"] == 1
+        assert manager.stats()["shared_refreshes"] == 199
+
+    @patch('llm_arch_sdk.auth.token_manager.HttpClientFactory')
+    def test_cancelled_leader_does_not_cancel_login(self, mock_factory):
+        logins = _async_gateway(mock_factory)
+        manager = TokenManager(settings=AuthSettings(background_refresh=False))
+
+        async def run():
+            leader = asyncio.ensure_future(manager._refresh_async(0, "missing_token"))
+            await asyncio.sleep(0.01)
+            follower = asyncio.ensure_future(manager._refresh_async(0, "missing_token"))
+            leader.cancel()
+            return await follower
+
+        assert asyncio.run(run()) == ("token1", 1)
+        assert len(logins) == 1
+
+    @patch('llm_arch_sdk.auth.token_manager.HttpClientFactory')
+    def test_open_circuit_blocks_async_login(self, mock_factory):
+        logins = _async_gateway(mock_factory)
+        manager = TokenManager(settings=AuthSettings(background_refresh=False))
+        manager._circuit.allow_request = Mock(return_value=False)
+
+        with pytest.raises(AuthError, match="Circuit breaker abierto"):
+            asyncio.run(manager._refresh_async(0, "missing_token"))
+        assert logins == []
@@ -0,0 +1,141 @@
+import os
+import stat
+import threading
+import time
+from unittest.mock import Mock, patch
+
+import pytest
+
+from llm_arch_sdk.auth.token_manager import TokenManager
+from llm_arch_sdk.auth.token_store import FileTokenStore, StoredToken
+from llm_arch_sdk.config.settings import AuthSettings, _sdk_settings
+
+
+@pytest.fixture
+def credentials():
+    with patch.object(_sdk_settings.llm, "base_url", "http://localhost:8000"), \
+            patch.object(_sdk_settings.llm, "username", "testuser"), \
+            patch.object(_sdk_settings.llm, "password", "testpass"):
+        yield
+
+
+def _login_response(body):
+    response = Mock()
+    response.json.return_value = body
+    return response
+
+
+class TestFileTokenStore:
+    def test_roundtrip_is_private(self, tmp_path):
+        store = FileTokenStore(str(tmp_path / "auth" / "token.json"), owner="u@http://gw")
+        assert store.load() is None
+
+        store.save("abc", 2_000_000_000.0)
+
+        assert store.load() == StoredToken("abc", 2_000_000_000.0)
+        assert stat.S_IMODE(os.stat(store.path).st_mode) == 0o600
+
+    def test_other_owner_is_ignored(self, tmp_path):
+        path = str(tmp_path / "token.json")
+        FileTokenStore(path, owner="a@http://gw").save("abc", None)
+
+        assert FileTokenStore(path, owner="b@http://gw").load() is None
+
+    def test_corrupt_file_is_a_miss(self, tmp_path):
+        path = tmp_path / "token.json"
+        path.write_text("{no es json")
+
+        assert FileTokenStore(str(path), owner="u").load() is None
+
+    def test_expired_token_is_not_valid(self):
+        assert StoredToken("abc", None).valid()
+        assert not StoredToken("abc", time.time() - 1).valid()
+
+    def test_lock_is_exclusive(self, tmp_path):
+        store = FileTokenStore(str(tmp_path / "token.json"), owner="u")
+        entered = threading.Event()
+        release = threading.Event()
+
+        def holder():
+            with store.locked(timeout=1):
+                entered.set()
+                release.wait()
+
+        thread = threading.Thread(target=holder)
+        thread.start()
+        entered.wait()
+
+        assert store._try_lock() is None
+        release.set()
+        thread.join()
+
+        fd = store._try_lock()
+        assert fd is not None
+        store._unlock(fd)
+
+
+@pytest.mark.usefixtures("credentials")
+class TestSharedTokenManager:
+    def _settings(self, tmp_path):
+        return AuthSettings(
+            background_refresh=False,
+            shared_token_store=True,
+            token_store_path=str(tmp_path / "token.json"),
+        )
+
+    @patch('llm_arch_sdk.auth.token_manager.HttpClientFactory')
+    def test_sibling_reuses_stored_token(self, mock_factory, tmp_path):
+        post = mock_factory.create.return_value.post
+        post.return_value = _login_response({"token": "minted", "expires_in": 600})
+
+        first = TokenManager(settings=self._settings(tmp_path))
+        sibling = TokenManager(settings=self._settings(tmp_path))
+
+        assert first._refresh(0, "missing_token")[0] == "minted"
+        assert sibling._refresh(0, "missing_token")[0] == "minted"
+
+        assert post.call_count == 1
+        assert sibling.stats()["store_reuses"] == 1
+        assert sibling.expires_at == first.expires_at
+
+    @patch('llm_arch_sdk.auth.token_manager.HttpClientFactory')
+    def test_rejected_token_is_not_reused(self, mock_factory, tmp_path):
+        tokens = iter(["token1", "token2"])
+        post = mock_factory.create.return_value.post
+        post.side_effect = lambda *a, **k: _login_response({"token": next(tokens)})
+
+        manager = TokenManager(settings=self._settings(tmp_path))
+        token, generation = manager._refresh(0, "missing_token")
+
+        # 401 con token1: el store todavía lo tiene, pero hay que hacer login
+        assert manager._refresh(generation, "token_expired")[0] == "token2"
+        assert post.call_count == 2
+        assert FileTokenStore(manager.settings.token_store_path, "testuser@http://localhost:8000").load().token == "token2"
+
+    @patch('llm_arch_sdk.auth.token_manager.HttpClientFactory')
+    def test_concurrent_workers_log_in_once(self, mock_factory, tmp_path):
+        def login(*args, **kwargs):
+            time.sleep(0.05)
+            return _login_response({"token": "minted", "expires_in": 600})
+
+        post = mock_factory.create.return_value.post
+        post.side_effect = login
+
+        # un TokenManager por "worker"; flock también excluye entre fds del mismo proceso
+        workers = [TokenManager(settings=self._settings(tmp_path)) for _ in range(8)]
+        barrier = threading.Barrier(len(workers))
+        tokens = []
+
+        def boot(manager):
+            barrier.wait()
+            tokens.append(manager._refresh(0, "missing_token")[0])
+
+        threads = [threading.Thread(target=boot, args=(m,)) for m in workers]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert tokens == ["minted"] * len(workers)
+        assert post.call_count == 1
+        assert sum(m.stats()["store_reuses"] for m in workers) == len(workers) - 1
@@ -0,0 +1,286 @@
+import asyncio
+import pytest
+import httpx
+from unittest.mock import AsyncMock, Mock
+from llm_arch_sdk.client.async_llm_client import AsyncLlmClient
+from llm_arch_sdk.client.llm_client import LlmAPIError
+from llm_arch_sdk.config.settings import ConcurrencySettings, HedgingSettings, RateLimitSettings
+from llm_arch_sdk.models.chat_completion import ChatCompletionResult
+from llm_arch_sdk.models.completion import CompletionResult
+from llm_arch_sdk.transport.circuit_breaker import CircuitBreakerOpen, CircuitState
+from llm_arch_sdk.transport.concurrency import ConcurrencyLimiter
+from llm_arch_sdk.transport.hedging import HedgePolicy
+from llm_arch_sdk.transport.rate_limiter import RateLimiter
+
+
+@pytest.fixture
+def mock_http_client():
+    client = Mock()
+    client.request = AsyncMock()
+    client.aclose = AsyncMock()
+    return client
+
+@pytest.fixture
+def llm_client(mock_http_client):
+    return AsyncLlmClient(base_url="http://localhost:8000/", http_client=mock_http_client)
+
+
+def _response(status_code=200, body=None):
+    resp = Mock()
+    resp.status_code = status_code
+    resp.json.return_value = body if body is not None else {}
+    return resp
+
+
+class TestAsyncLlmClientRequest:
+    def test_request_success(self, llm_client, mock_http_client):
+        mock_http_client.request.return_value = _response(body={"status": "ok"})
+
+        result = asyncio.run(llm_client._request("GET", "/health"))
+
+        assert result == {"status": "ok"}
+        mock_http_client.request.assert_awaited_once_with("GET", "http://localhost:8000/health")
+
+    def test_request_circuit_breaker_open(self, llm_client, mock_http_client):
+        llm_client._circuit.allow_request = Mock(return_value=False)
+
+        with pytest.raises(CircuitBreakerOpen):
+            asyncio.run(llm_client._request("GET", "/health"))
+        mock_http_client.request.assert_not_awaited()
+
+    def test_request_server_error(self, llm_client, mock_http_client):
+        mock_http_client.request.return_value = _response(status_code=500)
+
+        with pytest.raises(LlmAPIError, match="Error 500"):
+            asyncio.run(llm_client._request("GET", "/health"))
+        assert llm_client._circuit._failure_count == 1
+
+    def test_client_errors_do_not_open_circuit(self):
+        client = AsyncLlmClient(
+            base_url="http://localhost:8000",
+            http_client=httpx.AsyncClient(transport=httpx.MockTransport(lambda request: httpx.Response(400))),
+        )
+
+        async def run():
+            for _ in range(30):
+                with pytest.raises(LlmAPIError):
+                    await client._request("POST", "/llm/completions", json={})
+
+        asyncio.run(run())
+
+        assert client._circuit._state == CircuitState.CLOSED
+        assert client._circuit.failure_rate() == 0.0
+
+    def test_request_timeout_exception(self, llm_client, mock_http_client):
+        mock_http_client.request.side_effect = httpx.TimeoutException("Timeout")
+
+        with pytest.raises(LlmAPIError, match="Timeout"):
+            asyncio.run(llm_client._request("GET", "/health"))
+
+    def test_concurrent_requests_share_client(self, llm_client, mock_http_client):
+        mock_http_client.request.return_value = _response(body={"status": "ok"})
+
+        async def run():
+            return await asyncio.gather(*(llm_client.health() for _ in range(50)))
+
+        results = asyncio.run(run())
+
+        assert len(results) == 50
+        assert mock_http_client.request.await_count == 50
+
+    def test_context_manager_closes_client(self, llm_client, mock_http_client):
+        async def run():
+            async with llm_client:
+                pass
+
+        asyncio.run(run())
+        mock_http_client.aclose.assert_awaited_once()
+
+
+class TestAsyncResources:
+    def test_completions_create(self, llm_client, mock_http_client):
+        mock_http_client.request.return_value = _response(body={
+            "index": 0,
+            "content": "Hola",
+            "model": "llama-7b",
+            "stop": True,
+            "prompt": "Hi",
+        })
+
+        result = asyncio.run(llm_client.completions.create(prompt="Hi", temperature=0.0, n_predict=8))
+
+        assert isinstance(result, CompletionResult)
+        assert result.content == "Hola"
+        mock_http_client.request.assert_awaited_once_with(
+            "POST",
+            "http://localhost:8000/llm/completions",
+            json={"prompt": "Hi", "temperature": 0.0, "n_predict": 8},
+        )
+
+    def test_chat_create(self, llm_client, mock_http_client):
+        mock_http_client.request.return_value = _response(body={
+            "id": "chat_1",
+            "model": "llama-7b",
+            "created": 1,
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": "Hola"}}],
+        })
+
+        result = asyncio.run(llm_client.chat.create(
+            model="llama-7b",
+            messages=[{"role": "user", "content": "Hi"}],
+        ))
+
+        assert isinstance(result, ChatCompletionResult)
+        assert result.choices[0].message.content == "Hola"
+
+    def test_embeddings_create(self, llm_client, mock_http_client):
+        body = {"data": [{"embedding": [0.1, 0.2], "index": 0}]}
+        mock_http_client.request.return_value = _response(body=body)
+
+        result = asyncio.run(llm_client.embeddings.create(model="emb", input=["Hi"]))
+
+        assert result == body
+        mock_http_client.request.assert_awaited_once_with(
+            "POST",
+            "http://localhost:8000/v1/embeddings",
+            json={"model": "emb", "input": ["Hi"]},
+        )
+
+    def test_completions_stream(self):
+        body = (
+            'data: {"content": "Ho", "stop": false}\n\n'
+            'data: {"content": "la", "stop": false}\n\n'
+            'data: {"content": "", "stop": true, "stop_type": "limit", "tokens_cached": 4}\n\n'
+        )
+
+        async def handler(request):
+            return httpx.Response(200, text=body, headers={"Content-Type": "text/event-stream"})
+
+        client = AsyncLlmClient(
+            base_url="http://localhost:8000",
+            http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+        )
+
+        async def collect():
+            return [c async for c in client.completions.stream(prompt="Hi", temperature=0.0, n_predict=2)]
+
+        chunks = asyncio.run(collect())
+
+        assert [c.content for c in chunks] == ["Ho", "la", ""]
+        assert chunks[-1].result.content == "Hola"
+        assert chunks[-1].result.stop_type == "limit"
+        assert chunks[-1].result.tokens_cached == 4
+
+    def test_chat_stream(self):
+        body = (
+            'data: {"id": "c1", "choices": [{"index": 0, "delta": {"role": "assistant", "content": "Ho"}}]}\n\n'
+            'data: {"id": "c1", "choices": [{"index": 0, "delta": {"content": "la"}, "finish_reason": "stop"}]}\n\n'
+            'data: {"id": "c1", "choices": [], "usage": {"prompt_tokens": 3, "completion_tokens": 2, "total_tokens": 5}}\n\n'
+            'data: [DONE]\n\n'
+        )
+
+        async def handler(request):
+            return httpx.Response(200, text=body, headers={"Content-Type": "text/event-stream"})
+
+        client = AsyncLlmClient(
+            base_url="http://localhost:8000",
+            http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+        )
+
+        async def run():
+            stream = client.chat.stream(model="llama-7b", messages=[])
+            chunks = [c async for c in stream]
+            return chunks, await stream.final()
+
+        chunks, result = asyncio.run(run())
+
+        assert len(chunks) == 3
+        assert result.choices[0].message.content == "Hola"
+        assert result.usage.total_tokens == 5
+
+
+class TestAsyncLlmClientHedging:
+    def test_slow_primary_is_cancelled(self):
+        cancelled = []
+
+        async def handler(request):
+            if request.url.host == "a":
+                try:
+                    await asyncio.sleep(1)
+                except asyncio.CancelledError:
+                    cancelled.append(request.url.host)
+                    raise
+                return httpx.Response(200, json={"from": "a"})
+            return httpx.Response(200, json={"from": "b"})
+
+        client = AsyncLlmClient(
+            base_url="http://a:8080",
+            http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+            backends=["http://a:8080", "http://b:8080"],
+        )
+        client._hedging = HedgePolicy(HedgingSettings(enabled=True, min_samples=1, min_delay=0.01))
+        client._hedging.observe(0.01)
+        client._balancer.pick = Mock(side_effect=lambda exclude=(), prefer=None: next(
+            b for b in client._balancer.backends if b not in exclude
+        ))
+
+        result = asyncio.run(client._request("POST", "/v1/embeddings", json={}))
+
+        assert result == {"from": "b"}
+        assert cancelled == ["a"]
+        assert client.hedging.stats()["hedge_wins"] == 1
+        assert client._balancer.backends[0].outstanding == 0
+
+    def _slow_primary_client(self, hosts, limit):
+        async def handler(request):
+            hosts.append(request.url.host)
+            if len(hosts) == 1:
+                await asyncio.sleep(0.1)
+            return httpx.Response(200, json={})
+
+        client = AsyncLlmClient(
+            base_url="http://a:8080",
+            http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+        )
+        client._hedging = HedgePolicy(HedgingSettings(enabled=True, min_samples=1, min_delay=0.01))
+        client._hedging.observe(0.01)
+        client._limiter = ConcurrencyLimiter(ConcurrencySettings(enabled=True, initial_limit=limit))
+        return client
+
+    def test_no_hedge_without_free_permit(self):
+        hosts = []
+        client = self._slow_primary_client(hosts, limit=1)
+
+        asyncio.run(client._request("POST", "/v1/embeddings", json={}))
+
+        assert hosts == ["a"]
+        assert client.concurrency.in_flight == 0
+
+    def test_hedge_permit_released(self):
+        hosts = []
+        client = self._slow_primary_client(hosts, limit=2)
+
+        asyncio.run(client._request("POST", "/v1/embeddings", json={}))
+
+        assert hosts == ["a", "a"]
+        assert client.concurrency.in_flight == 0
+
+
+class TestAsyncLlmClientRateLimit:
+    def test_open_circuit_refunds_quota(self):
+        client = AsyncLlmClient(
+            base_url="http://localhost:8000",
+            http_client=httpx.AsyncClient(transport=httpx.MockTransport(lambda request: httpx.Response(200, json={}))),
+        )
+        client._rate_limiter = RateLimiter(RateLimitSettings(enabled=True, requests_per_second=1))
+        client._balancer.backends[0].circuit.allow_request = Mock(return_value=False)
+
+        async def run():
+            for _ in range(3):
+                with pytest.raises(CircuitBreakerOpen):
+                    await client._request("POST", "/llm/completions", json={})
+
+        asyncio.run(run())
+
+        assert client.rate_limiter.stats()["requests_available"] == pytest.approx(1)
+        assert client.rate_limiter.stats()["throttled"] == 0
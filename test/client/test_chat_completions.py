@@ -128,4 +128,82 @@ class TestChatCompletions:
             chat.create(
                 model="gpt-3.5-turbo",
                 messages=[{"role": "user", "content": "Hello"}]
-            )
\ No newline at end of file
+            )
+
+class TestChatCompletionsStream:
+    EVENTS = [
+        {
+            "id": "chat_1", "object": "chat.completion.chunk", "created": 1, "model": "llama-7b",
+            "choices": [{"index": 0, "delta": {"role": "assistant", "content": "Ho"}}],
+        },
+        {
+            "id": "chat_1", "object": "chat.completion.chunk", "created": 1, "model": "llama-7b",
+            "choices": [{"index": 0, "delta": {"content": "la"}}],
+        },
+        {
+            "id": "chat_1", "object": "chat.completion.chunk", "created": 1, "model": "llama-7b",
+            "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}],
+            "timings": {"predicted_n": 2, "predicted_ms": 12.5},
+        },
+        {
+            "id": "chat_1", "object": "chat.completion.chunk", "created": 1, "model": "llama-7b",
+            "choices": [],
+            "usage": {"prompt_tokens": 5, "completion_tokens": 2, "total_tokens": 7},
+        },
+    ]
+
+    def test_stream_yields_deltas(self):
+        mock_client = Mock()
+        mock_client._stream.return_value = iter(self.EVENTS)
+
+        chat = ChatCompletions(mock_client)
+        stream = chat.stream(model="llama-7b", messages=[{"role": "user", "content": "Hi"}])
+        deltas = [c.choices[0].delta.content for c in stream if c.choices]
+
+        assert deltas == ["Ho", "la", None]
+        mock_client._stream.assert_called_once_with(
+            "POST",
+            "/llm/chat/completions",
+            json={
+                "model": "llama-7b",
+                "messages": [{"role": "user", "content": "Hi"}],
+                "stream": True,
+                "stream_options": {"include_usage": True},
+            }
+        )
+
+    def test_stream_final_result(self):
+        mock_client = Mock()
+        mock_client._stream.return_value = iter(self.EVENTS)
+
+        chat = ChatCompletions(mock_client)
+        result = chat.stream(model="llama-7b", messages=[]).final()
+
+        assert isinstance(result, ChatCompletionResult)
+        assert result.id == "chat_1"
+        assert result.choices[0].message.role == "assistant"
+        assert result.choices[0].message.content == "Hola"
+        assert result.choices[0].finish_reason == "stop"
+        assert result.usage.total_tokens == 7
+        assert result.timings.predicted_n == 2
+
+    def test_stream_final_after_partial_iteration(self):
+        mock_client = Mock()
+        mock_client._stream.return_value = iter(self.EVENTS)
+
+        stream = ChatCompletions(mock_client).stream(model="llama-7b", messages=[])
+        first = next(iter(stream))
+
+        assert first.choices[0].delta.content == "Ho"
+        assert stream.final().choices[0].message.content == "Hola"
+
+    def test_stream_respects_stream_options(self):
+        mock_client = Mock()
+        mock_client._stream.return_value = iter([])
+
+        ChatCompletions(mock_client).stream(
+            model="llama-7b", messages=[], stream_options={"include_usage": False}
+        )
+
+        _, kwargs = mock_client._stream.call_args
+        assert kwargs["json"]["stream_options"] == {"include_usage": False}
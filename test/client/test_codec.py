@@ -0,0 +1,118 @@
+import json
+import httpx
+import pytest
+from unittest.mock import patch
+from llm_arch_sdk.client.codec import JsonCodec, decode_kwargs, msgspec, orjson
+from llm_arch_sdk.client.llm_client import LlmClient
+from llm_arch_sdk.config.settings import CodecSettings, _sdk_settings
+from llm_arch_sdk.models.chat_completion import ChatCompletionResult
+from llm_arch_sdk.models.completion import CompletionResult
+
+COMPLETION = {
+    "index": 0,
+    "content": "Hola",
+    "model": "llama",
+    "stop": True,
+    "stop_type": "eos",
+    "stopping_word": "",
+    "tokens_predicted": 3,
+    "tokens_evaluated": 5,
+    "tokens_cached": 2,
+    "prompt": "Di hola",
+    "has_new_line": False,
+    "truncated": False,
+    "id_slot": 1,
+    "tokens": [1, 2, 3],
+    "generation_settings": {
+        "seed": 42, "temperature": 0.0, "top_k": 40, "top_p": 0.95, "min_p": 0.05,
+        "typical_p": 1.0, "repeat_last_n": 64, "repeat_penalty": 1.0, "presence_penalty": 0.0,
+        "frequency_penalty": 0.0, "max_tokens": 3, "n_predict": 3, "stream": False, "stop": [],
+        "samplers": ["top_k"], "chat_format": "Content-only", "reasoning_format": "none",
+        "reasoning_in_content": False, "dry_multiplier": 0.0,
+    },
+    "timings": {
+        "cache_n": 2, "prompt_n": 3, "prompt_ms": 1.0, "prompt_per_token_ms": 0.3,
+        "prompt_per_second": 3000.0, "predicted_n": 3, "predicted_ms": 3.0,
+        "predicted_per_token_ms": 1.0, "predicted_per_second": 1000.0,
+    },
+}
+
+BACKENDS = ["json"] + (["orjson"] if orjson else []) + (["msgspec"] if msgspec else [])
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+class TestJsonCodec:
+    def test_roundtrip(self, backend):
+        codec = JsonCodec(CodecSettings(enabled=True, backend=backend))
+        payload = {"prompt": "ñandú", "n_predict": 8, "stop": ["\n"]}
+
+        assert json.loads(codec.encode(payload)) == payload
+        assert codec.decode(codec.encode(payload)) == payload
+
+    def test_decode_as_matches_from_dict(self, backend):
+        codec = JsonCodec(CodecSettings(enabled=True, backend=backend))
+
+        result, meta = codec.decode_as(json.dumps(COMPLETION).encode(), CompletionResult)
+
+        assert result == CompletionResult.from_dict(COMPLETION)
+        assert meta["id_slot"] == 1
+        assert meta["timings"]["prompt_n"] == 3
+        assert meta["tokens_evaluated"] == 5
+
+    def test_decode_as_falls_back_outside_schema(self, backend):
+        codec = JsonCodec(CodecSettings(enabled=True, backend=backend))
+        data = {"id": "x", "model": "m", "created": 1, "choices": [{"message": {"role": "assistant"}}]}
+
+        result, _ = codec.decode_as(json.dumps(data).encode(), ChatCompletionResult)
+
+        assert result == ChatCompletionResult.from_dict(data)
+        assert result.choices[0].message.content == ""
+
+
+class TestCodecResolution:
+    def test_unknown_backend_raises(self):
+        with pytest.raises(ValueError):
+            JsonCodec(CodecSettings(enabled=True, backend="yaml"))
+
+    def test_missing_backend_falls_back(self):
+        with patch("llm_arch_sdk.client.codec.orjson", None), patch("llm_arch_sdk.client.codec.msgspec", None):
+            assert JsonCodec(CodecSettings(enabled=True, backend="msgspec")).backend == "json"
+
+    def test_decode_kwargs_follows_settings(self):
+        with patch.object(_sdk_settings.codec, "enabled", False):
+            assert decode_kwargs(CompletionResult) == {}
+        with patch.object(_sdk_settings.codec, "enabled", True):
+            assert decode_kwargs(CompletionResult) == {"decode_as": CompletionResult}
+
+
+class TestLlmClientCodec:
+    def test_encodes_body_and_decodes_typed(self):
+        seen = {}
+
+        def handler(request):
+            seen["content_type"] = request.headers["content-type"]
+            seen["body"] = json.loads(request.content)
+            return httpx.Response(200, content=json.dumps(COMPLETION).encode())
+
+        with patch.object(_sdk_settings.codec, "enabled", True):
+            client = LlmClient(
+                base_url="http://localhost:8000",
+                http_client=httpx.Client(transport=httpx.MockTransport(handler)),
+            )
+            result = client.completions.create(prompt="Di hola", temperature=0.7, n_predict=3)
+
+        assert isinstance(result, CompletionResult)
+        assert result == CompletionResult.from_dict(COMPLETION)
+        assert seen["content_type"] == "application/json"
+        assert seen["body"] == {"prompt": "Di hola", "temperature": 0.7, "n_predict": 3}
+
+    def test_untyped_requests_return_dict(self):
+        with patch.object(_sdk_settings.codec, "enabled", True):
+            client = LlmClient(
+                base_url="http://localhost:8000",
+                http_client=httpx.Client(transport=httpx.MockTransport(
+                    lambda request: httpx.Response(200, json={"status": "ok"})
+                )),
+            )
+
+        assert client._request("GET", "/health") == {"status": "ok"}
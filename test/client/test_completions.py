@@ -99,4 +99,79 @@ class TestCompletions:
 
         completions = Completions(mock_client)
         with pytest.raises(Exception, match="Network Error"):
-            completions.create(prompt="Test")
\ No newline at end of file
+            completions.create(prompt="Test")
+
+class TestCompletionsStream:
+    def test_stream_yields_chunks_and_final_result(self):
+        mock_client = Mock()
+        mock_client._stream.return_value = iter([
+            {"index": 0, "content": "Hola", "stop": False, "tokens": [101]},
+            {"index": 0, "content": " mundo", "stop": False, "tokens": [102, 103]},
+            {
+                "index": 0,
+                "content": "",
+                "stop": True,
+                "tokens": [],
+                "model": "llama-7b",
+                "stop_type": "eos",
+                "tokens_predicted": 2,
+                "tokens_evaluated": 3,
+                "tokens_cached": 1,
+                "prompt": "Hi",
+                "timings": {"predicted_n": 2, "predicted_ms": 10.0},
+            },
+        ])
+
+        completions = Completions(mock_client)
+        chunks = list(completions.stream(prompt="Hi", temperature=0.0, n_predict=8))
+
+        assert [c.content for c in chunks] == ["Hola", " mundo", ""]
+        assert chunks[0].result is None
+        result = chunks[-1].result
+        assert isinstance(result, CompletionResult)
+        assert result.content == "Hola mundo"
+        assert list(result.tokens) == [101, 102, 103]
+        assert result.stop_type == "eos"
+        assert result.tokens_cached == 1
+        assert result.timings.predicted_n == 2
+        mock_client._stream.assert_called_once_with(
+            "POST",
+            "/llm/completions",
+            json={
+                "prompt": "Hi",
+                "temperature": 0.0,
+                "n_predict": 8,
+                "stream": True,
+            }
+        )
+
+
+class TestCompletionsLean:
+    RESPONSE = {
+        "index": 0,
+        "content": "Hola",
+        "model": "llama",
+        "stop": True,
+        "prompt": "Di hola " * 100,
+        "generation_settings": {"temperature": 0.7},
+    }
+
+    def test_lean_per_call(self):
+        mock_client = Mock()
+        mock_client._request.return_value = self.RESPONSE
+
+        completions = Completions(mock_client)
+        lean = completions.create(prompt="Di hola", temperature=0.7, n_predict=8, lean=True)
+        full = completions.create(prompt="Di hola", temperature=0.7, n_predict=8)
+
+        assert lean.prompt is None and lean.generation_settings is None
+        assert full.prompt == self.RESPONSE["prompt"]
+
+    def test_lean_per_client_can_be_overridden(self):
+        mock_client = Mock()
+        mock_client._request.return_value = self.RESPONSE
+
+        completions = Completions(mock_client, lean=True)
+
+        assert completions.create(prompt="x", temperature=0.7, n_predict=8).prompt is None
+        assert completions.create(prompt="x", temperature=0.7, n_predict=8, lean=False).prompt is not None
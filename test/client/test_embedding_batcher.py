@@ -0,0 +1,137 @@
+import time
+import threading
+import pytest
+from concurrent.futures import wait
+from unittest.mock import Mock
+from llm_arch_sdk.client.embedding_batcher import EmbeddingBatcher
+from llm_arch_sdk.config.settings import EmbeddingMicroBatchSettings
+
+
+def _embeddings():
+    calls = []
+    lock = threading.Lock()
+
+    def create(model, input):
+        with lock:
+            calls.append(list(input))
+        return {"data": [{"index": i, "embedding": [float(len(t))]} for i, t in enumerate(input)]}
+
+    embeddings = Mock()
+    embeddings.create.side_effect = create
+    return embeddings, calls
+
+
+def _batcher(embeddings, **kwargs):
+    return EmbeddingBatcher(embeddings, EmbeddingMicroBatchSettings(**kwargs))
+
+
+class TestEmbeddingBatcher:
+    def test_flushes_on_max_items(self):
+        embeddings, calls = _embeddings()
+        with _batcher(embeddings, max_items=3, max_wait_ms=10_000) as batcher:
+            futures = [batcher.submit("m", "x" * n) for n in (1, 2, 3)]
+
+            assert [f.result(timeout=1) for f in futures] == [[1.0], [2.0], [3.0]]
+        assert calls == [["x", "xx", "xxx"]]
+
+    def test_flushes_on_deadline(self):
+        embeddings, calls = _embeddings()
+        with _batcher(embeddings, max_items=100, max_wait_ms=20) as batcher:
+            start = time.monotonic()
+            future = batcher.submit("m", "ab")
+
+            assert future.result(timeout=1) == [2.0]
+            assert time.monotonic() - start < 0.5
+        assert calls == [["ab"]]
+
+    def test_coalesces_threads_and_dedupes(self):
+        embeddings, calls = _embeddings()
+        submitted = []
+        lock = threading.Lock()
+
+        with _batcher(embeddings, max_items=1000, max_wait_ms=50) as batcher:
+            def worker(i):
+                text = "t" * (i % 5 + 1)
+                future = batcher.submit("m", text)
+                with lock:
+                    submitted.append((text, future))
+
+            threads = [threading.Thread(target=worker, args=(i,)) for i in range(40)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+            wait([future for _, future in submitted], timeout=2)
+
+        assert all(future.result() == [float(len(text))] for text, future in submitted)
+        assert len(calls) < 40
+        assert all(len(call) == len(set(call)) for call in calls)
+        assert batcher.stats()["items"] == 40
+
+    def test_groups_by_model(self):
+        embeddings, calls = _embeddings()
+        with _batcher(embeddings, max_items=2, max_wait_ms=10_000) as batcher:
+            a = batcher.submit("a", "1")
+            b = batcher.submit("b", "22")
+            a2 = batcher.submit("a", "333")
+
+            assert a.result(timeout=1) == [1.0] and a2.result(timeout=1) == [3.0]
+        assert b.result(timeout=1) == [2.0]
+        models = [c.kwargs["model"] for c in embeddings.create.call_args_list]
+        assert sorted(models) == ["a", "b"]
+
+    def test_error_propagates_to_batch(self):
+        embeddings = Mock()
+        embeddings.create.side_effect = RuntimeError("boom")
+        with _batcher(embeddings, max_items=2, max_wait_ms=10_000) as batcher:
+            futures = [batcher.submit("m", "a"), batcher.submit("m", "b")]
+
+            for future in futures:
+                with pytest.raises(RuntimeError, match="boom"):
+                    future.result(timeout=1)
+
+    def test_close_flushes_and_rejects(self):
+        embeddings, calls = _embeddings()
+        batcher = _batcher(embeddings, max_items=100, max_wait_ms=10_000)
+        future = batcher.submit("m", "abc")
+
+        batcher.close()
+
+        assert future.result(timeout=0) == [3.0]
+        with pytest.raises(RuntimeError):
+            batcher.submit("m", "x")
+
+    def test_close_during_submits_leaves_no_future_hanging(self):
+        embeddings, _ = _embeddings()
+        batcher = _batcher(embeddings, max_items=1, max_wait_ms=10_000)
+        futures, start = [], threading.Barrier(5)
+
+        def worker():
+            start.wait()
+            for i in range(200):
+                try:
+                    futures.append(batcher.submit("m", str(i)))
+                except RuntimeError:
+                    return
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        start.wait()
+        batcher.close()
+        for thread in threads:
+            thread.join()
+
+        _, not_done = wait(futures, timeout=2)
+        assert not not_done
+        assert all(future.exception() is None for future in futures)
+
+    def test_dispatch_after_shutdown_fails_futures(self):
+        embeddings, _ = _embeddings()
+        batcher = _batcher(embeddings, max_items=1, max_wait_ms=10_000)
+        batcher._executor.shutdown()
+
+        future = batcher.submit("m", "a")
+
+        with pytest.raises(RuntimeError):
+            future.result(timeout=0)
@@ -0,0 +1,193 @@
+import asyncio
+import json
+import threading
+import time
+import httpx
+import pytest
+from unittest.mock import AsyncMock, Mock
+from llm_arch_sdk.client.embedding_batches import is_too_large, merge_responses, split_batches
+from llm_arch_sdk.client.embeddings import AsyncEmbeddings, Embeddings
+from llm_arch_sdk.client.llm_client import LlmAPIError, LlmClient
+from llm_arch_sdk.transport.circuit_breaker import CircuitState
+from llm_arch_sdk.config.settings import EmbeddingBatchSettings
+
+
+def _settings(**kwargs):
+    return EmbeddingBatchSettings(**kwargs)
+
+
+def _response(texts):
+    return {
+        "model": "m",
+        "data": [{"object": "embedding", "index": i, "embedding": [float(t)]} for i, t in enumerate(texts)],
+        "usage": {"prompt_tokens": len(texts), "total_tokens": len(texts)},
+    }
+
+
+class TestSplitBatches:
+    def test_by_items(self):
+        assert split_batches(["a"] * 5, _settings(max_items=2)) == [["a", "a"], ["a", "a"], ["a"]]
+
+    def test_by_tokens(self):
+        texts = ["x" * 40, "x" * 40, "x" * 40]
+
+        assert split_batches(texts, _settings(max_tokens=25, chars_per_token=4.0)) == [
+            ["x" * 40, "x" * 40], ["x" * 40],
+        ]
+
+    def test_oversized_text_gets_own_batch(self):
+        texts = ["a", "x" * 400, "b"]
+
+        assert split_batches(texts, _settings(max_tokens=10)) == [["a"], ["x" * 400], ["b"]]
+
+
+class TestMergeResponses:
+    def test_reindexes_in_order(self):
+        merged = merge_responses([_response(["1", "2"]), _response(["3"])])
+
+        assert [d["index"] for d in merged["data"]] == [0, 1, 2]
+        assert [d["embedding"] for d in merged["data"]] == [[1.0], [2.0], [3.0]]
+        assert merged["usage"]["total_tokens"] == 3
+
+
+class TestIsTooLarge:
+    @pytest.mark.parametrize("exc, expected", [
+        (LlmAPIError("HTTP 413: ", status_code=413), True),
+        (LlmAPIError("Error 500", status_code=500, body="input is too large to process"), True),
+        (LlmAPIError("HTTP 400: exceeds the context size", status_code=400, body="exceeds the context size"), True),
+        (LlmAPIError("HTTP 400", status_code=400, body="the request exceeds the available context size"), True),
+        (LlmAPIError("Error 500", status_code=500, body="increase the physical batch size (current batch size: 512)"), True),
+        (LlmAPIError("HTTP 401: unauthorized", status_code=401, body="unauthorized"), False),
+        (LlmAPIError("HTTP 429", status_code=429, body="Rate limit exceeds quota"), False),
+        (LlmAPIError("Error 503", status_code=503, body="batch size queue full"), False),
+        (LlmAPIError("Error 503", status_code=503, body="input is too large to process"), False),
+        (LlmAPIError("Error 500", status_code=500, body="exceeds memory budget"), False),
+        (LlmAPIError("Error 502", status_code=502, body="Response too large"), False),
+        (LlmAPIError("timeout"), False),
+    ])
+    def test_detection(self, exc, expected):
+        assert is_too_large(exc) is expected
+
+
+def _client(max_items=None):
+    sent = []
+    lock = threading.Lock()
+
+    def request(method, endpoint, json):
+        with lock:
+            sent.append(list(json["input"]))
+        if max_items is not None and len(json["input"]) > max_items:
+            raise LlmAPIError("HTTP 413: too large", status_code=413, body="")
+        time.sleep(0.01)
+        return _response(json["input"])
+
+    client = Mock()
+    client._request.side_effect = request
+    return client, sent
+
+
+class TestEmbeddingsBatching:
+    def test_splits_and_preserves_order(self):
+        client, sent = _client()
+        embeddings = Embeddings(client, batching=_settings(max_items=3, max_concurrency=4))
+        texts = [str(i) for i in range(10)]
+
+        result = embeddings.create(model="m", input=texts)
+
+        assert len(sent) == 4
+        assert [d["embedding"][0] for d in result["data"]] == [float(t) for t in texts]
+        assert [d["index"] for d in result["data"]] == list(range(10))
+
+    def test_single_batch_unchanged(self):
+        client, sent = _client()
+        embeddings = Embeddings(client, batching=_settings(max_items=3))
+
+        embeddings.create(model="m", input=["1", "2"])
+
+        assert sent == [["1", "2"]]
+
+    def test_too_large_is_split_in_half(self):
+        client, sent = _client(max_items=2)
+        embeddings = Embeddings(client, batching=_settings(max_items=100))
+
+        result = embeddings.create(model="m", input=["1", "2", "3", "4", "5"])
+
+        assert sent[0] == ["1", "2", "3", "4", "5"]
+        assert [d["embedding"][0] for d in result["data"]] == [1.0, 2.0, 3.0, 4.0, 5.0]
+
+    def test_other_errors_propagate(self):
+        client = Mock()
+        client._request.side_effect = LlmAPIError("HTTP 401: no", status_code=401, body="no")
+        embeddings = Embeddings(client)
+
+        with pytest.raises(LlmAPIError):
+            embeddings.create(model="m", input=["1", "2"])
+        assert client._request.call_count == 1
+
+    @pytest.mark.parametrize("status, body", [
+        (413, "payload too large"),
+        (500, "input is too large to process, increase the physical batch size"),
+    ])
+    def test_split_does_not_trip_circuit_breaker(self, status, body):
+        sent = []
+
+        def handler(request):
+            texts = json.loads(request.content)["input"]
+            sent.append(len(texts))
+            if len(texts) > 4:
+                return httpx.Response(status, text=body)
+            return httpx.Response(200, json=_response(texts))
+
+        client = LlmClient(
+            base_url="http://localhost:8000",
+            http_client=httpx.Client(transport=httpx.MockTransport(handler)),
+        )
+        client.embeddings._batching = _settings(max_items=100, max_concurrency=1)
+        texts = [str(i) for i in range(32)]
+
+        result = client.embeddings.create(model="m", input=texts)
+
+        assert sent[:3] == [32, 16, 8]
+        assert [d["embedding"][0] for d in result["data"]] == [float(t) for t in texts]
+        assert client._circuit._state == CircuitState.CLOSED
+        assert client._circuit._failure_count == 0
+        assert client._circuit.failure_rate() == 0.0
+
+    def test_server_error_mentioning_size_trips_circuit_breaker(self):
+        sent = []
+
+        def handler(request):
+            sent.append(len(json.loads(request.content)["input"]))
+            return httpx.Response(500, text="exceeds memory budget")
+
+        client = LlmClient(
+            base_url="http://localhost:8000",
+            http_client=httpx.Client(transport=httpx.MockTransport(handler)),
+        )
+
+        with pytest.raises(LlmAPIError):
+            client.embeddings.create(model="m", input=[str(i) for i in range(8)])
+
+        assert sent == [8]
+        assert client._circuit._failure_count == 1
+
+    def test_async_bounded_concurrency(self):
+        in_flight, peak = 0, 0
+
+        async def request(method, endpoint, json):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return _response(json["input"])
+
+        client = Mock()
+        client._request = AsyncMock(side_effect=request)
+        embeddings = AsyncEmbeddings(client, batching=_settings(max_items=1, max_concurrency=2))
+        texts = [str(i) for i in range(6)]
+
+        result = asyncio.run(embeddings.create(model="m", input=texts))
+
+        assert peak == 2
+        assert [d["embedding"][0] for d in result["data"]] == [float(t) for t in texts]
@@ -0,0 +1,138 @@
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, Mock
+from llm_arch_sdk.client.embedding_cache import EmbeddingCache
+from llm_arch_sdk.client.embeddings import AsyncEmbeddings, Embeddings
+from llm_arch_sdk.config.settings import EmbeddingCacheSettings
+
+
+def _server(request_log):
+    """Imita /v1/embeddings: el vector de cada texto es [len(text)]."""
+    def handler(method, endpoint, json):
+        request_log.append(list(json["input"]))
+        return {
+            "model": json["model"],
+            "data": [
+                {"object": "embedding", "index": i, "embedding": [float(len(text))]}
+                for i, text in enumerate(json["input"])
+            ],
+            "usage": {"prompt_tokens": len(json["input"]), "total_tokens": len(json["input"])},
+        }
+    return handler
+
+
+def _cache(tmp_path=None):
+    if tmp_path is None:
+        return EmbeddingCache(EmbeddingCacheSettings(enabled=True))
+    return EmbeddingCache(EmbeddingCacheSettings(
+        enabled=True, persistent=True, path=str(tmp_path / "embeddings.sqlite3"),
+    ))
+
+
+class TestEmbeddingCache:
+    def test_plan_dedupes_misses(self):
+        plan = _cache().plan("m", ["a", "bb", "a", "ccc"])
+
+        assert plan.misses == ["a", "bb", "ccc"]
+        assert plan.vectors == [None] * 4
+
+    def test_complete_restores_order(self):
+        cache = _cache()
+        plan = cache.plan("m", ["a", "bb", "a"])
+        raw = {"data": [
+            {"index": 1, "embedding": [2.0]},
+            {"index": 0, "embedding": [1.0]},
+        ]}
+
+        result = cache.complete(plan, raw)
+
+        assert [d["embedding"] for d in result["data"]] == [[1.0], [2.0], [1.0]]
+        assert [d["index"] for d in result["data"]] == [0, 1, 2]
+
+    def test_key_includes_model(self):
+        assert EmbeddingCache.key("a", "hola") != EmbeddingCache.key("b", "hola")
+
+    def test_response_does_not_share_vectors_with_cache(self):
+        cache = _cache()
+        plan = cache.plan("m", ["a", "a"])
+        first = cache.complete(plan, {"data": [{"index": 0, "embedding": [1.0, 2.0]}]})
+        first["data"][0]["embedding"][0] = 99.0
+
+        second = cache.complete(cache.plan("m", ["a"]), None)
+        second["data"][0]["embedding"][0] = 42.0
+        third = cache.complete(cache.plan("m", ["a"]), None)
+
+        assert first["data"][1]["embedding"] == [1.0, 2.0]
+        assert third["data"][0]["embedding"] == [1.0, 2.0]
+
+    def test_mismatched_response_raises(self):
+        cache = _cache()
+        plan = cache.plan("m", ["a", "b"])
+
+        with pytest.raises(ValueError):
+            cache.complete(plan, {"data": [{"index": 0, "embedding": [1.0]}]})
+
+
+class TestEmbeddingsWithTextCache:
+    def test_only_misses_are_sent(self):
+        sent = []
+        client = Mock()
+        client._request.side_effect = _server(sent)
+        embeddings = Embeddings(client, text_cache=_cache())
+
+        embeddings.create(model="m", input=["a", "bb"])
+        result = embeddings.create(model="m", input=["bb", "ccc", "a", "ccc"])
+
+        assert sent == [["a", "bb"], ["ccc"]]
+        assert [d["embedding"] for d in result["data"]] == [[2.0], [3.0], [1.0], [3.0]]
+
+    def test_all_hits_skip_server(self):
+        sent = []
+        client = Mock()
+        client._request.side_effect = _server(sent)
+        embeddings = Embeddings(client, text_cache=_cache())
+
+        embeddings.create(model="m", input=["a"])
+        result = embeddings.create(model="m", input=["a", "a"])
+
+        assert len(sent) == 1
+        assert result["usage"]["total_tokens"] == 0
+        assert len(result["data"]) == 2
+
+    def test_opt_out_sends_everything(self):
+        sent = []
+        client = Mock()
+        client._request.side_effect = _server(sent)
+        embeddings = Embeddings(client, text_cache=_cache())
+
+        embeddings.create(model="m", input=["a"])
+        embeddings.create(model="m", input=["a"], use_cache=False)
+
+        assert sent == [["a"], ["a"]]
+
+    def test_disk_tier_survives_new_cache(self, tmp_path):
+        sent = []
+        client = Mock()
+        client._request.side_effect = _server(sent)
+
+        Embeddings(client, text_cache=_cache(tmp_path)).create(model="m", input=["a", "bb"])
+        result = Embeddings(client, text_cache=_cache(tmp_path)).create(model="m", input=["bb", "a"])
+
+        assert len(sent) == 1
+        assert [d["embedding"] for d in result["data"]] == [[2.0], [1.0]]
+
+    def test_async(self):
+        sent = []
+        handler = _server(sent)
+        client = Mock()
+        client._request = AsyncMock(side_effect=lambda *a, **kw: handler(*a, **kw))
+        embeddings = AsyncEmbeddings(client, text_cache=_cache())
+
+        async def run():
+            await embeddings.create(model="m", input=["a"])
+            return await embeddings.create(model="m", input=["a", "bb"])
+
+        result = asyncio.run(run())
+
+        assert sent == [["a"], ["bb"]]
+        assert [d["embedding"] for d in result["data"]] == [[1.0], [2.0]]
@@ -1,8 +1,15 @@
+import json
+import time
+import threading
 import pytest
 import httpx
-from unittest.mock import Mock
+from unittest.mock import Mock, patch
 from llm_arch_sdk.client.llm_client import LlmClient, LlmAPIError
-from llm_arch_sdk.transport.circuit_breaker import CircuitBreakerOpen
+from llm_arch_sdk.config.settings import ConcurrencySettings, HedgingSettings, RateLimitSettings, _sdk_settings
+from llm_arch_sdk.transport.concurrency import ConcurrencyLimitExceeded, ConcurrencyLimiter
+from llm_arch_sdk.transport.rate_limiter import RateLimitExceeded, RateLimiter
+from llm_arch_sdk.transport.hedging import HedgePolicy
+from llm_arch_sdk.transport.circuit_breaker import CircuitBreakerOpen, CircuitState
 
 @pytest.fixture
 def mock_http_client():
@@ -66,4 +73,483 @@ class TestLlmClientRequest:
             "POST",
             "http://localhost:8000/chat",
             json={"message": "test"}
-        )
\ No newline at end of file
+        )
+
+class TestLlmClientStream:
+    def _client(self, handler):
+        return LlmClient(
+            base_url="http://localhost:8000",
+            http_client=httpx.Client(transport=httpx.MockTransport(handler)),
+        )
+
+    def test_stream_success(self):
+        body = (
+            'data: {"content": "Ho", "stop": false}\n\n'
+            'data: {"content": "la", "stop": true}\n\n'
+        )
+
+        def handler(request):
+            assert request.url.path == "/llm/completions"
+            return httpx.Response(200, text=body, headers={"Content-Type": "text/event-stream"})
+
+        client = self._client(handler)
+        events = list(client._stream("POST", "/llm/completions", json={"stream": True}))
+
+        assert events == [
+            {"content": "Ho", "stop": False},
+            {"content": "la", "stop": True},
+        ]
+
+    def test_stream_server_error(self):
+        client = self._client(lambda request: httpx.Response(503))
+
+        with pytest.raises(LlmAPIError, match="Error 503"):
+            list(client._stream("POST", "/llm/completions"))
+        assert client._circuit._failure_count == 1
+
+    def test_stream_client_error_includes_body(self):
+        client = self._client(lambda request: httpx.Response(400, text="bad prompt"))
+
+        with pytest.raises(LlmAPIError, match="HTTP 400: bad prompt"):
+            list(client._stream("POST", "/llm/completions"))
+
+    def test_stream_circuit_breaker_open(self, llm_client):
+        llm_client._circuit.allow_request = Mock(return_value=False)
+
+        with pytest.raises(CircuitBreakerOpen):
+            list(llm_client._stream("POST", "/llm/completions"))
+
+
+@patch('llm_arch_sdk.client.llm_client.time.sleep')
+class TestLlmClientRetry:
+    def _client(self, responses):
+        calls = iter(responses)
+
+        def handler(request):
+            item = next(calls)
+            if isinstance(item, Exception):
+                raise item
+            return item
+
+        return LlmClient(
+            base_url="http://localhost:8000",
+            http_client=httpx.Client(transport=httpx.MockTransport(handler)),
+        )
+
+    def test_retries_503_then_succeeds(self, mock_sleep):
+        client = self._client([
+            httpx.Response(503),
+            httpx.Response(200, json={"status": "ok"}),
+        ])
+
+        assert client._request("GET", "/health") == {"status": "ok"}
+        assert mock_sleep.call_count == 1
+        assert client._circuit._failure_count == 0
+
+    def test_honors_retry_after(self, mock_sleep):
+        client = self._client([
+            httpx.Response(429, headers={"Retry-After": "2"}),
+            httpx.Response(200, json={}),
+        ])
+
+        client._request("GET", "/health")
+
+        mock_sleep.assert_called_once_with(2.0)
+
+    def test_retries_429_on_inference_post(self, mock_sleep):
+        client = self._client([
+            httpx.Response(429, headers={"Retry-After": "1"}),
+            httpx.Response(200, json={"content": "ok"}),
+        ])
+
+        assert client._request("POST", "/llm/completions", json={}) == {"content": "ok"}
+        mock_sleep.assert_called_once_with(1.0)
+
+    def test_does_not_retry_503_on_inference_post_without_retry_after(self, mock_sleep):
+        client = self._client([httpx.Response(503)])
+
+        with pytest.raises(LlmAPIError, match="Error 503"):
+            client._request("POST", "/llm/completions", json={})
+
+        mock_sleep.assert_not_called()
+
+    def test_retries_connect_error(self, mock_sleep):
+        client = self._client([
+            httpx.ConnectError("refused"),
+            httpx.Response(200, json={"ok": True}),
+        ])
+
+        assert client._request("POST", "/llm/completions", json={}) == {"ok": True}
+
+    def test_exhausted_retries_count_once_in_circuit(self, mock_sleep):
+        client = self._client([httpx.Response(503)] * 3)
+
+        with pytest.raises(LlmAPIError, match="Error 503"):
+            client._request("GET", "/health")
+
+        assert mock_sleep.call_count == 2
+        assert client._circuit._failure_count == 1
+
+    def test_does_not_retry_500(self, mock_sleep):
+        client = self._client([httpx.Response(500)])
+
+        with pytest.raises(LlmAPIError, match="Error 500"):
+            client._request("GET", "/health")
+
+        mock_sleep.assert_not_called()
+
+
+class TestLlmClientCircuitAccounting:
+    def _client(self, handler):
+        return LlmClient(
+            base_url="http://localhost:8000",
+            http_client=httpx.Client(transport=httpx.MockTransport(handler)),
+        )
+
+    @pytest.mark.parametrize("status", [400, 404, 422])
+    def test_client_errors_do_not_open_circuit(self, status):
+        client = self._client(lambda request: httpx.Response(status, text="bad request"))
+
+        for _ in range(30):
+            with pytest.raises(LlmAPIError):
+                client._request("POST", "/llm/completions", json={})
+
+        assert client._circuit._state == CircuitState.CLOSED
+        assert client._circuit.failure_rate() == 0.0
+
+    def test_stream_client_errors_do_not_open_circuit(self):
+        client = self._client(lambda request: httpx.Response(400, text="bad request"))
+
+        for _ in range(30):
+            with pytest.raises(LlmAPIError):
+                list(client._stream("POST", "/llm/completions", json={}))
+
+        assert client._circuit._state == CircuitState.CLOSED
+        assert client._circuit.failure_rate() == 0.0
+
+    @patch('llm_arch_sdk.client.llm_client.time.sleep')
+    def test_rate_limited_counts_once_as_failure(self, mock_sleep):
+        client = self._client(lambda request: httpx.Response(429))
+
+        with pytest.raises(LlmAPIError):
+            client._request("GET", "/health")
+
+        assert client._circuit._failure_count == 1
+        assert client._circuit.failure_rate() == 1.0
+
+
+class TestLlmClientBackends:
+    def test_env_replicas_do_not_override_explicit_base_url(self):
+        with patch.object(_sdk_settings.llm, "base_url", "http://env:8080"), \
+                patch.object(_sdk_settings.llm, "base_urls", ["http://r1:8080", "http://r2:8080"]):
+            explicit = LlmClient(base_url="http://other:8080/", http_client=Mock())
+            configured = LlmClient(base_url="http://env:8080", http_client=Mock())
+
+        assert [b.url for b in explicit._balancer.backends] == ["http://other:8080"]
+        assert [b.url for b in configured._balancer.backends] == ["http://r1:8080", "http://r2:8080"]
+
+    def test_spreads_requests_across_backends(self):
+        hosts = []
+
+        def handler(request):
+            hosts.append(request.url.host)
+            return httpx.Response(200, json={})
+
+        client = LlmClient(
+            base_url="http://a:8080",
+            http_client=httpx.Client(transport=httpx.MockTransport(handler)),
+            backends=["http://a:8080", "http://b:8080"],
+        )
+
+        for _ in range(40):
+            client._request("GET", "/health")
+
+        assert set(hosts) == {"a", "b"}
+
+    @patch('llm_arch_sdk.client.llm_client.time.sleep')
+    def test_failing_backend_is_ejected(self, mock_sleep):
+        def handler(request):
+            if request.url.host == "a":
+                return httpx.Response(500)
+            return httpx.Response(200, json={})
+
+        client = LlmClient(
+            base_url="http://a:8080",
+            http_client=httpx.Client(transport=httpx.MockTransport(handler)),
+            backends=["http://a:8080", "http://b:8080"],
+        )
+
+        failures = 0
+        for _ in range(30):
+            try:
+                client._request("GET", "/health")
+            except LlmAPIError:
+                failures += 1
+
+        broken = client._balancer.backends[0]
+        assert broken.circuit._state.value == "open"
+        assert failures == broken.circuit.failure_threshold
+
+
+class TestLlmClientHedging:
+    def _client(self, handler, backends):
+        client = LlmClient(
+            base_url=backends[0],
+            http_client=httpx.Client(transport=httpx.MockTransport(handler)),
+            backends=backends,
+        )
+        client._hedging = HedgePolicy(HedgingSettings(enabled=True, min_samples=1, min_delay=0.01))
+        client._hedging.observe(0.01)
+        return client
+
+    def test_slow_backend_is_hedged(self):
+        def handler(request):
+            if request.url.host == "a":
+                time.sleep(0.3)
+                return httpx.Response(200, json={"from": "a"})
+            return httpx.Response(200, json={"from": "b"})
+
+        client = self._client(handler, ["http://a:8080", "http://b:8080"])
+        client._balancer.pick = Mock(side_effect=lambda exclude=(), prefer=None: next(
+            b for b in client._balancer.backends if b not in exclude
+        ))
+
+        assert client._request("POST", "/llm/completions", json={}) == {"from": "b"}
+        assert client.hedging.stats()["hedge_wins"] == 1
+
+    def test_fast_response_is_not_hedged(self):
+        hosts = []
+
+        def handler(request):
+            hosts.append(request.url.host)
+            return httpx.Response(200, json={})
+
+        client = self._client(handler, ["http://a:8080"])
+        client._hedging.observe(1.0)
+
+        client._request("POST", "/llm/completions", json={})
+
+        assert hosts == ["a"]
+        assert client.hedging.stats()["hedged"] == 0
+
+    def test_hedge_on_same_backend_drops_slot(self):
+        payloads = []
+
+        def handler(request):
+            payloads.append(json.loads(request.content))
+            if len(payloads) == 1:
+                time.sleep(0.3)
+            return httpx.Response(200, json={})
+
+        client = self._client(handler, ["http://a:8080"])
+
+        client._request("POST", "/llm/completions", json={"prompt": "hi", "id_slot": 1})
+
+        assert payloads == [{"prompt": "hi", "id_slot": 1}, {"prompt": "hi"}]
+
+    def _slow_primary(self, hosts):
+        def handler(request):
+            hosts.append(request.url.host)
+            if len(hosts) == 1:
+                time.sleep(0.1)
+            return httpx.Response(200, json={})
+        return handler
+
+    def test_no_hedge_when_alternate_circuit_rejects(self):
+        hosts = []
+        client = self._client(self._slow_primary(hosts), ["http://a:8080", "http://b:8080"])
+        client._balancer.pick = Mock(side_effect=lambda exclude=(), prefer=None: next(
+            b for b in client._balancer.backends if b not in exclude
+        ))
+        client._balancer.backends[1].circuit.allow_request = Mock(return_value=False)
+
+        client._request("POST", "/llm/completions", json={})
+
+        assert hosts == ["a"]
+
+    def test_no_hedge_without_free_permit(self):
+        hosts = []
+        client = self._client(self._slow_primary(hosts), ["http://a:8080"])
+        client._limiter = ConcurrencyLimiter(ConcurrencySettings(enabled=True, initial_limit=1))
+
+        client._request("POST", "/llm/completions", json={})
+
+        assert hosts == ["a"]
+        assert client.concurrency.in_flight == 0
+        assert client.concurrency.queue_depth == 0
+
+    def test_no_hedge_without_rate_quota(self):
+        hosts = []
+        client = self._client(self._slow_primary(hosts), ["http://a:8080"])
+        client._rate_limiter = RateLimiter(RateLimitSettings(enabled=True, requests_per_second=1))
+
+        client._request("POST", "/llm/completions", json={})
+
+        assert hosts == ["a"]
+        assert client.rate_limiter.stats()["throttled"] == 0
+
+    def test_hedge_permit_released(self):
+        hosts = []
+        client = self._client(self._slow_primary(hosts), ["http://a:8080"])
+        client._limiter = ConcurrencyLimiter(ConcurrencySettings(enabled=True, initial_limit=2))
+
+        client._request("POST", "/llm/completions", json={})
+        deadline = time.monotonic() + 2
+        while client.concurrency.in_flight and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        assert hosts == ["a", "a"]
+        assert client.concurrency.in_flight == 0
+
+    def test_hedge_pool_does_not_cap_concurrency(self):
+        def handler(request):
+            time.sleep(0.2)
+            return httpx.Response(200, json={})
+
+        client = self._client(handler, ["http://a:8080"])
+        client._hedging = HedgePolicy(HedgingSettings(enabled=True, min_samples=1, max_workers=2))
+        client._hedging.observe(5.0)
+
+        threads = [
+            threading.Thread(target=client._request, args=("POST", "/llm/completions"), kwargs={"json": {}})
+            for _ in range(16)
+        ]
+        started = time.monotonic()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        # con el pool de 2 threads tardaría 16 / 2 * 0.2 = 1.6s
+        assert time.monotonic() - started < 0.8
+
+    def test_no_hedge_when_pool_is_busy(self):
+        hosts = []
+        client = self._client(self._slow_primary(hosts), ["http://a:8080"])
+        client._hedging = HedgePolicy(HedgingSettings(enabled=True, min_samples=1, min_delay=0.01, max_workers=1))
+        client._hedging.observe(0.01)
+        client._hedge_pool()
+        client._hedge_room.acquire()
+
+        client._request("POST", "/llm/completions", json={})
+
+        assert hosts == ["a"]
+
+    def test_close_stops_hedging(self):
+        hosts = []
+        client = self._client(self._slow_primary(hosts), ["http://a:8080"])
+        executor = client._hedge_pool()
+
+        with client:
+            pass
+        client._request("POST", "/llm/completions", json={})
+
+        assert executor._shutdown
+        assert client._hedge_executor is None
+        assert hosts == ["a"]
+
+    def test_chat_is_not_hedged(self):
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            time.sleep(0.05)
+            return httpx.Response(200, json={})
+
+        client = self._client(handler, ["http://a:8080"])
+
+        client._request("POST", "/llm/chat/completions", json={})
+
+        assert len(calls) == 1
+
+
+class TestLlmClientConcurrency:
+    def _client(self, handler):
+        client = LlmClient(
+            base_url="http://localhost:8000",
+            http_client=httpx.Client(transport=httpx.MockTransport(handler)),
+        )
+        client._limiter = ConcurrencyLimiter(ConcurrencySettings(enabled=True, initial_limit=10))
+        return client
+
+    def test_permit_released_after_request(self):
+        client = self._client(lambda request: httpx.Response(
+            200, json={"content": "hi", "timings": {"prompt_ms": 1.0, "predicted_ms": 2.0}}
+        ))
+
+        client._request("POST", "/llm/completions", json={})
+
+        assert client.concurrency.in_flight == 0
+
+    @patch('llm_arch_sdk.client.llm_client.time.sleep')
+    def test_overload_shrinks_limit(self, mock_sleep):
+        client = self._client(lambda request: httpx.Response(503))
+
+        with pytest.raises(LlmAPIError):
+            client._request("POST", "/llm/completions", json={})
+
+        assert client.concurrency.limit < 10
+        assert client.concurrency.in_flight == 0
+
+
+class TestLlmClientRateLimit:
+    def test_charges_and_settles_usage(self):
+        client = LlmClient(
+            base_url="http://localhost:8000",
+            http_client=httpx.Client(transport=httpx.MockTransport(
+                lambda request: httpx.Response(200, json={"timings": {"prompt_n": 5, "predicted_n": 5}})
+            )),
+        )
+        client._rate_limiter = RateLimiter(RateLimitSettings(enabled=True, tokens_per_second=1000))
+
+        client._request("POST", "/llm/completions", json={"prompt": "hola", "n_predict": 500})
+
+        assert client.rate_limiter.stats()["tokens_available"] == pytest.approx(990, abs=5)
+
+    def test_fail_fast_does_not_send(self):
+        handler = Mock(return_value=httpx.Response(200, json={}))
+        client = LlmClient(
+            base_url="http://localhost:8000",
+            http_client=httpx.Client(transport=httpx.MockTransport(handler)),
+        )
+        client._rate_limiter = RateLimiter(RateLimitSettings(
+            enabled=True, requests_per_second=1, on_limit="fail",
+        ))
+
+        client._request("GET", "/health")
+        with pytest.raises(RateLimitExceeded):
+            client._request("GET", "/health")
+
+        assert handler.call_count == 1
+
+    def test_open_circuit_refunds_quota(self):
+        client = LlmClient(
+            base_url="http://localhost:8000",
+            http_client=httpx.Client(transport=httpx.MockTransport(lambda request: httpx.Response(200, json={}))),
+        )
+        client._rate_limiter = RateLimiter(RateLimitSettings(enabled=True, requests_per_second=1))
+        client._limiter = ConcurrencyLimiter(ConcurrencySettings(enabled=True, initial_limit=4))
+        client._balancer.backends[0].circuit.allow_request = Mock(return_value=False)
+
+        for _ in range(3):
+            with pytest.raises(CircuitBreakerOpen):
+                client._request("POST", "/llm/completions", json={})
+
+        assert client.rate_limiter.stats()["requests_available"] == pytest.approx(1)
+        assert client.rate_limiter.stats()["throttled"] == 0
+        assert client.concurrency.in_flight == 0
+        assert client.concurrency.limit == 4
+
+    def test_rejected_permit_refunds_quota(self):
+        client = LlmClient(
+            base_url="http://localhost:8000",
+            http_client=httpx.Client(transport=httpx.MockTransport(lambda request: httpx.Response(200, json={}))),
+        )
+        client._rate_limiter = RateLimiter(RateLimitSettings(enabled=True, requests_per_second=1))
+        client._limiter = ConcurrencyLimiter(ConcurrencySettings(enabled=True, initial_limit=1, max_queue=0))
+        client._limiter.acquire()
+
+        with pytest.raises(ConcurrencyLimitExceeded):
+            client._request("POST", "/llm/completions", json={})
+
+        assert client.rate_limiter.stats()["requests_available"] == pytest.approx(1)
@@ -0,0 +1,165 @@
+import os
+import time
+import multiprocessing
+from unittest.mock import Mock, patch
+from llm_arch_sdk.client.embeddings import Embeddings
+from llm_arch_sdk.client.persistent_cache import SqliteResponseCache, dumps, loads, open_persistent_cache
+from llm_arch_sdk.client.response_cache import InMemoryResponseCache, TieredResponseCache, default_response_cache
+from llm_arch_sdk.config.settings import PersistentCacheSettings, ResponseCacheSettings, _sdk_settings
+
+
+def _cache(tmp_path, **kwargs):
+    kwargs.setdefault("compaction_interval", 0)
+    return SqliteResponseCache(
+        PersistentCacheSettings(enabled=True, **kwargs),
+        path=str(tmp_path / "cache.sqlite3"),
+    )
+
+
+def _write_from_child(path, key):
+    cache = SqliteResponseCache(PersistentCacheSettings(enabled=True, compaction_interval=0), path=path)
+    cache.set(key, {"pid": os.getpid()})
+
+
+class TestSerialization:
+    def test_small_values_are_not_compressed(self):
+        blob = dumps({"a": 1}, compress_min_bytes=1024)
+
+        assert blob[:1] == b"j"
+        assert loads(blob) == {"a": 1}
+
+    def test_large_values_are_compressed(self):
+        value = {"content": "hola " * 1000}
+        blob = dumps(value, compress_min_bytes=1024)
+
+        assert blob[:1] == b"z"
+        assert len(blob) < 1000
+        assert loads(blob) == value
+
+
+class TestSqliteResponseCache:
+    def test_roundtrip(self, tmp_path):
+        cache = _cache(tmp_path)
+        cache.set("k", {"content": "hi", "timings": {"prompt_ms": 1.5}})
+
+        assert cache.get("k") == {"content": "hi", "timings": {"prompt_ms": 1.5}}
+        assert cache.get("missing") is None
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+
+    def test_file_is_private(self, tmp_path):
+        _cache(tmp_path)
+
+        assert os.stat(tmp_path / "cache.sqlite3").st_mode & 0o077 == 0
+
+    def test_expired_entries_miss(self, tmp_path):
+        cache = _cache(tmp_path, ttl_seconds=10)
+        cache.set("k", {})
+
+        with patch("llm_arch_sdk.client.persistent_cache.time.time", return_value=time.time() + 11):
+            assert cache.get("k") is None
+            assert cache.compact()["expired"] == 1
+
+    def test_shared_between_instances(self, tmp_path):
+        writer = _cache(tmp_path)
+        reader = _cache(tmp_path)
+
+        writer.set("k", {"v": 1})
+
+        assert reader.get("k") == {"v": 1}
+
+    def test_shared_between_processes(self, tmp_path):
+        path = str(tmp_path / "cache.sqlite3")
+        cache = SqliteResponseCache(PersistentCacheSettings(enabled=True, compaction_interval=0), path=path)
+        ctx = multiprocessing.get_context("spawn")
+
+        children = [ctx.Process(target=_write_from_child, args=(path, f"k{i}")) for i in range(3)]
+        for child in children:
+            child.start()
+        for child in children:
+            child.join(timeout=30)
+
+        assert all(cache.get(f"k{i}") is not None for i in range(3))
+
+    def test_compaction_evicts_least_recently_used(self, tmp_path):
+        cache = _cache(tmp_path, max_bytes=3000, compress_min_bytes=10**9)
+        with patch("llm_arch_sdk.client.persistent_cache.time.time") as clock:
+            for i in range(3):
+                clock.return_value = 1000.0 + i
+                cache.set(f"k{i}", {"content": "x" * 1000})
+
+            # k0 es el más viejo pero se lee: se conserva
+            clock.return_value = 1010.0
+            cache.get("k0")
+            result = cache.compact()
+
+            assert result["evicted"] == 1
+            assert cache.get("k0") is not None
+            assert cache.get("k1") is None
+            assert cache.get("k2") is not None
+
+    def test_sqlite_errors_are_misses(self, tmp_path):
+        cache = _cache(tmp_path)
+        cache._local.conn = Mock(**{"execute.side_effect": __import__("sqlite3").OperationalError("locked")})
+        cache._local.pid = os.getpid()
+
+        assert cache.get("k") is None
+        cache.set("k", {})
+        assert cache.errors == 2
+
+    def test_corrupt_rows_are_misses_and_deleted(self, tmp_path):
+        cache = _cache(tmp_path)
+        cache.set("k", {"v": 1})
+        cache._connect().execute("UPDATE responses SET value = ? WHERE key = 'k'", (b"z\x00truncado",))
+
+        assert cache.get("k") is None
+        assert cache.errors == 1
+        assert cache._connect().execute("SELECT COUNT(*) FROM responses").fetchone()[0] == 0
+
+    def test_pickled_rows_are_not_unpickled(self, tmp_path):
+        import pickle
+
+        cache = _cache(tmp_path)
+        cache.set("k", {})
+        blob = b"p" + pickle.dumps({"v": 1})
+        cache._connect().execute("UPDATE responses SET value = ? WHERE key = 'k'", (blob,))
+
+        with patch("pickle.loads") as unpickle:
+            assert cache.get("k") is None
+        unpickle.assert_not_called()
+
+    def test_unwritable_path_falls_back_to_memory(self, tmp_path):
+        blocker = tmp_path / "no-es-directorio"
+        blocker.write_text("")
+        path = str(blocker / "cache.sqlite3")
+
+        with patch.object(_sdk_settings.response_cache, "enabled", False), \
+                patch.object(_sdk_settings.persistent_cache, "enabled", True), \
+                patch.object(_sdk_settings.persistent_cache, "path", path):
+            cache = default_response_cache()
+
+        assert isinstance(cache, InMemoryResponseCache)
+        assert open_persistent_cache(PersistentCacheSettings(enabled=True, path=path)) is None
+
+
+class TestTieredResponseCache:
+    def test_promotes_lower_tier_hits(self, tmp_path):
+        memory = InMemoryResponseCache(ResponseCacheSettings(enabled=True))
+        disk = _cache(tmp_path)
+        tiered = TieredResponseCache(memory, disk)
+
+        disk.set("k", {"v": 1})
+
+        assert tiered.get("k") == {"v": 1}
+        assert memory.get("k") == {"v": 1}
+
+    def test_embeddings_use_disk_cache(self, tmp_path):
+        client = Mock()
+        client._request.return_value = {"data": [{"index": 0, "embedding": [0.1, 0.2]}]}
+        embeddings = Embeddings(client, cache=_cache(tmp_path))
+
+        embeddings.create(model="m", input=["hola"])
+        result = Embeddings(Mock(), cache=_cache(tmp_path)).create(model="m", input=["hola"])
+
+        assert result == client._request.return_value
+        assert client._request.call_count == 1
@@ -0,0 +1,176 @@
+import time
+import asyncio
+import httpx
+from unittest.mock import AsyncMock, Mock, patch
+from llm_arch_sdk.client.chat_completions import ChatCompletions
+from llm_arch_sdk.client.completions import Completions
+from llm_arch_sdk.client.embeddings import AsyncEmbeddings, Embeddings
+from llm_arch_sdk.client.llm_client import LlmClient
+from llm_arch_sdk.client.response_cache import InMemoryResponseCache, cache_key
+from llm_arch_sdk.config.settings import ResponseCacheSettings, _sdk_settings
+from llm_arch_sdk.models.chat_completion import ChatCompletionResult
+from llm_arch_sdk.models.completion import CompletionResult
+
+
+def _cache(**kwargs):
+    return InMemoryResponseCache(ResponseCacheSettings(enabled=True, **kwargs))
+
+
+class TestInMemoryResponseCache:
+    def test_hit_and_miss(self):
+        cache = _cache()
+
+        assert cache.get("k") is None
+        cache.set("k", {"content": "hi"})
+
+        assert cache.get("k") == {"content": "hi"}
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+
+    def test_lru_eviction(self):
+        cache = _cache(max_entries=2)
+        cache.set("a", {})
+        cache.set("b", {})
+        cache.get("a")
+        cache.set("c", {})
+
+        assert cache.get("b") is None
+        assert cache.get("a") == {}
+        assert cache.stats()["evictions"] == 1
+
+    def test_ttl(self):
+        cache = _cache(ttl_seconds=10)
+        cache.set("k", {})
+
+        with patch("llm_arch_sdk.client.response_cache.time.monotonic", return_value=time.monotonic() + 11):
+            assert cache.get("k") is None
+
+        assert cache.stats()["expirations"] == 1
+
+
+class TestCacheKey:
+    def test_only_deterministic(self):
+        cache = _cache()
+
+        assert cache_key(cache, "/c", {"temperature": 0}) is not None
+        assert cache_key(cache, "/c", {"temperature": 0.7}) is None
+
+    def test_opt_out_and_disabled(self):
+        assert cache_key(_cache(), "/c", {"temperature": 0}, use_cache=False) is None
+        assert cache_key(None, "/c", {"temperature": 0}) is None
+
+    def test_model_is_part_of_key(self):
+        cache = _cache()
+
+        assert cache_key(cache, "/c", {"model": "a", "temperature": 0}) != \
+            cache_key(cache, "/c", {"model": "b", "temperature": 0})
+
+    def test_scope_is_part_of_key(self):
+        cache = _cache()
+
+        assert cache_key(cache, "/c", {"temperature": 0}, scope="http://a") != \
+            cache_key(cache, "/c", {"temperature": 0}, scope="http://b")
+
+    def test_clients_on_different_servers_do_not_share_entries(self):
+        shared = _cache()
+
+        def client_for(base_url):
+            def handler(request):
+                return httpx.Response(200, json={"content": f"desde {request.url.host}", "stop": True})
+
+            return LlmClient(
+                base_url=base_url,
+                http_client=httpx.Client(transport=httpx.MockTransport(handler)),
+                response_cache=shared,
+            )
+
+        with patch.object(_sdk_settings.llm, "base_urls", []):
+            first = client_for("http://server-a:8080")
+            second = client_for("http://server-b:8080")
+
+        assert first.completions.create(prompt="hola", temperature=0, n_predict=4).content == "desde server-a"
+        assert second.completions.create(prompt="hola", temperature=0, n_predict=4).content == "desde server-b"
+        assert first.completions.create(prompt="hola", temperature=0, n_predict=4).content == "desde server-a"
+        assert shared.stats()["entries"] == 2
+
+
+class TestResourcesUseCache:
+    def test_completions_hit_returns_typed_result(self):
+        client = Mock()
+        client._request.return_value = {"content": "positivo", "stop": True}
+        completions = Completions(client, cache=_cache())
+
+        first = completions.create(prompt="clasifica", temperature=0, n_predict=4)
+        second = completions.create(prompt="clasifica", temperature=0, n_predict=4)
+
+        assert client._request.call_count == 1
+        assert isinstance(second, CompletionResult)
+        assert second == first
+        assert second is not first
+
+    def test_completions_non_deterministic_not_cached(self):
+        client = Mock()
+        client._request.return_value = {"content": "x"}
+        completions = Completions(client, cache=_cache())
+
+        completions.create(prompt="p", temperature=0.8, n_predict=4)
+        completions.create(prompt="p", temperature=0.8, n_predict=4)
+
+        assert client._request.call_count == 2
+
+    def test_completions_opt_out(self):
+        client = Mock()
+        client._request.return_value = {"content": "x"}
+        completions = Completions(client, cache=_cache())
+
+        completions.create(prompt="p", temperature=0, n_predict=4)
+        completions.create(prompt="p", temperature=0, n_predict=4, use_cache=False)
+
+        assert client._request.call_count == 2
+
+    def test_chat_hit(self):
+        client = Mock()
+        client._request.return_value = {
+            "id": "c1",
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": "hola"}, "finish_reason": "stop"}],
+        }
+        chat = ChatCompletions(client, cache=_cache())
+        messages = [{"role": "user", "content": "hi"}]
+
+        chat.create(model="m", messages=messages, temperature=0)
+        result = chat.create(model="m", messages=messages, temperature=0)
+
+        assert client._request.call_count == 1
+        assert isinstance(result, ChatCompletionResult)
+        assert result.choices[0].message.content == "hola"
+
+    def test_embeddings_hit_is_not_shared_with_caller(self):
+        client = Mock()
+        client._request.return_value = {"data": [{"index": 0, "embedding": [1.0, 2.0]}]}
+        embeddings = Embeddings(client, cache=_cache())
+
+        first = embeddings.create(model="m", input=["hola"])
+        first["data"][0]["embedding"][0] = 99.0
+        second = embeddings.create(model="m", input=["hola"])
+        second["data"][0]["embedding"][0] = 42.0
+        third = embeddings.create(model="m", input=["hola"])
+
+        assert client._request.call_count == 1
+        assert third["data"][0]["embedding"] == [1.0, 2.0]
+
+    def test_async_embeddings_hit_is_not_shared_with_caller(self):
+        client = Mock()
+        client._request = AsyncMock(return_value={"data": [{"index": 0, "embedding": [1.0, 2.0]}]})
+        embeddings = AsyncEmbeddings(client, cache=_cache())
+
+        async def run():
+            first = await embeddings.create(model="m", input=["hola"])
+            first["data"][0]["embedding"][0] = 99.0
+            second = await embeddings.create(model="m", input=["hola"])
+            second["data"][0]["embedding"][0] = 42.0
+            return await embeddings.create(model="m", input=["hola"])
+
+        third = asyncio.run(run())
+
+        assert client._request.call_count == 1
+        assert third["data"][0]["embedding"] == [1.0, 2.0]
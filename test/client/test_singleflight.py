@@ -0,0 +1,208 @@
+import asyncio
+import threading
+import time
+import pytest
+from unittest.mock import AsyncMock, Mock
+from llm_arch_sdk.client.completions import AsyncCompletions, Completions
+from llm_arch_sdk.client.embeddings import Embeddings
+from llm_arch_sdk.client.singleflight import (
+    AsyncSingleFlight,
+    SingleFlight,
+    is_deterministic,
+    request_key,
+)
+
+
+class TestHelpers:
+    def test_key_ignores_key_order(self):
+        assert request_key("/x", {"a": 1, "b": 2}) == request_key("/x", {"b": 2, "a": 1})
+        assert request_key("/x", {"a": 1}) != request_key("/y", {"a": 1})
+
+    def test_key_includes_scope(self):
+        assert request_key("/x", {"a": 1}, "http://a") != request_key("/x", {"a": 1}, "http://b")
+
+    @pytest.mark.parametrize("payload, expected", [
+        ({"temperature": 0}, True),
+        ({"temperature": 0.0}, True),
+        ({"temperature": 0.7}, False),
+        ({"temperature": 0.7, "seed": 42}, True),
+        ({"temperature": 0.7, "seed": -1}, False),
+        ({"top_k": 1}, True),
+        ({"input": ["a"]}, True),
+        ({}, False),
+    ])
+    def test_is_deterministic(self, payload, expected):
+        assert is_deterministic(payload) is expected
+
+
+def _slow(result, delay=0.05):
+    def fn():
+        time.sleep(delay)
+        return result
+    return Mock(side_effect=fn)
+
+
+class TestSingleFlight:
+    def test_concurrent_identical_calls_share_one(self):
+        flight = SingleFlight(enabled=True)
+        fn = _slow({"ok": True})
+        results = []
+
+        threads = [
+            threading.Thread(target=lambda: results.append(flight.run("/x", {"temperature": 0}, fn)))
+            for _ in range(8)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert fn.call_count == 1
+        assert len(results) == 8
+        assert all(r is results[0] for r in results)
+        assert flight.stats() == {"in_flight": 0, "leaders": 1, "shared": 7}
+
+    def test_non_deterministic_not_coalesced(self):
+        flight = SingleFlight(enabled=True)
+        fn = _slow({}, delay=0.02)
+
+        threads = [
+            threading.Thread(target=lambda: flight.run("/x", {"temperature": 0.8}, fn))
+            for _ in range(3)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert fn.call_count == 3
+
+    def test_error_propagates_to_followers(self):
+        flight = SingleFlight(enabled=True)
+
+        def boom():
+            time.sleep(0.05)
+            raise RuntimeError("boom")
+
+        errors = []
+
+        def call():
+            try:
+                flight.run("/x", {"temperature": 0}, boom)
+            except RuntimeError as exc:
+                errors.append(exc)
+
+        threads = [threading.Thread(target=call) for _ in range(3)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert len(errors) == 3
+        assert flight.stats()["in_flight"] == 0
+
+    def test_sequential_calls_are_not_cached(self):
+        flight = SingleFlight(enabled=True)
+        fn = Mock(return_value={})
+
+        flight.run("/x", {"temperature": 0}, fn)
+        flight.run("/x", {"temperature": 0}, fn)
+
+        assert fn.call_count == 2
+
+
+class TestAsyncSingleFlight:
+    def test_concurrent_tasks_share_one(self):
+        flight = AsyncSingleFlight(enabled=True)
+        calls = []
+
+        async def fetch():
+            calls.append(1)
+            await asyncio.sleep(0.02)
+            return {"ok": True}
+
+        async def run():
+            return await asyncio.gather(*[
+                flight.run("/x", {"input": ["a"]}, fetch) for _ in range(5)
+            ])
+
+        results = asyncio.run(run())
+
+        assert len(calls) == 1
+        assert all(r is results[0] for r in results)
+
+    def test_follower_retries_when_leader_cancelled(self):
+        flight = AsyncSingleFlight(enabled=True)
+        calls = []
+
+        async def fetch():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return len(calls)
+
+        async def run():
+            leader = asyncio.ensure_future(flight.run("/x", {"temperature": 0}, fetch))
+            await asyncio.sleep(0)
+            follower = asyncio.ensure_future(flight.run("/x", {"temperature": 0}, fetch))
+            await asyncio.sleep(0.01)
+            leader.cancel()
+            return await follower
+
+        assert asyncio.run(run()) == 2
+
+
+class TestResourcesUseSingleFlight:
+    def test_completions(self):
+        client = Mock()
+        client._request.side_effect = lambda *a, **kw: time.sleep(0.05) or {"content": "x"}
+        completions = Completions(client)
+        results = []
+
+        threads = [
+            threading.Thread(target=lambda: results.append(
+                completions.create(prompt="clasifica", temperature=0, n_predict=4)
+            ))
+            for _ in range(4)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert client._request.call_count == 1
+        assert all(r is results[0] for r in results)
+
+    def test_async_completions(self):
+        client = Mock()
+
+        async def request(*args, **kwargs):
+            await asyncio.sleep(0.02)
+            return {"content": "x"}
+
+        client._request = AsyncMock(side_effect=request)
+        completions = AsyncCompletions(client)
+
+        async def run():
+            return await asyncio.gather(*[
+                completions.create(prompt="clasifica", temperature=0, n_predict=4) for _ in range(3)
+            ])
+
+        asyncio.run(run())
+
+        assert client._request.await_count == 1
+
+    def test_embeddings(self):
+        client = Mock()
+        client._request.side_effect = lambda *a, **kw: time.sleep(0.05) or {"data": []}
+        embeddings = Embeddings(client)
+
+        threads = [
+            threading.Thread(target=lambda: embeddings.create(model="m", input=["a"]))
+            for _ in range(3)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert client._request.call_count == 1
@@ -0,0 +1,155 @@
+import json
+import httpx
+from unittest.mock import patch
+from llm_arch_sdk.client.llm_client import LlmClient
+from llm_arch_sdk.client.slot_affinity import SlotAffinity, affinity_kwargs
+from llm_arch_sdk.config.settings import SlotAffinitySettings
+
+
+class TestSlotAffinity:
+    def test_first_request_only_enables_cache_prompt(self):
+        affinity = SlotAffinity(SlotAffinitySettings(enabled=True))
+        kwargs = {"json": {"prompt": "Eres un asistente. Hola"}}
+
+        key, prefer, new_kwargs = affinity.prepare("/llm/completions", kwargs)
+
+        assert key is not None
+        assert prefer is None
+        assert new_kwargs["json"] == {"prompt": "Eres un asistente. Hola", "cache_prompt": True}
+        # no muta el payload del caller
+        assert kwargs["json"] == {"prompt": "Eres un asistente. Hola"}
+
+    def test_follow_up_reuses_backend_and_slot(self):
+        affinity = SlotAffinity(SlotAffinitySettings(enabled=True, prefix_chars=10))
+        key, _, _ = affinity.prepare("/llm/completions", {"json": {"prompt": "Sistema...: pregunta 1"}})
+        affinity.record(key, "http://a", {"id_slot": 3, "tokens_cached": 0, "tokens_evaluated": 20})
+
+        key2, prefer, kwargs = affinity.prepare("/llm/completions", {"json": {"prompt": "Sistema...: pregunta 2"}})
+
+        assert key2 == key
+        assert prefer == "http://a"
+        assert "id_slot" not in kwargs["json"]
+        assert kwargs["json"]["cache_prompt"] is True
+        assert affinity.pin(key2, "http://a", kwargs)["json"]["id_slot"] == 3
+
+    def test_slot_is_not_pinned_on_another_backend(self):
+        affinity = SlotAffinity(SlotAffinitySettings(enabled=True))
+        affinity.record("k", "http://b", {"id_slot": 3})
+
+        _, prefer, kwargs = affinity.prepare("/llm/completions", {"json": {"prompt": "x"}}, "k")
+
+        assert prefer == "http://b"
+        assert affinity.pin("k", "http://a", kwargs) == kwargs
+        assert "id_slot" not in kwargs["json"]
+
+    def test_explicit_affinity_key(self):
+        affinity = SlotAffinity(SlotAffinitySettings(enabled=True))
+        affinity.record("conv-1", "http://b", {"id_slot": 1})
+
+        _, prefer, kwargs = affinity.prepare("/llm/chat/completions", {"json": {"messages": []}}, "conv-1")
+
+        assert prefer == "http://b"
+        assert affinity.pin("conv-1", "http://b", kwargs)["json"]["id_slot"] == 1
+
+    def test_pin_slot_disabled(self):
+        affinity = SlotAffinity(SlotAffinitySettings(enabled=True, pin_slot=False))
+        affinity.record("k", "http://a", {"id_slot": 2})
+
+        _, prefer, kwargs = affinity.prepare("/llm/completions", {"json": {"prompt": "x"}}, "k")
+
+        assert prefer == "http://a"
+        assert "id_slot" not in affinity.pin("k", "http://a", kwargs)["json"]
+
+    def test_ignores_other_endpoints(self):
+        affinity = SlotAffinity(SlotAffinitySettings(enabled=True))
+        kwargs = {"json": {"input": ["hola"]}}
+        assert affinity.prepare("/v1/embeddings", kwargs) == (None, None, kwargs)
+
+    @patch('llm_arch_sdk.client.slot_affinity.time.monotonic')
+    def test_entries_expire(self, mock_monotonic):
+        mock_monotonic.return_value = 100.0
+        affinity = SlotAffinity(SlotAffinitySettings(enabled=True, ttl_seconds=10))
+        affinity.record("k", "http://a", {"id_slot": 0})
+
+        mock_monotonic.return_value = 111.0
+        assert affinity.lookup("k") is None
+
+    def test_lru_eviction(self):
+        affinity = SlotAffinity(SlotAffinitySettings(enabled=True, max_entries=2))
+        for key in ("a", "b", "c"):
+            affinity.record(key, "http://a", {"id_slot": 0})
+
+        assert affinity.stats()["entries"] == 2
+        assert affinity.lookup("a") is None
+
+    def test_hit_ratio_from_completion_and_chat(self):
+        affinity = SlotAffinity(SlotAffinitySettings(enabled=True))
+        affinity.record("a", "http://a", {"tokens_cached": 80, "tokens_evaluated": 100})
+        affinity.record("b", "http://a", {"timings": {"cache_n": 20, "prompt_n": 80}})
+
+        assert affinity.tokens_cached == 100
+        assert affinity.tokens_evaluated == 200
+        assert affinity.hit_ratio == 0.5
+
+    def test_affinity_kwargs(self):
+        assert affinity_kwargs(None) == {}
+        assert affinity_kwargs("k") == {"affinity_key": "k"}
+
+
+class TestLlmClientSlotAffinity:
+    @patch('llm_arch_sdk.client.llm_client._sdk_settings.slot_affinity', SlotAffinitySettings(enabled=True))
+    def test_routes_follow_ups_to_same_backend_and_slot(self):
+        seen = []
+
+        def handler(request):
+            body = json.loads(request.content)
+            seen.append((request.url.host, body.get("id_slot")))
+            return httpx.Response(200, json={
+                "content": "ok",
+                "id_slot": 5,
+                "tokens_cached": 90 if body.get("id_slot") is not None else 0,
+                "tokens_evaluated": 100,
+            })
+
+        client = LlmClient(
+            base_url="http://a:8080",
+            http_client=httpx.Client(transport=httpx.MockTransport(handler)),
+            backends=["http://a:8080", "http://b:8080", "http://c:8080"],
+        )
+
+        for _ in range(5):
+            client.completions.create(prompt="sistema largo", temperature=0.0, n_predict=1)
+
+        first_host = seen[0][0]
+        assert all(host == first_host for host, _ in seen)
+        assert [slot for _, slot in seen] == [None, 5, 5, 5, 5]
+        assert client.slot_affinity.stats()["hits"] == 4
+        assert client.slot_affinity.hit_ratio == 360 / 500
+
+    @patch('llm_arch_sdk.client.llm_client._sdk_settings.slot_affinity', SlotAffinitySettings(enabled=True))
+    def test_slot_not_pinned_when_preferred_backend_is_ejected(self):
+        seen = []
+
+        def handler(request):
+            body = json.loads(request.content)
+            seen.append((request.url.host, body.get("id_slot")))
+            return httpx.Response(200, json={"content": "ok", "id_slot": 3})
+
+        client = LlmClient(
+            base_url="http://a:8080",
+            http_client=httpx.Client(transport=httpx.MockTransport(handler)),
+            backends=["http://a:8080", "http://b:8080"],
+        )
+        a, b = client._balancer.backends
+        a.circuit.is_available = lambda: False
+        client.completions.create(prompt="sistema largo", temperature=0.0, n_predict=1)
+
+        del a.circuit.is_available
+        b.circuit.is_available = lambda: False
+        client.completions.create(prompt="sistema largo", temperature=0.1, n_predict=1)
+
+        assert seen == [("b", None), ("a", None)]
+
+    def test_disabled_by_default(self):
+        client = LlmClient(base_url="http://a:8080", http_client=httpx.Client())
+        assert client.slot_affinity is None
@@ -0,0 +1,94 @@
+import base64
+import pytest
+from unittest.mock import Mock
+from llm_arch_sdk.client.embedding_cache import EmbeddingCache
+from llm_arch_sdk.client.embeddings import Embeddings
+from llm_arch_sdk.config.settings import EmbeddingCacheSettings
+from llm_arch_sdk.models.embedding import EmbeddingResult
+
+np = pytest.importorskip("numpy")
+
+
+def _b64(values):
+    return base64.b64encode(np.asarray(values, dtype="<f4").tobytes()).decode()
+
+
+class TestEmbeddingResult:
+    def test_from_float_lists(self):
+        result = EmbeddingResult.from_dict({
+            "model": "m",
+            "data": [
+                {"index": 1, "embedding": [0.4, 0.5, 0.6]},
+                {"index": 0, "embedding": [0.1, 0.2, 0.3]},
+            ],
+            "usage": {"prompt_tokens": 4, "total_tokens": 4},
+        })
+
+        assert result.vectors.dtype == np.float32
+        assert result.vectors.flags["C_CONTIGUOUS"]
+        assert result.vectors.shape == (2, 3)
+        assert len(result) == 2
+        assert result.dimensions == 3
+        np.testing.assert_allclose(result.vectors[0], [0.1, 0.2, 0.3], rtol=1e-6)
+        assert result.usage.total_tokens == 4
+
+    def test_from_base64(self):
+        result = EmbeddingResult.from_dict({
+            "data": [
+                {"index": 0, "embedding": _b64([1.0, 2.0])},
+                {"index": 1, "embedding": _b64([3.0, 4.0])},
+            ],
+        })
+
+        assert result.vectors.dtype == np.float32
+        assert result.vectors.flags["WRITEABLE"]
+        assert result.tolist() == [[1.0, 2.0], [3.0, 4.0]]
+        assert result.usage is None
+
+    def test_mixed_formats(self):
+        result = EmbeddingResult.from_dict({
+            "data": [{"index": 0, "embedding": _b64([1.0, 2.0])}, {"index": 1, "embedding": [3.0, 4.0]}],
+        })
+
+        assert result.tolist() == [[1.0, 2.0], [3.0, 4.0]]
+
+    def test_empty(self):
+        assert EmbeddingResult.from_dict({"data": []}).vectors.shape == (0, 0)
+
+    def test_ragged_dimensions_raise(self):
+        with pytest.raises(ValueError):
+            EmbeddingResult.from_dict({
+                "data": [{"index": 0, "embedding": _b64([1.0])}, {"index": 1, "embedding": _b64([1.0, 2.0])}],
+            })
+
+
+class TestEmbeddingsAsArray:
+    def test_base64_request(self):
+        client = Mock()
+        client._request.return_value = {"data": [{"index": 0, "embedding": _b64([0.5, 0.25])}]}
+        embeddings = Embeddings(client)
+
+        result = embeddings.create(model="m", input=["a"], encoding_format="base64", as_array=True)
+
+        client._request.assert_called_once_with(
+            "POST", "/v1/embeddings", json={"model": "m", "input": ["a"], "encoding_format": "base64"},
+        )
+        assert result.tolist() == [[0.5, 0.25]]
+
+    def test_text_cache_keeps_formats_apart(self):
+        client = Mock()
+        client._request.side_effect = lambda method, endpoint, json: {
+            "data": [{
+                "index": 0,
+                "embedding": _b64([1.0]) if json.get("encoding_format") == "base64" else [1.0],
+            }],
+        }
+        cache = EmbeddingCache(EmbeddingCacheSettings(enabled=True))
+        embeddings = Embeddings(client, text_cache=cache)
+
+        floats = embeddings.create(model="m", input=["a"])
+        encoded = embeddings.create(model="m", input=["a"], encoding_format="base64")
+
+        assert floats["data"][0]["embedding"] == [1.0]
+        assert isinstance(encoded["data"][0]["embedding"], str)
+        assert client._request.call_count == 2
@@ -1,3 +1,5 @@
+import pytest
+from array import array
 from llm_arch_sdk.models.chat_completion import ChatMessage, ChatChoice, ChatCompletionResult
 from llm_arch_sdk.models.completion import CompletionResult
 from llm_arch_sdk.models.usage import Usage
@@ -110,6 +112,71 @@ class TestCompletionModels:
         assert result.tokens_predicted == 15
 
 
+class TestCompactModels:
+    DATA = {
+        "index": 0,
+        "content": "Response text",
+        "model": "llama-7b",
+        "stop": True,
+        "tokens_predicted": 3,
+        "tokens_evaluated": 5,
+        "prompt": "Test prompt",
+        "tokens": [10, 20, 30],
+        "generation_settings": {"seed": 1, "temperature": 0.5},
+        "timings": {"prompt_n": 5, "predicted_n": 3},
+    }
+
+    def test_models_are_slotted(self):
+        result = CompletionResult.from_dict(self.DATA)
+
+        assert not hasattr(result, "__dict__")
+        with pytest.raises(AttributeError):
+            result.extra = 1
+
+    def test_tokens_stored_as_int_array(self):
+        result = CompletionResult.from_dict(self.DATA)
+
+        assert isinstance(result.tokens, array)
+        assert result.tokens.typecode == "i"
+        assert list(result.tokens) == [10, 20, 30]
+
+    def test_sub_models_built_on_first_access(self):
+        result = CompletionResult.from_dict(self.DATA)
+        stored = CompletionResult.generation_settings.slot
+
+        assert isinstance(stored.__get__(result), dict)
+
+        assert result.generation_settings.temperature == 0.5
+        assert isinstance(stored.__get__(result), GenerationSettings)
+        assert result.generation_settings is result.generation_settings
+
+        assert isinstance(result.timings, Timings)
+        assert result.timings.prompt_n == 5
+
+    def test_lean_drops_prompt_and_generation_settings(self):
+        result = CompletionResult.from_dict(self.DATA, lean=True)
+
+        assert result.prompt is None
+        assert result.generation_settings is None
+        assert result.content == "Response text"
+        assert result.timings.predicted_n == 3
+
+    def test_drop_echo(self):
+        result = CompletionResult.from_dict(self.DATA).drop_echo()
+
+        assert result == CompletionResult.from_dict(self.DATA, lean=True)
+
+    def test_chat_usage_is_lazy(self):
+        result = ChatCompletionResult.from_dict({
+            "id": "x", "model": "m", "created": 1, "choices": [],
+            "usage": {"prompt_tokens": 1, "completion_tokens": 2, "total_tokens": 3},
+        })
+
+        assert isinstance(result.usage, Usage)
+        assert result.usage.total_tokens == 3
+        assert result.timings is None
+
+
 class TestUsage:
     def test_usage_from_dict(self):
         data = {
@@ -1,5 +1,8 @@
 import time
+import threading
 from unittest.mock import patch
+
+import pytest
 from llm_arch_sdk.transport.circuit_breaker import CircuitBreaker, CircuitBreakerOpen, CircuitState
 
 
@@ -113,4 +116,117 @@ class TestCircuitBreaker:
         cb._state = CircuitState.HALF_OPEN
         cb.record_failure()
         assert cb._failure_count == 1
-        assert cb._state == CircuitState.HALF_OPEN
\ No newline at end of file
+        assert cb._state == CircuitState.OPEN
+
+
+class TestSlidingWindow:
+    def test_failure_rate_needs_minimum_volume(self):
+        cb = CircuitBreaker(failure_threshold=100, minimum_requests=10, failure_rate_threshold=0.5)
+        for _ in range(4):
+            cb.record_failure()
+            cb.record_success()
+        cb.record_failure()
+        assert cb._state == CircuitState.CLOSED  # 5/9 fallos, volumen insuficiente
+
+        cb.record_failure()
+        assert cb._state == CircuitState.OPEN  # 6/10
+
+    def test_low_failure_rate_stays_closed(self):
+        cb = CircuitBreaker(failure_threshold=100, minimum_requests=10, failure_rate_threshold=0.5)
+        for _ in range(20):
+            cb.record_success()
+            cb.record_success()
+            cb.record_failure()
+        assert cb._state == CircuitState.CLOSED
+        assert cb.failure_rate() == pytest.approx(1 / 3)
+
+    def test_old_buckets_leave_the_window(self):
+        cb = CircuitBreaker(failure_threshold=100, window_seconds=0.2, window_buckets=2)
+        cb.record_failure()
+        assert cb.failure_rate() == 1.0
+
+        time.sleep(0.25)
+        assert cb.failure_rate() == 0.0
+
+    def test_failures_while_open_do_not_extend_it(self):
+        cb = CircuitBreaker(failure_threshold=1)
+        cb.record_failure()
+        open_until = cb._open_until
+
+        cb.record_failure()
+        assert cb._open_until == open_until
+
+    def test_concurrent_records_are_not_lost(self):
+        cb = CircuitBreaker(failure_threshold=10**6, minimum_requests=10**6)
+
+        def worker():
+            for _ in range(1000):
+                cb.record_failure()
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert cb._failure_count == 8000
+
+
+class TestHalfOpenProbes:
+    def _half_open(self, **kwargs):
+        cb = CircuitBreaker(**kwargs)
+        cb._state = CircuitState.OPEN
+        cb._open_until = time.time() - 1
+        return cb
+
+    def test_probes_are_capped_under_contention(self):
+        cb = self._half_open(half_open_max_probes=2)
+        barrier = threading.Barrier(50)
+        allowed = []
+
+        def caller():
+            barrier.wait()
+            allowed.append(cb.allow_request())
+
+        threads = [threading.Thread(target=caller) for _ in range(50)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert allowed.count(True) == 2
+        assert cb._state == CircuitState.HALF_OPEN
+        assert cb.is_available() is False
+
+    def test_finished_probe_frees_its_slot(self):
+        cb = self._half_open(half_open_success=2)
+        assert cb.allow_request() is True
+        assert cb.allow_request() is False
+
+        cb.record_success()
+        assert cb.allow_request() is True
+
+        cb.record_success()
+        assert cb._state == CircuitState.CLOSED
+        assert cb.failure_rate() == 0.0
+
+    def test_failed_probe_reopens_after_rate_trip(self):
+        # abrió por tasa; la ventana ya no llega a minimum_requests ni a failure_threshold
+        cb = self._half_open(failure_threshold=100, minimum_requests=10, half_open_max_probes=2)
+        assert cb.allow_request() is True
+
+        cb.record_failure()
+
+        assert cb._state == CircuitState.OPEN
+        assert cb._open_until > time.time()
+        assert cb.allow_request() is False
+
+    def test_abandoned_probe_expires(self):
+        cb = self._half_open()
+        assert cb.allow_request() is True
+        assert cb.allow_request() is False
+
+        cb._probes_expire_at = time.monotonic() - 1
+        assert cb.is_available() is True
+        assert cb.allow_request() is True
+
@@ -0,0 +1,146 @@
+import asyncio
+import threading
+import time
+import pytest
+from llm_arch_sdk.config.settings import ConcurrencySettings
+from llm_arch_sdk.transport.concurrency import ConcurrencyLimitExceeded, ConcurrencyLimiter
+
+
+def _limiter(**kwargs):
+    return ConcurrencyLimiter(ConcurrencySettings(enabled=True, **kwargs))
+
+
+class TestConcurrencyLimiter:
+    def test_acquire_and_release(self):
+        limiter = _limiter(initial_limit=2)
+
+        permit = limiter.acquire()
+        assert limiter.in_flight == 1
+
+        permit.release()
+        permit.release()
+        assert limiter.in_flight == 0
+
+    def test_fast_fail_without_queue(self):
+        limiter = _limiter(initial_limit=1, max_queue=0)
+        limiter.acquire()
+
+        with pytest.raises(ConcurrencyLimitExceeded):
+            limiter.acquire()
+        assert limiter.stats()["rejected"] == 1
+
+    def test_try_acquire_does_not_queue(self):
+        limiter = _limiter(initial_limit=1)
+        permit = limiter.try_acquire()
+
+        assert limiter.try_acquire() is None
+        assert limiter.queue_depth == 0
+
+        permit.cancel()
+        assert limiter.in_flight == 0
+        assert limiter.limit == 1
+
+    def test_queue_timeout(self):
+        limiter = _limiter(initial_limit=1, queue_timeout=0.01)
+        limiter.acquire()
+
+        with pytest.raises(ConcurrencyLimitExceeded):
+            limiter.acquire()
+        assert limiter.queue_depth == 0
+
+    def test_release_hands_slot_to_waiting_thread(self):
+        limiter = _limiter(initial_limit=1)
+        first = limiter.acquire()
+        acquired = []
+
+        worker = threading.Thread(target=lambda: acquired.append(limiter.acquire()))
+        worker.start()
+        while limiter.queue_depth == 0:
+            time.sleep(0.001)
+
+        first.release()
+        worker.join(timeout=1)
+
+        assert acquired[0].queued
+        assert limiter.in_flight == 1
+
+    def test_thread_release_wakes_async_waiter(self):
+        limiter = _limiter(initial_limit=1)
+        first = limiter.acquire()
+
+        async def run():
+            threading.Timer(0.02, first.release).start()
+            return await limiter.acquire_async()
+
+        permit = asyncio.run(run())
+
+        assert permit.queued
+        assert limiter.in_flight == 1
+
+    def test_cancelled_async_waiter_leaves_queue(self):
+        limiter = _limiter(initial_limit=1)
+        limiter.acquire()
+
+        async def run():
+            task = asyncio.ensure_future(limiter.acquire_async())
+            await asyncio.sleep(0.01)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+        asyncio.run(run())
+
+        assert limiter.queue_depth == 0
+        assert limiter.in_flight == 1
+
+    def test_overload_reduces_limit(self):
+        limiter = _limiter(initial_limit=10, backoff_ratio=0.5)
+
+        permit = limiter.acquire()
+        permit.drop()
+        permit.release()
+
+        assert limiter.limit == 5
+
+    def test_latency_inflation_reduces_limit(self):
+        limiter = _limiter(initial_limit=20, smoothing=1.0)
+        fast = {"prompt_ms": 10.0, "predicted_ms": 90.0, "predicted_n": 9}
+
+        limiter._in_flight = 20
+        limiter._update_limit_locked(0.1, fast, dropped=False)
+        # la misma generación tarda 4x: cola en el servidor
+        limiter._update_limit_locked(0.4, fast, dropped=False)
+
+        assert limiter.limit < 20
+
+    def test_stable_latency_grows_limit_under_demand(self):
+        limiter = _limiter(initial_limit=4, smoothing=1.0)
+        limiter._in_flight = 4
+
+        for _ in range(3):
+            limiter._update_limit_locked(0.1, None, dropped=False)
+
+        assert limiter.limit > 4
+
+    def test_idle_does_not_grow_limit(self):
+        limiter = _limiter(initial_limit=4, smoothing=1.0)
+
+        for _ in range(3):
+            limiter._update_limit_locked(0.1, None, dropped=False)
+
+        assert limiter.limit == 4
+
+    def test_sample_normalizes_by_tokens(self):
+        short = ConcurrencyLimiter._sample(0.1, {"prompt_ms": 0, "predicted_ms": 100.0, "predicted_n": 10})
+        long = ConcurrencyLimiter._sample(1.0, {"prompt_ms": 0, "predicted_ms": 1000.0, "predicted_n": 100})
+
+        assert short == long == ("timings", 10.0)
+
+    def test_limit_bounds(self):
+        limiter = _limiter(initial_limit=2, min_limit=2, backoff_ratio=0.1)
+
+        permit = limiter.acquire()
+        permit.drop()
+        permit.release()
+
+        assert limiter.limit == 2
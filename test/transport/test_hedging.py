@@ -0,0 +1,75 @@
+from llm_arch_sdk.config.settings import HedgingSettings
+from llm_arch_sdk.transport.hedging import HedgePolicy, LatencyTracker, without_slot
+
+
+class TestLatencyTracker:
+    def test_empty(self):
+        assert LatencyTracker(window=10).percentile(0.95) is None
+
+    def test_percentile(self):
+        tracker = LatencyTracker(window=100)
+        for i in range(1, 101):
+            tracker.observe(i / 100)
+
+        assert tracker.percentile(0.5) == 0.5
+        assert tracker.percentile(0.95) == 0.95
+
+    def test_window_drops_old_samples(self):
+        tracker = LatencyTracker(window=3)
+        for value in (10.0, 1.0, 1.0, 1.0):
+            tracker.observe(value)
+
+        assert len(tracker) == 3
+        assert tracker.percentile(1.0) == 1.0
+
+
+class TestHedgePolicy:
+    def _policy(self, **kwargs):
+        return HedgePolicy(HedgingSettings(enabled=True, **kwargs))
+
+    def test_no_delay_without_history(self):
+        policy = self._policy(min_samples=5)
+        policy.observe(0.2)
+
+        assert policy.delay() is None
+
+    def test_delay_uses_percentile(self):
+        policy = self._policy(min_samples=1, percentile=0.5, min_delay=0.0)
+        for value in (0.1, 0.2, 0.3):
+            policy.observe(value)
+
+        assert policy.delay() == 0.2
+
+    def test_delay_has_floor(self):
+        policy = self._policy(min_samples=1, min_delay=0.05)
+        policy.observe(0.001)
+
+        assert policy.delay() == 0.05
+
+    def test_budget_limits_hedges(self):
+        policy = self._policy(max_ratio=0.1, window=100)
+
+        assert policy.try_hedge()
+        assert not policy.try_hedge()
+
+        for _ in range(11):
+            policy.delay()
+        assert policy.try_hedge()
+        assert policy.stats()["hedged"] == 2
+
+    def test_applies_only_to_completions_and_embeddings(self):
+        policy = self._policy()
+
+        assert policy.applies_to("/llm/completions")
+        assert policy.applies_to("/v1/embeddings")
+        assert not policy.applies_to("/llm/chat/completions")
+        assert not policy.applies_to("/health")
+
+
+def test_without_slot_drops_id_slot():
+    kwargs = {"json": {"prompt": "hi", "id_slot": 2}, "timeout": 5}
+
+    result = without_slot(kwargs)
+
+    assert result == {"json": {"prompt": "hi"}, "timeout": 5}
+    assert kwargs["json"]["id_slot"] == 2
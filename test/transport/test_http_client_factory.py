@@ -0,0 +1,68 @@
+import httpx
+import pytest
+from unittest.mock import patch
+from llm_arch_sdk.config.settings import _sdk_settings
+from llm_arch_sdk.transport.http_client_factory import HttpClientFactory
+
+
+@pytest.fixture
+def transport_settings():
+    original = dict(vars(_sdk_settings.transport))
+    yield _sdk_settings.transport
+    vars(_sdk_settings.transport).update(original)
+
+
+class TestHttpClientFactory:
+    def test_timeout_defaults_to_single_value(self, transport_settings):
+        timeout = HttpClientFactory._timeout(15.0)
+        assert timeout == httpx.Timeout(15.0)
+
+    def test_timeout_granular_overrides(self, transport_settings):
+        transport_settings.connect_timeout = 2.0
+        transport_settings.pool_timeout = 0.5
+
+        timeout = HttpClientFactory._timeout(15.0)
+
+        assert timeout.connect == 2.0
+        assert timeout.read == 15.0
+        assert timeout.write == 15.0
+        assert timeout.pool == 0.5
+
+    def test_timeout_falls_back_to_settings(self, transport_settings):
+        assert HttpClientFactory._timeout(None).read == transport_settings.timeout_seconds
+
+    def test_limits_from_settings(self, transport_settings):
+        transport_settings.max_connections = 42
+        transport_settings.max_keepalive_connections = 7
+        transport_settings.keepalive_expiry = 12.0
+
+        limits = HttpClientFactory._limits()
+
+        assert limits == httpx.Limits(
+            max_connections=42,
+            max_keepalive_connections=7,
+            keepalive_expiry=12.0,
+        )
+
+    def test_http2_disabled_by_default(self, transport_settings):
+        assert HttpClientFactory._http2() is False
+
+    @patch('llm_arch_sdk.transport.http_client_factory.find_spec', return_value=None)
+    def test_http2_falls_back_without_h2(self, mock_find_spec, transport_settings):
+        transport_settings.http2 = True
+        assert HttpClientFactory._http2() is False
+
+    def test_create_applies_pool_settings(self, transport_settings):
+        transport_settings.max_connections = 3
+
+        client = HttpClientFactory.create(timeout=5.0, extra_headers={"X-Test": "1"})
+
+        assert isinstance(client, httpx.Client)
+        assert client.timeout == httpx.Timeout(5.0)
+        assert client.headers["X-Test"] == "1"
+        assert client._transport._pool._max_connections == 3
+        client.close()
+
+    def test_create_async(self, transport_settings):
+        client = HttpClientFactory.create_async(timeout=5.0)
+        assert isinstance(client, httpx.AsyncClient)
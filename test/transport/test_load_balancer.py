@@ -0,0 +1,75 @@
+import time
+import pytest
+from llm_arch_sdk.transport.circuit_breaker import CircuitState
+from llm_arch_sdk.transport.load_balancer import LoadBalancer
+
+
+class TestLoadBalancer:
+    def test_requires_backends(self):
+        with pytest.raises(ValueError):
+            LoadBalancer([])
+
+    def test_single_backend(self):
+        lb = LoadBalancer(["http://a:8080/"])
+        assert lb.pick().url == "http://a:8080"
+
+    def test_prefers_least_outstanding(self):
+        lb = LoadBalancer(["http://a", "http://b"])
+        busy, idle = lb.backends
+        busy.outstanding = 5
+
+        for _ in range(20):
+            assert lb.pick() is idle
+
+    def test_track_counts_in_flight(self):
+        lb = LoadBalancer(["http://a"])
+        backend = lb.backends[0]
+
+        with lb.track(backend):
+            assert backend.outstanding == 1
+        assert backend.outstanding == 0
+        assert backend.served == 1
+
+    def test_track_releases_on_error(self):
+        lb = LoadBalancer(["http://a"])
+        backend = lb.backends[0]
+
+        with pytest.raises(RuntimeError):
+            with lb.track(backend):
+                raise RuntimeError("boom")
+        assert backend.outstanding == 0
+
+    def test_open_backend_is_ejected(self):
+        lb = LoadBalancer(["http://a", "http://b"])
+        broken, healthy = lb.backends
+        for _ in range(broken.circuit.failure_threshold):
+            broken.circuit.record_failure()
+
+        for _ in range(20):
+            assert lb.pick() is healthy
+
+    def test_backend_returns_after_reset_timeout(self):
+        lb = LoadBalancer(["http://a"])
+        backend = lb.backends[0]
+        backend.circuit._state = CircuitState.OPEN
+        backend.circuit._open_until = time.time() - 1
+
+        assert lb.pick() is backend
+        # pick no altera el estado; allow_request hace la transición
+        assert backend.circuit._state == CircuitState.OPEN
+
+    def test_none_when_all_open(self):
+        lb = LoadBalancer(["http://a"])
+        lb.backends[0].circuit._state = CircuitState.OPEN
+        lb.backends[0].circuit._open_until = time.time() + 60
+
+        assert lb.pick() is None
+
+    def test_exclude(self):
+        lb = LoadBalancer(["http://a", "http://b"])
+        a, b = lb.backends
+        assert lb.pick(exclude=[a]) is b
+
+    def test_stats(self):
+        lb = LoadBalancer(["http://a"])
+        assert lb.stats() == [{"url": "http://a", "state": "closed", "outstanding": 0, "served": 0}]
@@ -0,0 +1,153 @@
+import asyncio
+import pytest
+from unittest.mock import patch
+from llm_arch_sdk.config.settings import RateLimitSettings
+from llm_arch_sdk.transport.rate_limiter import RateLimitExceeded, RateLimiter
+
+
+def _limiter(**kwargs):
+    return RateLimiter(RateLimitSettings(enabled=True, **kwargs))
+
+
+class TestEstimate:
+    def test_completion_prompt_and_n_predict(self):
+        limiter = _limiter(chars_per_token=4.0)
+
+        assert limiter.estimate({"prompt": "a" * 40, "n_predict": 16}) == 26
+
+    def test_chat_messages_and_max_tokens(self):
+        limiter = _limiter(chars_per_token=4.0)
+        payload = {
+            "messages": [
+                {"role": "system", "content": "a" * 8},
+                {"role": "user", "content": [{"type": "text", "text": "b" * 8}]},
+            ],
+            "max_tokens": 10,
+        }
+
+        assert limiter.estimate(payload) == 14
+
+    def test_default_output_when_unbounded(self):
+        limiter = _limiter(default_max_tokens=100)
+
+        assert limiter.estimate({"prompt": "", "n_predict": -1}) == 100
+
+    def test_embeddings_have_no_output(self):
+        limiter = _limiter(chars_per_token=4.0)
+
+        assert limiter.estimate({"input": ["a" * 4, "b" * 8]}) == 3
+
+    def test_token_ids(self):
+        assert _limiter().estimate({"prompt": [1, 2, 3], "n_predict": 0}) == 3
+
+
+class TestReserve:
+    def test_within_burst_no_wait(self):
+        limiter = _limiter(requests_per_second=10)
+
+        assert limiter.reserve(0).delay == 0
+
+    def test_debt_becomes_wait(self):
+        limiter = _limiter(tokens_per_second=100)
+
+        limiter.reserve(100)
+        reservation = limiter.reserve(50)
+
+        assert reservation.delay == pytest.approx(0.5, abs=0.01)
+        assert limiter.stats()["throttled"] == 1
+
+    def test_fail_fast(self):
+        limiter = _limiter(requests_per_second=1, on_limit="fail")
+        limiter.reserve(0)
+
+        with pytest.raises(RateLimitExceeded):
+            limiter.reserve(0)
+        assert limiter.stats()["rejected"] == 1
+
+    def test_max_wait_exceeded(self):
+        limiter = _limiter(tokens_per_second=10, max_wait=1.0)
+
+        with pytest.raises(RateLimitExceeded):
+            limiter.reserve(100)
+
+    @patch('llm_arch_sdk.transport.rate_limiter.time.sleep')
+    def test_acquire_blocks(self, mock_sleep):
+        limiter = _limiter(requests_per_second=1)
+
+        limiter.acquire(None)
+        limiter.acquire(None)
+
+        mock_sleep.assert_called_once()
+
+    def test_acquire_async_waits(self):
+        limiter = _limiter(requests_per_second=50, request_burst=1)
+
+        async def run():
+            await limiter.acquire_async(None)
+            return await limiter.acquire_async(None)
+
+        assert asyncio.run(run()).delay > 0
+
+
+class TestTryReserve:
+    def test_reserves_when_quota_available(self):
+        limiter = _limiter(tokens_per_second=100)
+
+        reservation = limiter.try_reserve({"input": "a" * 40})
+
+        assert reservation.delay == 0
+        assert limiter.stats()["tokens_available"] == pytest.approx(90, abs=1)
+
+    def test_returns_none_instead_of_debt(self):
+        limiter = _limiter(requests_per_second=1)
+        limiter.reserve(0)
+
+        assert limiter.try_reserve({}) is None
+        assert limiter.stats()["requests_available"] == pytest.approx(0, abs=0.1)
+        assert limiter.stats()["throttled"] == 0
+
+    def test_refund_restores_quota_once(self):
+        limiter = _limiter(requests_per_second=1, tokens_per_second=100)
+        reservation = limiter.reserve(50)
+
+        limiter.refund(reservation)
+        limiter.refund(reservation)
+
+        stats = limiter.stats()
+        assert stats["requests_available"] == pytest.approx(1)
+        assert stats["tokens_available"] == pytest.approx(100)
+
+
+class TestSettle:
+    def test_refunds_overestimate(self):
+        limiter = _limiter(tokens_per_second=1000)
+        reservation = limiter.reserve(300)
+
+        limiter.settle(reservation, {"usage": {"total_tokens": 100}})
+
+        assert limiter.stats()["tokens_available"] == pytest.approx(900, abs=5)
+
+    def test_charges_underestimate_from_timings(self):
+        limiter = _limiter(tokens_per_second=1000)
+        reservation = limiter.reserve(100)
+
+        limiter.settle(reservation, {"timings": {"prompt_n": 200, "predicted_n": 100}})
+
+        assert limiter.stats()["tokens_available"] == pytest.approx(700, abs=5)
+
+    def test_settles_once(self):
+        limiter = _limiter(tokens_per_second=1000)
+        reservation = limiter.reserve(300)
+
+        limiter.settle(reservation, {"usage": {"total_tokens": 100}})
+        limiter.settle(reservation, {"usage": {"total_tokens": 100}})
+
+        assert limiter.stats()["tokens_available"] == pytest.approx(900, abs=5)
+
+    def test_unknown_usage_keeps_estimate(self):
+        limiter = _limiter(tokens_per_second=1000)
+        reservation = limiter.reserve(300)
+
+        limiter.settle(reservation, {"content": "hi"})
+
+        assert limiter.stats()["tokens_available"] == pytest.approx(700, abs=5)
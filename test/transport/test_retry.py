@@ -0,0 +1,100 @@
+import httpx
+from unittest.mock import patch
+from llm_arch_sdk.config.settings import RetrySettings
+from llm_arch_sdk.transport.retry import RetryBudget, RetryPolicy
+
+
+class TestRetryBudget:
+    def test_withdraw_until_empty(self):
+        budget = RetryBudget(ratio=0.5, initial=2, maximum=10)
+        assert budget.withdraw() is True
+        assert budget.withdraw() is True
+        assert budget.withdraw() is False
+
+    def test_deposit_refills_up_to_maximum(self):
+        budget = RetryBudget(ratio=0.5, initial=0, maximum=1)
+        budget.deposit()
+        assert budget.withdraw() is False
+        budget.deposit()
+        budget.deposit()
+        assert budget.tokens == 1
+        assert budget.withdraw() is True
+
+
+class TestRetryPolicy:
+    def test_connect_error_retries_any_method(self):
+        policy = RetryPolicy(RetrySettings(retry_inference_posts=False))
+        exc = httpx.ConnectError("refused")
+        assert policy.should_retry_error(exc, "POST", "/otro", attempt=1) is True
+
+    def test_read_timeout_only_for_idempotent(self):
+        policy = RetryPolicy(RetrySettings(retry_inference_posts=False))
+        exc = httpx.ReadTimeout("slow")
+        assert policy.should_retry_error(exc, "GET", "/health", attempt=1) is True
+        assert policy.should_retry_error(exc, "POST", "/llm/completions", attempt=1) is False
+
+    def test_inference_posts_are_not_retried_by_default(self):
+        policy = RetryPolicy(RetrySettings())
+        assert policy.is_idempotent("POST", "/llm/completions") is False
+        assert policy.should_retry_status(503, "POST", "/llm/completions", attempt=1) is False
+
+    def test_inference_posts_retry_rejections(self):
+        policy = RetryPolicy(RetrySettings())
+        assert policy.should_retry_status(429, "POST", "/llm/completions", attempt=1) is True
+        assert policy.should_retry_status(503, "POST", "/llm/completions", attempt=1, retry_after="1") is True
+        assert policy.should_retry_status(502, "POST", "/llm/completions", attempt=1, retry_after="1") is False
+        assert policy.should_retry_error(httpx.ReadTimeout("slow"), "POST", "/llm/completions", attempt=1) is False
+
+    def test_inference_posts_opt_in(self):
+        policy = RetryPolicy(RetrySettings(retry_inference_posts=True))
+        assert policy.is_idempotent("POST", "/llm/completions") is True
+        assert policy.is_idempotent("POST", "/llm/login") is False
+
+    def test_retry_statuses(self):
+        policy = RetryPolicy(RetrySettings())
+        assert policy.should_retry_status(503, "GET", "/health", attempt=1) is True
+        assert policy.should_retry_status(429, "GET", "/health", attempt=1) is True
+        assert policy.should_retry_status(500, "GET", "/health", attempt=1) is False
+        assert policy.should_retry_status(404, "GET", "/health", attempt=1) is False
+
+    def test_max_attempts(self):
+        policy = RetryPolicy(RetrySettings(max_attempts=2))
+        assert policy.should_retry_status(503, "GET", "/health", attempt=1) is True
+        assert policy.should_retry_status(503, "GET", "/health", attempt=2) is False
+
+    def test_disabled(self):
+        policy = RetryPolicy(RetrySettings(enabled=False))
+        assert policy.should_retry_status(503, "GET", "/health", attempt=1) is False
+
+    def test_budget_limits_retries(self):
+        policy = RetryPolicy(RetrySettings(budget_initial_tokens=1, budget_ratio=0.0))
+        assert policy.should_retry_status(503, "GET", "/health", attempt=1) is True
+        assert policy.should_retry_status(503, "GET", "/health", attempt=1) is False
+
+    def test_backoff_decorrelated_jitter_bounds(self):
+        policy = RetryPolicy(RetrySettings(base_delay=0.1, max_delay=1.0))
+        delay = None
+        for _ in range(50):
+            delay = policy.backoff(delay)
+            assert 0.1 <= delay <= 1.0
+
+    @patch('llm_arch_sdk.transport.retry.random.uniform', side_effect=lambda low, high: high)
+    def test_backoff_grows_from_previous(self, mock_uniform):
+        policy = RetryPolicy(RetrySettings(base_delay=0.1, max_delay=10.0))
+        assert policy.backoff(None) == 0.1 * 3
+        assert policy.backoff(0.5) == 0.5 * 3
+        assert policy.backoff(5.0) == 10.0
+
+    def test_backoff_honors_retry_after_seconds(self):
+        policy = RetryPolicy(RetrySettings(max_retry_after=30.0))
+        assert policy.backoff(None, "2") == 2.0
+        assert policy.backoff(None, "120") == 30.0
+
+    def test_backoff_honors_retry_after_http_date(self):
+        policy = RetryPolicy(RetrySettings())
+        delay = policy.backoff(None, "Wed, 21 Oct 2015 07:28:00 GMT")
+        assert delay == 0.0
+
+    def test_backoff_ignores_invalid_retry_after(self):
+        policy = RetryPolicy(RetrySettings(base_delay=0.1, max_delay=0.3))
+        assert 0.1 <= policy.backoff(None, "soon") <= 0.3
@@ -0,0 +1,50 @@
+import asyncio
+from llm_arch_sdk.transport.sse import aiter_sse_data, iter_sse_data
+
+
+class TestIterSseData:
+    def test_parses_data_events(self):
+        lines = [
+            'data: {"content": "Ho"}',
+            "",
+            'data: {"content": "la"}',
+            "",
+        ]
+        assert list(iter_sse_data(lines)) == [{"content": "Ho"}, {"content": "la"}]
+
+    def test_ignores_comments_and_other_fields(self):
+        lines = [
+            ": keep-alive",
+            "event: message",
+            'data: {"content": "x"}',
+            "",
+        ]
+        assert list(iter_sse_data(lines)) == [{"content": "x"}]
+
+    def test_stops_on_done(self):
+        lines = [
+            'data: {"content": "x"}',
+            "",
+            "data: [DONE]",
+            "",
+            'data: {"content": "never"}',
+            "",
+        ]
+        assert list(iter_sse_data(lines)) == [{"content": "x"}]
+
+    def test_flushes_last_event_without_blank_line(self):
+        assert list(iter_sse_data(['data: {"stop": true}'])) == [{"stop": True}]
+
+    def test_skips_invalid_json(self):
+        lines = ["data: {not json", "", 'data: {"ok": 1}', ""]
+        assert list(iter_sse_data(lines)) == [{"ok": 1}]
+
+    def test_async_variant(self):
+        async def lines():
+            for line in ['data: {"content": "a"}', "", "data: [DONE]", ""]:
+                yield line
+
+        async def collect():
+            return [event async for event in aiter_sse_data(lines())]
+
+        assert asyncio.run(collect()) == [{"content": "a"}]
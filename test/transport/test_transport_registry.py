@@ -0,0 +1,69 @@
+import pytest
+from unittest.mock import Mock, patch
+from llm_arch_sdk.config.settings import _sdk_settings
+from llm_arch_sdk.transport.transport_registry import TransportRegistry
+
+
+@pytest.fixture(autouse=True)
+def registry():
+    TransportRegistry.clear()
+    with patch('llm_arch_sdk.transport.transport_registry.TokenManager') as mock_token_manager, \
+         patch('llm_arch_sdk.transport.transport_registry.AuthHttpClientFactory') as mock_factory:
+        mock_factory.create.side_effect = lambda auth, timeout: Mock(is_closed=False)
+        yield mock_token_manager, mock_factory
+    TransportRegistry.clear()
+
+
+class TestTransportRegistry:
+    def test_same_key_shares_client_and_auth(self, registry):
+        mock_token_manager, mock_factory = registry
+
+        client1 = TransportRegistry.acquire("http://llm:8080", timeout=30.0)
+        client2 = TransportRegistry.acquire("http://llm:8080/", timeout=30.0)
+
+        assert client1 is client2
+        assert mock_token_manager.call_count == 1
+        assert mock_factory.create.call_count == 1
+        assert TransportRegistry.stats() == {"transports": 1, "references": 2}
+
+    def test_different_timeout_gets_own_pool(self, registry):
+        client1 = TransportRegistry.acquire("http://llm:8080", timeout=30.0)
+        client2 = TransportRegistry.acquire("http://llm:8080", timeout=5.0)
+
+        assert client1 is not client2
+
+    def test_different_transport_settings_gets_own_pool(self, registry):
+        original = _sdk_settings.transport.max_connections
+        try:
+            client1 = TransportRegistry.acquire("http://llm:8080")
+            _sdk_settings.transport.max_connections = original + 1
+            client2 = TransportRegistry.acquire("http://llm:8080")
+        finally:
+            _sdk_settings.transport.max_connections = original
+
+        assert client1 is not client2
+
+    def test_release_closes_on_last_reference(self, registry):
+        client = TransportRegistry.acquire("http://llm:8080")
+        TransportRegistry.acquire("http://llm:8080")
+
+        TransportRegistry.release(client)
+        client.close.assert_not_called()
+
+        TransportRegistry.release(client)
+        client.close.assert_called_once()
+        assert TransportRegistry.stats() == {"transports": 0, "references": 0}
+
+    def test_externally_closed_client_is_recreated_with_same_auth(self, registry):
+        mock_token_manager, mock_factory = registry
+
+        client1 = TransportRegistry.acquire("http://llm:8080")
+        client1.is_closed = True
+        client2 = TransportRegistry.acquire("http://llm:8080")
+
+        assert client2 is not client1
+        assert mock_token_manager.call_count == 1
+        assert mock_factory.create.call_args.kwargs["auth"] is mock_token_manager.return_value
+
+    def test_release_unknown_client_is_ignored(self):
+        TransportRegistry.release(Mock())